@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.abspath('../../project/hist_physical_basic_data/hist_
 sys.path.insert(0, os.path.abspath('../../project/hist_responses_physical/hist_algorithms/'))
 sys.path.insert(0, os.path.abspath('../../project/hist_avg_spread/hist_algorithms/'))
 sys.path.insert(0, os.path.abspath('../../project/hist_avg_responses/hist_algorithms/'))
+sys.path.insert(0, os.path.abspath('../../project/hist_shared/hist_algorithms/'))
 
 # -- Project information -----------------------------------------------------
 
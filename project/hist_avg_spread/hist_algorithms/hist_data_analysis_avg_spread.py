@@ -4,12 +4,13 @@ The functions in the module analyze the statistics from the NASDAQ stock
 market and compute the average spread of the stocks.
 
 This script requires the following modules:
-    * itertools.product
     * multiprocessing
     * numpy
     * pandas
-    * pickle
+    * sys
     * hist_data_tools_avg_spread
+    * hist_data_schedule_shared
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_quotes_trades_day_avg_spread_data - statistics of quotes and trades
@@ -24,16 +25,19 @@ The module contains the following functions:
 # ----------------------------------------------------------------------------
 # Modules
 
-from itertools import product as iprod
 import multiprocessing as mp
-import pickle
-from typing import Any, Iterator, List, Tuple
+import sys
+from typing import Any, Dict, List, Tuple
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 
 import hist_data_tools_avg_spread
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_schedule_shared
+import hist_data_store_shared
+
 # ----------------------------------------------------------------------------
 
 
@@ -53,10 +57,8 @@ def hist_quotes_trades_day_avg_spread_data(
 
     try:
         # Load data
-        fx_data: pd.DataFrame = pickle.load(open(
-                        f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                        + f'_extraction_week/{fx_pair}/hist_fx_data_extraction'
-                        + f'_week_{fx_pair}_w{week}.pickle', 'rb'))
+        fx_data: pd.DataFrame = hist_data_store_shared \
+            .hist_load_week(fx_pair, year, week, columns=['Spread'])
 
         if ('jpy' in fx_pair or
             'huf' in fx_pair):
@@ -99,7 +101,31 @@ def hist_quotes_trades_year_avg_spread_data(fx_pairs: List[str],
     spread_stats: pd.DataFrame = pd.DataFrame(
         columns=['FxPair', 'Avg_Quotes', 'Avg_Spread'])
 
-    weeks: Tuple[str, ...] = hist_data_tools_avg_spread.hist_weeks()
+    # Weeks with data of every pair from the extraction manifests
+    manifests: Dict[str, Dict[str, Dict[str, Any]]] = {
+        fx_pair: hist_data_store_shared.hist_load_manifest(fx_pair, year)
+        for fx_pair in fx_pairs}
+
+    tasks: List[Tuple[Any, ...]] = [
+        (fx_pair, year, week)
+        for fx_pair in fx_pairs for week in manifests[fx_pair]]
+    # The tasks are sorted by the number of ticks of the week
+    sizes: List[int] = [manifests[task[0]][task[2]]['ticks']
+                        for task in tasks]
+    processes: int = mp.cpu_count()
+
+    # Statistics of every week grouped by forex pair
+    stat: Dict[str, List[Any]] = {fx_pair: [] for fx_pair in fx_pairs}
+
+    # Parallel computation of the statistics of the weeks of all the forex
+    # pairs. Every result is appended to the list of its forex pair
+    with mp.Pool(processes=processes) as pool:
+        task: Tuple[Any, ...]
+        result: Tuple[Any, Any]
+        for task, result in hist_data_schedule_shared.hist_schedule_run(
+                pool, hist_quotes_trades_day_avg_spread_data, tasks, sizes,
+                processes):
+            stat[task[0]].append(result)
 
     idx: int
     fx_pair: str
@@ -108,18 +134,17 @@ def hist_quotes_trades_year_avg_spread_data(fx_pairs: List[str],
         hist_data_tools_avg_spread \
             .hist_function_header_print_data(function_name, fx_pair, year, '')
 
-        stat: List[Any] = []
-        args_prod: Iterator[Tuple[str, ...]] = iprod([fx_pair], [year], weeks)
-
-        # Parallel computation of the statistics. Every result is appended to
-        # a list
-        with mp.Pool(processes=mp.cpu_count()) as pool:
-            stat.append(pool.starmap(hist_quotes_trades_day_avg_spread_data,
-                                     args_prod))
+        # A pair without weeks in the manifest is written with NaN values
+        if not stat[fx_pair]:
+            print('No data')
+            print()
+            spread_stats.loc[idx] = [fx_pair, np.NaN, np.NaN]
+            continue
 
         # To obtain the average of the year, I average all the results of the
         # corresponding values (number quotes, trades and avg spread)
-        stat_year: List[str] = list(np.ceil(np.nanmean(stat[0], axis=0)))
+        stat_year: List[str] = list(np.ceil(np.nanmean(stat[fx_pair],
+                                                       axis=0)))
         spread_stats.loc[idx] = [fx_pair] + stat_year
 
     spread_stats.sort_values(by='Avg_Spread', inplace=True)
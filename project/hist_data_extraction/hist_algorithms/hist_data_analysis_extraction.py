@@ -4,24 +4,35 @@ The functions in the module extract the bid and ask from the Historic Rate Data
 from HIST Capital in a year.
 
 This script requires the following modules:
+    * io
+    * multiprocessing
     * os
-    * pickle
+    * sys
     * typing
     * zipfile
     * datetime
     * numpy
     * pandas
     * hist_data_tools_extraction
+    * hist_data_store_shared
 
 The module contains the following functions:
+    * hist_fx_csv_datetime - converts the timestamps of a CSV buffer.
+    * hist_fx_data_extraction_month - parses the bid and ask of a month in
+      arrays.
+    * hist_fx_data_extraction_ticks - converts the zip files of a year to
+      binary tick files.
+    * hist_fx_csv_blocks - reads the lines of a CSV file in blocks.
+    * hist_fx_data_extraction_chunks - reads the bid and ask of a year in
+      chunks.
     * hist_fx_data_extraction_year - extracts the bid and ask for a year.
+    * hist_fx_data_extraction_stream - splits the bid and ask of a year in
+      weeks while it is read.
     * hist_fx_data_extraction_week - extracts the bid and ask for a week.
-    * hist_fx_week_start - extracts data that starts in a week day.
-    * hist_fx_weekend_start - extracts data that starts in a weekend day.
-    * hist_fx_midpoint_trade_data - extracts the midpoint price for
-      a year
-    * hist_fx_trade_signs_trade_data - extracts the midpoint price
-      for a year
+    * hist_fx_week_partition - splits the bid and ask of a year in weeks.
+    * hist_fx_trade_signs - obtains the trade signs from the midpoint price.
+    * hist_fx_basic_trade_data - obtains the midpoint price, spread and trade
+      signs of a week.
     * main - the main function of the script.
 
 ..moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
@@ -30,9 +41,12 @@ The module contains the following functions:
 # -----------------------------------------------------------------------------
 # Modules
 
+import io
+import multiprocessing as mp
+from multiprocessing.pool import AsyncResult, Pool
 import os
-import pickle
-from typing import Any, Dict, List, Tuple
+import sys
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
 import zipfile
 
 import datetime as dt
@@ -41,70 +55,679 @@ import pandas as pd  # type: ignore
 
 import hist_data_tools_extraction
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_store_shared
+
+# Format of the HIST timestamps (i.e. '20160103 170000118')
+__datetime_format__ = '%Y%m%d %H%M%S%f'
+__datetime_width__ = 18
+# Approximate number of bytes of a line of the CSV files, used to read the
+# files in blocks
+__line_bytes__ = 40
+
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_data_extraction_year(fx_pair: str, year: str) -> pd.DataFrame:
-    """Extracts the bid and ask for a year.
+def _hist_fx_csv_format(fx_pair: str, year: str) -> Tuple[str, List[str]]:
+    """Returns the format of the monthly CSV files of a year.
+
+    In 2008 the ask is in the second column and the bid in the third one.
 
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e. '2016').
-    :return: None -- The function saves the data in a file and does not return
-     a value.
+    :return: tuple -- The function returns a tuple with the string of the
+     pair in the CSV names and the list of the columns.
     """
 
     pair: List[str] = fx_pair.split('_')
     cap_pair: str = pair[0].upper() + pair[1].upper()
 
-    fx_data_col: List[str]
-    fx_data_type: Dict[str, Any]
     if year == '2008':
-        fx_data_col = ['DateTime', 'Ask', 'Bid']
-        fx_data_type = {'DateTime': str, 'Ask': float, 'Bid': float}
-    else:
-        fx_data_col = ['DateTime', 'Bid', 'Ask']
-        fx_data_type = {'DateTime': str, 'Bid': float, 'Ask': float}
+        return (cap_pair, ['DateTime', 'Ask', 'Bid'])
+
+    return (cap_pair, ['DateTime', 'Bid', 'Ask'])
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_fx_datetime_field(buffer: np.ndarray, starts: np.ndarray,
+                             first: int,
+                             last: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Converts the digits of a field of the fixed width timestamps.
+
+    :param buffer: numpy array of uint8 with the bytes.
+    :param starts: numpy array with the positions of the first byte of every
+     timestamp.
+    :param first: integer of the position of the first digit of the field
+     (i.e. 4).
+    :param last: integer of the position after the last digit of the field
+     (i.e. 6).
+    :return: tuple -- The function returns a tuple with the numpy arrays of
+     the values and of the timestamps whose bytes are all digits.
+    """
+
+    value: np.ndarray = np.zeros(len(starts), dtype=np.int64)
+    valid: np.ndarray = np.ones(len(starts), dtype=bool)
+
+    pos: int
+    for pos in range(first, last):
+        # The bytes that are not digits are larger than 9 after the
+        # subtraction
+        digit: np.ndarray = buffer[starts + pos] - np.uint8(ord('0'))
+        valid &= digit <= 9
+        value *= 10
+        value += digit
+
+    return (value, valid)
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_fx_datetime_buffer(buffer: np.ndarray,
+                             starts: np.ndarray) -> Optional[np.ndarray]:
+    """Converts the fixed width timestamps in a byte buffer.
+
+    Every field is obtained with vectorized digit arithmetic over the bytes
+    at the same position of all the timestamps, and the days since the epoch
+    with the civil calendar formula of H. Hinnant.
+
+    :param buffer: numpy array of uint8 with the bytes.
+    :param starts: numpy array with the positions of the first byte of every
+     timestamp.
+    :return: numpy array -- The function returns the timestamps as
+     datetime64[ns], or None when a timestamp does not have the format.
+    """
+
+    # Every timestamp is followed by the separator of the bid
+    if len(starts) and starts[-1] + __datetime_width__ >= len(buffer):
+        return None
+
+    valid: np.ndarray = (buffer[starts + 8] == ord(' ')) \
+        & (buffer[starts + __datetime_width__] == ord(','))
+    fields: List[np.ndarray] = []
+
+    first: int
+    last: int
+    for first, last in ((0, 4), (4, 6), (6, 8), (9, 11), (11, 13), (13, 15),
+                        (15, 18)):
+        value: np.ndarray
+        digits: np.ndarray
+        value, digits = _hist_fx_datetime_field(buffer, starts, first, last)
+        fields.append(value)
+        valid &= digits
+
+    year: np.ndarray
+    month: np.ndarray
+    day: np.ndarray
+    hour: np.ndarray
+    minute: np.ndarray
+    second: np.ndarray
+    milli: np.ndarray
+    year, month, day, hour, minute, second, milli = fields
+
+    # Length of the months, with the index of the month from 1
+    month_days: np.ndarray = np.array(
+        [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    leap: np.ndarray = (year % 4 == 0) \
+        & ((year % 100 != 0) | (year % 400 == 0))
+
+    valid &= (month >= 1) & (month <= 12) & (hour < 24) & (minute < 60) \
+        & (second < 60)
+    if not valid.all():
+        return None
+    if not ((day >= 1)
+            & (day <= month_days[month] + ((month == 2) & leap))).all():
+        return None
+
+    # Days since 1970-01-01 with the years starting in March
+    year = year - (month <= 2)
+    era: np.ndarray = year // 400
+    year_era: np.ndarray = year - era * 400
+    day_year: np.ndarray = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    days: np.ndarray = era * 146097 + year_era * 365 + year_era // 4 \
+        - year_era // 100 + day_year - 719468
+
+    nanos: np.ndarray = ((days * 24 + hour) * 60 + minute) * 60 + second
+    nanos *= 10 ** 9
+    nanos += milli * 10 ** 6
+
+    return nanos.view('datetime64[ns]')
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_csv_datetime(buffer: bytes, validate: bool = False) -> np.ndarray:
+    """Converts the timestamps of a CSV buffer.
+
+    The HIST timestamps have a fixed width (i.e. '20160103 170000118') and
+    are the first bytes of every line of the CSV files, so they are converted
+    from the buffer read from the zip file without creating a string for
+    every row. When a timestamp does not have the fixed format the column is
+    read with pd.read_csv and converted with pd.to_datetime.
+
+    :param buffer: bytes of the CSV file.
+    :param validate: bool to compare the result with pd.to_datetime and raise
+     a ValueError when they differ (True) or not (False).
+    :return: numpy array -- The function returns the timestamps as
+     datetime64[ns].
+    """
+
+    data: np.ndarray = np.frombuffer(buffer, dtype=np.uint8)
+
+    # First byte of every line, without the empty lines
+    starts: np.ndarray = np.flatnonzero(data == ord('\n')) + 1
+    starts = np.concatenate(([0], starts[starts < len(data)])) \
+        if len(data) else starts
+    starts = starts[(data[starts] != ord('\n'))
+                    & (data[starts] != ord('\r'))]
+
+    date_time: Optional[np.ndarray] = _hist_fx_datetime_buffer(data, starts)
+
+    if date_time is None or validate:
+        expected: np.ndarray = np.array([], dtype='datetime64[ns]')
+        if len(starts):
+            expected = pd.to_datetime(
+                pd.read_csv(io.BytesIO(buffer), header=None, usecols=(0,),
+                            dtype=str)[0],
+                format=__datetime_format__).to_numpy() \
+                .astype('datetime64[ns]')
+
+        if date_time is None:
+            return expected
+
+        if not np.array_equal(date_time, expected):
+            raise ValueError('The timestamps differ from pd.to_datetime')
+
+    return date_time
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_data_extraction_month(
+        fx_pair: str, year: str, month: str,
+        validate: bool = False) -> Optional[Dict[str, np.ndarray]]:
+    """Parses the bid and ask of a month in arrays.
+
+    When the month has a binary tick file (see hist_fx_data_extraction_ticks)
+    the arrays are loaded memory-mapped from it. Otherwise the timestamps are
+    converted from the CSV buffer with hist_fx_csv_datetime and only the
+    prices are parsed by pd.read_csv. The arrays of the columns are a compact
+    buffer of the month, so they are cheap to send from a process of a pool.
+
+    The CSV file of the month is read at once, so the function is only used
+    for the months parsed in a pool, which are bounded with the estimate of
+    hist_month_memory, and for the conversion to tick files. The stream in a
+    single process reads the file in blocks with hist_fx_csv_blocks.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param month: string of the month to be analyzed (i.e. '07').
+    :param validate: bool to compare the timestamps with pd.to_datetime
+     (True) or not (False).
+    :return: dict -- The function returns a dictionary with the numpy arrays
+     of the columns in the order of the CSV file, or None without data.
+    """
+
+    path: str = hist_data_tools_extraction.hist_month_path(fx_pair, year,
+                                                           month)
+    month_data: Optional[Dict[str, np.ndarray]] = \
+        hist_data_store_shared.hist_load_ticks(path)
+    if month_data is not None:
+        return month_data
+
+    cap_pair: str
+    fx_data_col: List[str]
+    cap_pair, fx_data_col = _hist_fx_csv_format(fx_pair, year)
+
+    try:
+        # Load data
+        zip_f: zipfile.ZipFile = zipfile.ZipFile(path)
+
+    except FileNotFoundError as error:
+        print('No data')
+        print(error)
+        print()
+        return None
+
+    with zip_f:
+        buffer: bytes = \
+            zip_f.read(f'DAT_ASCII_{cap_pair}_T_{year}{month}.csv')
+
+    month_data = {'DateTime': hist_fx_csv_datetime(buffer, validate)}
+
+    prices: pd.DataFrame = pd.read_csv(io.BytesIO(buffer), header=None,
+                                       usecols=(1, 2), dtype=float)
+    col: str
+    values: pd.Series
+    for col, values in zip(fx_data_col[1:], (prices[1], prices[2])):
+        month_data[col] = values.to_numpy()
+
+    return month_data
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_data_extraction_ticks(fx_pair: str, year: str,
+                                  validate: bool = False) -> None:
+    """Converts the zip files of a year to binary tick files.
 
-    fx_data: pd.DataFrame = pd.DataFrame(columns=fx_data_col)
+    The original data does not change once it is downloaded, so every month
+    is parsed once and saved with hist_save_ticks next to its zip file. The
+    months with an up to date tick file are skipped.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param validate: bool to compare the timestamps with pd.to_datetime
+     (True) or not (False).
+    :return: None -- The function saves the data in files and does not return
+     a value.
+    """
+
+    function_name: str = hist_fx_data_extraction_ticks.__name__
+    hist_data_tools_extraction \
+        .hist_function_header_print_data(function_name, fx_pair, year, '')
 
     m_num: int
     for m_num in range(1, 13):
+        path: str = hist_data_tools_extraction.hist_month_path(
+            fx_pair, year, f'{m_num:02d}')
+        if not os.path.isfile(path) \
+                or hist_data_store_shared.hist_load_ticks(path) is not None:
+            continue
+
+        month_data: Optional[Dict[str, np.ndarray]] = \
+            hist_fx_data_extraction_month(fx_pair, year, f'{m_num:02d}',
+                                          validate)
+        if month_data is not None:
+            hist_data_store_shared.hist_save_ticks(month_data, path)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_csv_blocks(file: IO[bytes],
+                       chunk_size: int) -> Iterator[bytes]:
+    """Reads the lines of a CSV file in blocks.
+
+    The file is read in pieces of about chunk_size lines and every block is
+    cut after the last complete line. The rest is kept for the next block,
+    so only a block is in memory.
+
+    :param file: binary file object (i.e. the CSV file opened in the zip
+     file).
+    :param chunk_size: integer of the number of lines of every block
+     (i.e. 1000000).
+    :return: iterator -- The function yields the bytes of the blocks, with
+     chunk_size lines except the last one.
+    """
+
+    pending: bytes = b''
+
+    while True:
+        piece: bytes = file.read(chunk_size * __line_bytes__)
+        data: bytes = pending + piece
+        ends: np.ndarray = \
+            np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n'))
+
+        while len(ends) >= chunk_size:
+            cut: int = int(ends[chunk_size - 1]) + 1
+            yield data[:cut]
+            data = data[cut:]
+            ends = ends[chunk_size:] - cut
+
+        pending = data
+
+        if not piece:
+            if pending.strip():
+                yield pending
+            return
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_fx_month_chunks(month_data: Dict[str, np.ndarray],
+                          chunk_size: int,
+                          row_idx: int) -> Iterator[pd.DataFrame]:
+    """Splits the arrays of a month in chunks.
+
+    :param month_data: dictionary with the arrays of the columns of the month.
+    :param chunk_size: integer of the number of rows of every chunk
+     (i.e. 1000000).
+    :param row_idx: integer of the index of the first row of the month.
+    :return: iterator -- The function yields pd.DataFrame chunks in time
+     order.
+    """
+
+    pos: int
+    for pos in range(0, len(month_data['DateTime']), chunk_size):
+        chunk_len: int = len(month_data['DateTime'][pos:pos + chunk_size])
+        yield pd.DataFrame({col: values[pos:pos + chunk_size]
+                            for col, values in month_data.items()},
+                           index=pd.RangeIndex(row_idx, row_idx + chunk_len))
+        row_idx += chunk_len
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_fx_month_window(pool: Pool, fx_pair: str, year: str,
+                          window: int, validate: bool = False) \
+        -> Iterator[Dict[str, np.ndarray]]:
+    """Parses the months of a year in a pool with a bounded window.
+
+    A month is only sent to the pool when one of the window months sent
+    before is received, so at most window months are parsed or waiting in
+    the main process, instead of all the months finished by the pool.
+
+    :param pool: pool of processes.
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param window: integer of the maximum number of months sent and not
+     received (i.e. 8).
+    :param validate: bool to compare the timestamps with pd.to_datetime
+     (True) or not (False).
+    :return: iterator -- The function yields the dictionaries of the months
+     with data in month order.
+    """
+
+    months: List[str] = [f'{m_num:02d}' for m_num in range(1, 13)]
+    sent: List[AsyncResult] = []
+
+    while months or sent:
+        while months and len(sent) < window:
+            sent.append(pool.apply_async(
+                hist_fx_data_extraction_month,
+                (fx_pair, year, months.pop(0), validate)))
+
+        month_data: Optional[Dict[str, np.ndarray]] = sent.pop(0).get()
+        if month_data is not None:
+            yield month_data
+        del month_data
 
-        if m_num < 10:
-            m_num = f'0{m_num}'
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_data_extraction_chunks(
+        fx_pair: str, year: str, chunk_size: int = 1000000,
+        processes: int = 1, validate: bool = False) -> Iterator[pd.DataFrame]:
+    """Reads the bid and ask of a year in chunks.
+
+    The CSV file of every month is read from the zip file in blocks of
+    chunk_size lines with hist_fx_csv_blocks. The timestamps of a block are
+    converted with hist_fx_csv_datetime and only its prices are parsed by
+    pd.read_csv, so no string is created for the rows and only a block of
+    the year is in memory. The index of the chunks continues from month to
+    month.
+
+    With several processes every month is parsed in a process of a pool with
+    hist_fx_data_extraction_month, and the chunks are slices of the arrays
+    of the months, received in month order. At most as many months as
+    processes are parsed or waiting at the same time. The months with a
+    binary tick file are sliced from the memory-mapped records.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param chunk_size: integer of the number of rows of every chunk
+     (i.e. 1000000).
+    :param processes: integer of the number of processes to parse the months
+     (i.e. 8). It can not be used inside a process of a pool.
+    :param validate: bool to compare the timestamps with pd.to_datetime
+     (True) or not (False).
+    :return: iterator -- The function yields pd.DataFrame chunks in time
+     order.
+    """
+
+    row_idx: int = 0
+    months: List[str] = [f'{m_num:02d}' for m_num in range(1, 13)]
+
+    if processes > 1:
+        with mp.Pool(processes=processes) as pool:
+            month_data: Dict[str, np.ndarray]
+            for month_data in _hist_fx_month_window(pool, fx_pair, year,
+                                                    processes, validate):
+
+                chunk: pd.DataFrame
+                for chunk in _hist_fx_month_chunks(month_data, chunk_size,
+                                                   row_idx):
+                    row_idx += len(chunk)
+                    yield chunk
+
+        return
+
+    cap_pair: str
+    fx_data_col: List[str]
+    cap_pair, fx_data_col = _hist_fx_csv_format(fx_pair, year)
+
+    m_num_str: str
+    for m_num_str in months:
+
+        path: str = hist_data_tools_extraction.hist_month_path(fx_pair, year,
+                                                               m_num_str)
+        ticks: Optional[Dict[str, np.ndarray]] = \
+            hist_data_store_shared.hist_load_ticks(path)
+        if ticks is not None:
+            for chunk in _hist_fx_month_chunks(ticks, chunk_size, row_idx):
+                row_idx += len(chunk)
+                yield chunk
+            continue
 
         try:
             # Load data
-            zip_f: zipfile.ZipFile = zipfile.ZipFile(
-                f'../../hist_data/original_data_{year}/{fx_pair}/hist'
-                + f'_{fx_pair}_{year}{m_num}.zip')
-            fx_data = fx_data.append(
-                pd.read_csv(zip_f.open(
-                    f'DAT_ASCII_{cap_pair}_T_{year}{m_num}.csv'),
-                            usecols=(0, 1, 2), names=fx_data_col,
-                            dtype=fx_data_type), ignore_index=True)
+            zip_f: zipfile.ZipFile = zipfile.ZipFile(path)
 
         except FileNotFoundError as error:
             print('No data')
             print(error)
             print()
+            continue
+
+        with zip_f:
+            block: bytes
+            for block in hist_fx_csv_blocks(
+                    zip_f.open(f'DAT_ASCII_{cap_pair}_T_{year}{m_num_str}'
+                               + '.csv'), chunk_size):
+
+                # Convert 'DateTime' column to datetime type
+                date_time: np.ndarray = hist_fx_csv_datetime(block, validate)
+                prices: pd.DataFrame = pd.read_csv(
+                    io.BytesIO(block), header=None, usecols=(1, 2),
+                    dtype=float)
+
+                chunk = pd.DataFrame(
+                    {'DateTime': date_time,
+                     fx_data_col[1]: prices[1].to_numpy(),
+                     fx_data_col[2]: prices[2].to_numpy()},
+                    index=pd.RangeIndex(row_idx, row_idx + len(date_time)))
+                row_idx += len(chunk)
 
-    # Convert 'DateTime' column to datetime type
-    fx_data['DateTime'] = pd.to_datetime(fx_data['DateTime'],
-                                         format='%Y%m%d %H%M%S%f')
+                yield chunk
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_data_extraction_year(fx_pair: str, year: str,
+                                 processes: int = 1) -> pd.DataFrame:
+    """Extracts the bid and ask for a year.
+
+    With several processes the months are parsed in parallel with
+    hist_fx_data_extraction_month and copied in month order to the arrays
+    of the year. Every month is released after it is copied, so the year is
+    not kept twice in memory.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param processes: integer of the number of processes to parse the months
+     (i.e. 8). It can not be used inside a process of a pool.
+    :return: pd.DataFrame -- The function returns the data of the year.
+    """
+
+    if processes > 1:
+        with mp.Pool(processes=processes) as pool:
+            months: List[Dict[str, np.ndarray]] = list(
+                _hist_fx_month_window(pool, fx_pair, year, processes))
+
+        if not months:
+            return pd.DataFrame(columns=['DateTime', 'Bid', 'Ask'])
+
+        cols: List[str] = list(months[0])
+        rows: int = sum(len(month_data[cols[0]]) for month_data in months)
+        # The prices are a single block, so the frame does not copy them
+        date_time: np.ndarray = np.empty(rows, dtype=months[0][cols[0]].dtype)
+        prices: np.ndarray = np.empty((len(cols) - 1, rows),
+                                      dtype=months[0][cols[1]].dtype).T
+
+        pos: int = 0
+        while months:
+            month_data: Dict[str, np.ndarray] = months.pop(0)
+            month_len: int = len(month_data[cols[0]])
+            date_time[pos:pos + month_len] = month_data[cols[0]]
+            col_idx: int
+            col: str
+            for col_idx, col in enumerate(cols[1:]):
+                prices[pos:pos + month_len, col_idx] = month_data[col]
+            pos += month_len
+            del month_data
+
+        fx_data_year: pd.DataFrame = pd.DataFrame(prices, columns=cols[1:],
+                                                  copy=False)
+        fx_data_year.insert(0, cols[0], date_time)
+
+        return fx_data_year
+
+    chunks: List[pd.DataFrame] = \
+        list(hist_fx_data_extraction_chunks(fx_pair, year))
+
+    if not chunks:
+        return pd.DataFrame(columns=['DateTime', 'Bid', 'Ask'])
+
+    # A single concatenation instead of one copy per month
+    fx_data: pd.DataFrame = pd.concat(chunks)
 
     return fx_data
 
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_data_extraction_week(fx_pair: str, year: str) -> None:
+def hist_fx_data_extraction_stream(
+        fx_pair: str, year: str, chunk_size: int = 1000000,
+        year_signs: bool = False,
+        processes: int = 1) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Splits the bid and ask of a year in weeks while it is read.
+
+    Every chunk from hist_fx_data_extraction_chunks is split with the week
+    limits and the pieces are kept only until their week is complete, so at
+    most the open week and one chunk are in memory. The weeks are the same
+    obtained with hist_fx_week_partition.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param chunk_size: integer of the number of rows of every chunk
+     (i.e. 1000000).
+    :param year_signs: bool to add the 'Signs' column computed over the whole
+     year. The last midpoint price and sign are carried between chunks.
+    :param processes: integer of the number of processes to parse the months
+     (i.e. 8). It can not be used inside a process of a pool.
+    :return: iterator -- The function yields tuples with the string of the
+     week and the pd.DataFrame with the data of the week.
+    """
+
+    bounds: List[Tuple[str, dt.datetime, Optional[dt.datetime]]] = []
+    pieces: List[pd.DataFrame] = []
+    last_chunk: Optional[pd.DataFrame] = None
+    w_pos: int = 0
+    prev_midpoint: Optional[float] = None
+    prev_sign: int = 1
+
+    chunk: pd.DataFrame
+    for chunk in hist_fx_data_extraction_chunks(fx_pair, year, chunk_size,
+                                                processes):
+        if not len(chunk):
+            continue
+
+        if year_signs:
+            midpoint: np.ndarray = \
+                ((chunk['Ask'] + chunk['Bid']) / 2).to_numpy()
+            chunk['Signs'] = hist_fx_trade_signs(midpoint, prev_midpoint,
+                                                 prev_sign)
+            prev_midpoint = midpoint[-1]
+            prev_sign = chunk['Signs'].iloc[-1]
+
+        if not bounds:
+            bounds = hist_data_tools_extraction \
+                .hist_week_bounds(year, chunk['DateTime'].iloc[0])
+
+        while w_pos < len(bounds):
+            week_ini: dt.datetime = bounds[w_pos][1]
+            week_fin: Optional[dt.datetime] = bounds[w_pos][2]
+            pos_ini: int = int(chunk['DateTime'].searchsorted(week_ini))
+            pos_fin: int = len(chunk) if week_fin is None \
+                else int(chunk['DateTime'].searchsorted(week_fin))
+            pieces.append(chunk.iloc[pos_ini:pos_fin])
+
+            # The week continues in the next chunk
+            if pos_fin == len(chunk):
+                break
+
+            yield (bounds[w_pos][0], pd.concat(pieces))
+            pieces = []
+            w_pos += 1
+
+        last_chunk = chunk
+
+    if last_chunk is None:
+        return
+
+    # Last days of the year
+    last_tick: dt.datetime = last_chunk['DateTime'].iloc[-1]
+    while w_pos < len(bounds):
+        w_df: pd.DataFrame = pd.concat(pieces) if pieces \
+            else last_chunk.iloc[:0]
+        if bounds[w_pos][2] is None:
+            week_fin = last_tick.replace(hour=16, minute=51, second=0,
+                                         microsecond=0)
+            w_df = w_df[w_df['DateTime'] < week_fin]
+
+        yield (bounds[w_pos][0], w_df)
+        pieces = []
+        w_pos += 1
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_data_extraction_week(fx_pair: str, year: str,
+                                 stream: bool = True,
+                                 year_signs: bool = False,
+                                 prices: str = 'float64',
+                                 arrays: bool = False,
+                                 processes: int = 1,
+                                 chunk_size: int = 1000000) -> None:
     """Extracts the bid and ask for a week.
 
+    The midpoint price, spread and trade signs of every week are computed
+    before it is saved.
+
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e. '2016').
+    :param stream: bool to split the data in weeks while it is read (True) or
+     after loading the whole year (False). The stream keeps in memory only
+     the open week and a chunk, with the same weeks and trade signs, so it
+     is used for the years that do not fit in memory.
+    :param year_signs: bool to compute the trade signs over the whole year
+     across the week limits (True) or starting every week with +1 (False).
+    :param prices: string of the format of the saved price columns,
+     'float64', 'float32' or 'pips' (i.e. 'float32').
+    :param arrays: bool to also save the midpoint price and trade signs as
+     numpy arrays for the response functions (True) or not (False).
+    :param processes: integer of the number of processes to parse the months
+     (i.e. 8). It can not be used inside a process of a pool.
+    :param chunk_size: integer of the number of rows of every chunk read in
+     the stream (i.e. 1000000).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
@@ -113,15 +736,6 @@ def hist_fx_data_extraction_week(fx_pair: str, year: str) -> None:
     hist_data_tools_extraction \
         .hist_function_header_print_data(function_name, fx_pair, year, '')
 
-    # Year data
-    fx_data: pd.DataFrame = hist_fx_data_extraction_year(fx_pair, year)
-
-    # Obtain the dates of every Sunday in the year
-    weeks_tup: Tuple[str, ...] = hist_data_tools_extraction.hist_sundays(year)
-    # Convert the Sundays dates in datetime type
-    weeks: List[dt.datetime] = \
-        [dt.datetime.strptime(x, '%Y-%m-%d') for x in weeks_tup]
-
     # Saving data
     if (not os.path.isdir(
             f'../../hist_data/extraction_data_{year}/{function_name}/')):
@@ -147,215 +761,144 @@ def hist_fx_data_extraction_week(fx_pair: str, year: str) -> None:
         except FileExistsError:
             print('Folder exists. The folder was not created')
 
-    # Year that not starts with a Saturday or Sunday
-    if (weeks[0].day != 1 and weeks[0].day != 2):
-
-        hist_fx_week_start(fx_pair, function_name, year, fx_data, weeks)
-
-    # Year that starts with a Saturday or Sunday
+    weeks: Iterator[Tuple[str, pd.DataFrame]]
+    if stream:
+        weeks = hist_fx_data_extraction_stream(fx_pair, year, chunk_size,
+                                               year_signs, processes)
     else:
-
-        hist_fx_weekend_start(fx_pair, function_name, year, fx_data, weeks)
-
-    del fx_data
+        # Year data
+        fx_data: pd.DataFrame = hist_fx_data_extraction_year(fx_pair, year,
+                                                             processes)
+        if year_signs:
+            fx_data['Signs'] = hist_fx_trade_signs(
+                ((fx_data['Ask'] + fx_data['Bid']) / 2).to_numpy())
+        weeks = hist_fx_week_partition(fx_data, year)
+
+    # Manifest with the weeks saved
+    manifest: Dict[str, Dict[str, Any]] = {}
+
+    # Midpoint, spread and signs computed before saving every week
+    week: str
+    w_df: pd.DataFrame
+    for week, w_df in weeks:
+        w_data: pd.DataFrame = hist_fx_basic_trade_data(w_df)
+        hist_data_tools_extraction.hist_save_data(w_data, fx_pair, year, week,
+                                                  prices, arrays)
+        if len(w_data):
+            manifest[week] = hist_data_store_shared \
+                .hist_manifest_entry(w_data, fx_pair, year, week)
+
+    hist_data_store_shared.hist_save_manifest(fx_pair, year, manifest)
 
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_week_start(fx_pair: str, function_name: str, year: str,
-                       fx_data: pd.DataFrame,
-                       weeks: List[dt.datetime]) -> None:
-    """Extracts the bid and ask for a week that starts in a week day.
+def hist_fx_week_partition(
+        fx_data: pd.DataFrame,
+        year: str) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Splits the bid and ask of a year in weeks.
 
-    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
-     (i.e. 'eur_usd').
-    :param function_name: string of the function used to analyze the data.
+    The limits of all the weeks are obtained with hist_week_bounds and their
+    positions in the time sorted data are found with a single searchsorted
+    call. The weeks are slices of the data, so they are not copied.
+
+    :param fx_data: pd.DataFrame with the data of the year sorted by
+     'DateTime'.
     :param year: string of the year to be analyzed (i.e. '2016').
-    :param fx_data: pd.DataFrame with the data.
-    :param weeks: List with the dates of the sundays in a year.
-    :return: None -- The function saves the data in a file and does not return
-     a value.
+    :return: iterator -- The function yields tuples with the string of the
+     week and the pd.DataFrame with the data of the week.
     """
 
-    w_idx: int
-    week: dt.datetime
-    for w_idx, week in enumerate(weeks):
-        if w_idx:
-            week_ini: dt.datetime = weeks[w_idx - 1] \
-                .replace(hour=17, minute=10, second=0)
-            # Five days from Sunday 17h10 to Friday 16h50
-            t_secs: int = 432000 - 1200 + 1
-            week_fin: dt.datetime = week_ini + dt.timedelta(seconds=t_secs)
-            w_df: pd.DataFrame = \
-                fx_data[(fx_data['DateTime'] < week_fin)
-                        & (fx_data['DateTime'] >= week_ini)]
-
-        else:
-            # First week of the year
-            week_ini = fx_data['DateTime'].iloc[0].replace(
-                hour=17, minute=10, second=0, microsecond=0)
-            week_fin = week.replace(
-                day=week.day - 2, hour=16, minute=51, second=0)
-            w_df = fx_data[(fx_data['DateTime'] < week_fin)
-                           & (fx_data['DateTime'] >= week_ini)]
-
-        # Saving data
-        w_idx_str: str
-        if w_idx + 1 < 10:
-            w_idx_str = f'0{w_idx + 1}'
-        else:
-            w_idx_str = f'{w_idx + 1}'
-
-        pickle.dump(w_df,
-                    open(f'../../hist_data/extraction_data_{year}/'
-                         + f'{function_name}/{fx_pair}/{function_name}'
-                         + f'_{fx_pair}_w{w_idx_str}.pickle', 'wb'))
-
-    # Last days of the year
-    week_ini = weeks[-1].replace(hour=17, minute=10, second=0)
-    week_fin = fx_data['DateTime'].iloc[-1] \
-        .replace(hour=16, minute=51, second=0, microsecond=0)
-    w_df = fx_data[(fx_data['DateTime'] < week_fin)
-                   & (fx_data['DateTime'] >= week_ini)]
-    # Saving data
-    pickle.dump(w_df,
-                open(f'../../hist_data/extraction_data_{year}/{function_name}/'
-                     + f'{fx_pair}/{function_name}_{fx_pair}_w{w_idx + 2}'
-                     + f'.pickle', 'wb'))
-
-    del w_df
-
-# -----------------------------------------------------------------------------
+    if not len(fx_data):
+        return
 
+    bounds: List[Tuple[str, dt.datetime, Optional[dt.datetime]]] = \
+        hist_data_tools_extraction.hist_week_bounds(
+            year, fx_data['DateTime'].iloc[0], fx_data['DateTime'].iloc[-1])
 
-def hist_fx_weekend_start(fx_pair: str, function_name: str, year: str,
-                          fx_data: pd.DataFrame,
-                          weeks: List[dt.datetime]) -> None:
-    """Extracts the bid and ask for a weekend that starts in a week day.
+    # Start and end of every week
+    limits: pd.DatetimeIndex = pd.to_datetime(
+        [limit for bound in bounds for limit in bound[1:]])
+    positions: np.ndarray = fx_data['DateTime'].searchsorted(limits)
 
-    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
-     (i.e. 'eur_usd').
-    :param function_name: string of the function used to analyze the data.
-    :param year: string of the year to be analyzed (i.e. '2016').
-    :param fx_data: pd.DataFrame with the data.
-    :param weeks: List with the dates of the sundays in a year.
-    :return: None -- The function saves the data in a file and does not return
-     a value.
-    """
     w_idx: int
-    for w_idx, _ in enumerate(weeks):
-        if w_idx:
-
-            week_ini = weeks[w_idx - 1].replace(hour=17, minute=10,
-                                                second=0)
-            # Five days from Sunday 17h10 to Friday 16h50
-            t_secs = 432000 - 1200 + 1
-            week_fin = week_ini + dt.timedelta(seconds=t_secs)
-            w_df = fx_data[(fx_data['DateTime'] < week_fin)
-                           & (fx_data['DateTime'] >= week_ini)]
-
-            # Saving data
-            if w_idx < 10:
-                w_idx_str = f'0{w_idx}'
-            else:
-                w_idx_str = f'{w_idx}'
-
-            pickle.dump(w_df,
-                        open(f'../../hist_data/extraction_data_{year}/'
-                             + f'{function_name}/{fx_pair}/{function_name}'
-                             + f'_{fx_pair}_w{w_idx_str}.pickle', 'wb'))
+    bound: Tuple[str, dt.datetime, Optional[dt.datetime]]
+    for w_idx, bound in enumerate(bounds):
+        pos_ini: int = positions[2 * w_idx]
+        pos_fin: int = max(pos_ini, positions[2 * w_idx + 1])
 
-    # Last days of the year
-    week_ini = weeks[-1].replace(hour=17, minute=10, second=0)
-    week_fin = fx_data['DateTime'].iloc[-1] \
-        .replace(hour=16, minute=51, second=0, microsecond=0)
-    w_df = fx_data[(fx_data['DateTime'] < week_fin)
-                   & (fx_data['DateTime'] >= week_ini)]
-    # Saving data
-    pickle.dump(w_df,
-                open(f'../../hist_data/extraction_data_{year}/{function_name}/'
-                     + f'{fx_pair}/{function_name}_{fx_pair}_w{w_idx + 1}'
-                     + f'.pickle', 'wb'))
-
-    del w_df
+        yield (bound[0], fx_data.iloc[pos_ini:pos_fin])
 
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_midpoint_trade_data(fx_pair: str, year: str, week: str) -> None:
-    """Extracts the midpoint price for a year.
+def hist_fx_trade_signs(midpoint: np.ndarray,
+                        prev_midpoint: Optional[float] = None,
+                        prev_sign: int = 1) -> np.ndarray:
+    """Obtains the trade signs from the midpoint price.
 
-    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
-     (i.e. 'eur_usd').
-    :param year: string of the year to be analyzed (i.e. '2019').
-    :param week: string of the week to be analyzed (i.e. '01').
-    :return: None -- The function saves the data in a file and does not return
-     a value.
+    The trade signs are obtained from the midpoint price as
+    :math:`\\epsilon(t) = sign(m(t) - m(t - 1))`, where +1 indicates the
+    trade was triggered by a market order to buy, and -1 indicates the trade
+    was triggered by a market order to sell. When the midpoint price does not
+    change the previous sign is kept. The zeros are filled with the index of
+    the last non zero sign (a maximum.accumulate), without NaN values or
+    float arrays.
+
+    :param midpoint: numpy array with the midpoint price.
+    :param prev_midpoint: float of the midpoint price before the first value,
+     None when there is no previous value.
+    :param prev_sign: integer of the trade sign before the first value
+     (i.e. 1). Without prev_midpoint it is the first sign.
+    :return: numpy array -- The function returns the trade signs as int8.
     """
 
-    try:
-        # Load data
-        fx_data: pd.DataFrame = pickle.load(open(
-                        f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                        + f'_extraction_week/{fx_pair}/hist_fx_data_extraction'
-                        + f'_week_{fx_pair}_w{week}.pickle', 'rb'))
-
-        fx_data['Midpoint'] = (fx_data['Ask'] + fx_data['Bid']) / 2
-        fx_data['Spread'] = fx_data['Ask'] - fx_data['Bid']
+    # The first position holds the previous sign
+    trade_signs: np.ndarray = np.empty(len(midpoint) + 1, dtype=np.int8)
+    trade_signs[0] = prev_sign
 
-        # Saving data
-        hist_data_tools_extraction.hist_save_data(fx_data, fx_pair, year, week)
+    if len(midpoint):
+        first: float = midpoint[0] if prev_midpoint is None \
+            else prev_midpoint
+        trade_signs[1:] = np.sign(np.diff(midpoint, prepend=first))
 
-        del fx_data
+    # Index of the last non zero sign
+    last_idx: np.ndarray = np.arange(len(trade_signs))
+    last_idx[trade_signs == 0] = 0
+    np.maximum.accumulate(last_idx, out=last_idx)
 
-    except FileNotFoundError as error:
-        print('No data')
-        print(error)
-        print()
+    return trade_signs[last_idx[1:]]
 
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_trade_signs_trade_data(fx_pair: str, year: str, week: str) -> None:
-    """Extracts the trade signs price for a year.
+def hist_fx_basic_trade_data(w_df: pd.DataFrame) -> pd.DataFrame:
+    """Obtains the midpoint price, spread and trade signs of a week.
 
-    The trade signs are obtained from the midpoint price as
-    :math:`\\epsilon(t) = sign(m(t) - m(t - 1))`, where +1 indicates the trade
-    was triggered by a market order to buy, and -1 indicates the trade was
-    triggered by a market order to sell.
+    The values are computed in the week returned by the partition, before
+    the data is saved, so every weekly file is written once. If the week
+    already has a 'Signs' column (signs of the whole year) it is kept.
 
-    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
-     (i.e. 'eur_usd').
-    :param year: string of the year to be analyzed (i.e. '2016').
-    :return: None -- The function saves the data in a file and does not return
-     a value.
+    :param w_df: pd.DataFrame with the bid and ask of the week.
+    :return: pd.DataFrame -- The function returns the data of the week with
+     the 'Midpoint', 'Spread' and 'Signs' columns and 'DateTime' as index.
     """
 
-    try:
-        # Load data
-        fx_data: pd.DataFrame = pickle.load(open(
-                        f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                        + f'_extraction_week/{fx_pair}/hist_fx_data_extraction'
-                        + f'_week_{fx_pair}_w{week}.pickle', 'rb'))
-
-        trade_signs_bef: pd.Series = np.sign(fx_data['Midpoint'].diff())
-        trade_signs_bef[trade_signs_bef == 0] =\
-            trade_signs_bef[trade_signs_bef == 0] * np.nan
-        trade_signs_bef.iloc[0] = 1
-        trade_signs: pd.Series = trade_signs_bef.fillna(method='ffill')
-
-        fx_data['Signs'] = trade_signs
-        fx_data.set_index('DateTime', inplace=True)
+    fx_data: pd.DataFrame = w_df.copy()
 
-        # Saving data
-        hist_data_tools_extraction.hist_save_data(fx_data, fx_pair, year, week)
+    year_signs: Optional[pd.Series] = fx_data.pop('Signs') \
+        if 'Signs' in fx_data else None
 
-        del fx_data
+    fx_data['Midpoint'] = (fx_data['Ask'] + fx_data['Bid']) / 2
+    fx_data['Spread'] = fx_data['Ask'] - fx_data['Bid']
+    if year_signs is None:
+        fx_data['Signs'] = \
+            hist_fx_trade_signs(fx_data['Midpoint'].to_numpy())
+    else:
+        fx_data['Signs'] = year_signs
+    fx_data.set_index('DateTime', inplace=True)
 
-    except FileNotFoundError as error:
-        print('No data')
-        print(error)
-        print()
+    return fx_data
 
 # -----------------------------------------------------------------------------
 
@@ -6,10 +6,13 @@ Capital in a year.
 This script requires the following modules:
     * itertools
     * multiprocessing
+    * sys
     * typing
     * hist_data_analysis_extraction
     * hist_data_plot_extraction
     * hist_data_tools_extraction
+    * hist_data_schedule_shared
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_data_plot_generator - generates all the analysis and plots from the
@@ -24,60 +27,138 @@ The module contains the following functions:
 
 from itertools import product as iprod
 import multiprocessing as mp
-from typing import List, Tuple
+import sys
+from typing import Any, List, Optional, Tuple
 
 import hist_data_analysis_extraction
 import hist_data_plot_extraction
 import hist_data_tools_extraction
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_schedule_shared
+import hist_data_store_shared
+
 # -----------------------------------------------------------------------------
 
 
 def hist_data_plot_generator(fx_pairs: List[str], years: List[str],
-                             weeks: Tuple[str, ...]) -> None:
+                             weeks: Tuple[str, ...],
+                             arrays: bool = False, stream: bool = True,
+                             budget: Optional[int] = None,
+                             months: bool = False,
+                             ticks: bool = False,
+                             chunk_size: int = 1000000) -> None:
     """Generates all the analysis and plots from the HIST data.
 
+    The years of all the pairs are extracted in a single pool. A year is only
+    started when its estimated memory fits in the memory budget left by the
+    years being extracted. When the available memory is not known the years
+    are extracted one at a time, as without a budget the largest years
+    would run together.
+
+    A year larger than the total size divided by the number of processes
+    would finish long after the others. With months these years are
+    extracted first, one after another, with their months parsed in
+    parallel. They are counted against the same memory budget, which bounds
+    the number of months parsed at the same time.
+
     :param fx_pairs: list of the string abbreviation of the forex pairs to be
      analyzed (i.e. ['eur_usd', 'gbp_usd']).
     :param years: list of the strings of the years to be analyzed
      (i.e. ['2016', '2017']).
     :param weeks: tuple of the strings of the weeks to be analyzed
      (i.e. ('01', '02')).
+    :param arrays: bool to also save the midpoint price and trade signs as
+     numpy arrays for the response functions (True) or not (False).
+    :param stream: bool to split the data in weeks while it is read, keeping
+     in memory only the open week and a chunk (True), or after loading the
+     whole year (False).
+    :param budget: integer of the memory in bytes for the years extracted
+     together, or None to use the available memory (i.e. 16 * 2 ** 30).
+    :param months: bool to parse the months of the largest years in parallel
+     (True) or to extract every year in a single process (False).
+    :param ticks: bool to first convert the zip files to binary tick files,
+     which are read instead of the zip files in this and the next
+     extractions (True) or not (False).
+    :param chunk_size: integer of the number of rows of every chunk read in
+     the stream (i.e. 1000000).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
 
-    fx_pair: str
-    year: str
-    for fx_pair in fx_pairs:
-        for year in years:
-            # Data extraction
+    tasks: List[Tuple[Any, ...]] = list(iprod(fx_pairs, years, [stream],
+                                              [False], ['float64'], [arrays],
+                                              [1], [chunk_size]))
+    # The tasks are sorted by the size of the zip files of the year
+    sizes: List[int] = [
+        hist_data_schedule_shared.hist_task_size(
+            [hist_data_tools_extraction.hist_month_path(*task[:2],
+                                                        f'{m_num:02d}')
+             for m_num in range(1, 13)])
+        for task in tasks]
+    memory: List[int] = [
+        hist_data_tools_extraction.hist_year_memory(*task[:3], chunk_size)
+        for task in tasks]
+    if budget is None:
+        budget = hist_data_schedule_shared.hist_memory_available()
+    processes: int = mp.cpu_count()
+    # The years only run in parallel with a memory budget
+    year_processes: int = processes if budget is not None else 1
+
+    if ticks:
+        with mp.Pool(processes=year_processes) as pool:
+            # Conversion of the months to binary tick files
+            list(hist_data_schedule_shared.hist_schedule_run(
+                pool,
+                hist_data_analysis_extraction.hist_fx_data_extraction_ticks,
+                [task[:2] for task in tasks], sizes, year_processes,
+                [hist_data_tools_extraction.hist_month_memory(*task[:2])
+                 for task in tasks], budget))
+
+    if months and processes > 1:
+        share: float = sum(sizes) / processes
+        large: List[int] = [idx for idx in range(len(tasks))
+                            if sizes[idx] > share]
+
+        task: Tuple[Any, ...]
+        for task in hist_data_schedule_shared.hist_schedule_order(
+                [tasks[idx] for idx in large], [sizes[idx] for idx in large]):
+            # Data extraction with the months parsed in parallel
+            window: int = hist_data_tools_extraction.hist_month_window(
+                *task[:3], processes, budget, chunk_size)
             hist_data_analysis_extraction \
-                .hist_fx_data_extraction_week(fx_pair, year)
+                .hist_fx_data_extraction_week(*task[:6], window, chunk_size)
 
-    # Parallel computing
-    with mp.Pool(processes=mp.cpu_count()) as pool:
-        # Basic functions
-        pool.starmap(hist_data_analysis_extraction
-                     .hist_fx_midpoint_trade_data,
-                     iprod(fx_pairs, years, weeks))
+        # The other years are extracted in the pool
+        tasks = [tasks[idx] for idx in range(len(tasks)) if idx not in large]
+        memory = [memory[idx] for idx in range(len(memory))
+                  if idx not in large]
+        sizes = [size for size in sizes if size <= share]
 
     # Parallel computing
-    with mp.Pool(processes=mp.cpu_count()) as pool:
-        # Basic functions
-        pool.starmap(hist_data_analysis_extraction
-                     .hist_fx_trade_signs_trade_data,
-                     iprod(fx_pairs, years, weeks))
+    with mp.Pool(processes=year_processes) as pool:
+        # Data extraction with the midpoint price, spread and signs
+        list(hist_data_schedule_shared.hist_schedule_run(
+            pool, hist_data_analysis_extraction.hist_fx_data_extraction_week,
+            tasks, sizes, year_processes, memory, budget))
 
+    fx_pair: str
+    year: str
     for fx_pair in fx_pairs:
         for year in years:
+            # Weeks with data from the manifest
+            weeks_data: Tuple[str, ...] = tuple(
+                week for week in hist_data_store_shared
+                .hist_load_manifest(fx_pair, year) if week in weeks)
+            if not weeks_data:
+                continue
             # Plot
             hist_data_plot_extraction \
-                .hist_fx_quotes_year_plot(fx_pair, year, weeks)
+                .hist_fx_quotes_year_plot(fx_pair, year, weeks_data)
             hist_data_plot_extraction \
-                .hist_fx_midpoint_year_plot(fx_pair, year, weeks)
+                .hist_fx_midpoint_year_plot(fx_pair, year, weeks_data)
             hist_data_plot_extraction \
-                .hist_fx_spread_year_plot(fx_pair, year, weeks)
+                .hist_fx_spread_year_plot(fx_pair, year, weeks_data)
 
 # -----------------------------------------------------------------------------
 
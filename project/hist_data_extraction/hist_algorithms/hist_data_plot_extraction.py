@@ -5,11 +5,12 @@ hist_data_analysis_extraction module.
 
 This script requires the following modules:
     * gc
-    * pickle
+    * sys
     * typing
     * matplotlib
     * pandas
-    * hist_data_tools_data_extract
+    * hist_data_tools_extraction
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_fx_quotes_year_plot - plots the forex quotes for a year.
@@ -24,7 +25,7 @@ The module contains the following functions:
 # Modules
 
 import gc
-import pickle
+import sys
 from typing import Tuple
 
 from matplotlib import pyplot as plt  # type: ignore
@@ -32,6 +33,9 @@ import pandas as pd  # type: ignore
 
 import hist_data_tools_extraction
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_store_shared
+
 # ----------------------------------------------------------------------------
 
 
@@ -60,10 +64,8 @@ def hist_fx_quotes_year_plot(fx_pair: str, year: str,
     for week in weeks:
         try:
             # Load data
-            fx_data: pd.DataFrame = pickle.load(open(
-                f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                + f'_extraction_week/{fx_pair}/hist_fx_data_extraction_week'
-                + f'_{fx_pair}_w{week}.pickle', 'rb'))
+            fx_data: pd.DataFrame = hist_data_store_shared \
+                .hist_load_week(fx_pair, year, week, columns=['Bid', 'Ask'])
 
         except FileNotFoundError as error:
             print('No data')
@@ -118,10 +120,8 @@ def hist_fx_midpoint_year_plot(fx_pair: str, year: str,
     for week in weeks:
         try:
             # Load data
-            fx_data: pd.DataFrame = pickle.load(open(
-                f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                + f'_extraction_week/{fx_pair}/hist_fx_data_extraction_week'
-                + f'_{fx_pair}_w{week}.pickle', 'rb'))
+            fx_data: pd.DataFrame = hist_data_store_shared \
+                .hist_load_week(fx_pair, year, week, columns=['Midpoint'])
 
         except FileNotFoundError as error:
             print('No data')
@@ -173,10 +173,8 @@ def hist_fx_spread_year_plot(fx_pair: str, year: str,
     for week in weeks:
         try:
             # Load data
-            fx_data: pd.DataFrame = pickle.load(open(
-                f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                + f'_extraction_week/{fx_pair}/hist_fx_data_extraction_week'
-                + f'_{fx_pair}_w{week}.pickle', 'rb'))
+            fx_data: pd.DataFrame = hist_data_store_shared \
+                .hist_load_week(fx_pair, year, week, columns=['Spread'])
 
         except FileNotFoundError as error:
             print('No data')
@@ -5,11 +5,13 @@ whole implementation. These tools improve the way the tasks are standardized
 in the modules that use them.
 
 This script requires the following modules:
+    * datetime
     * os
-    * pickle
+    * sys
     * typing
     * matplotlib
     * pandas
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_save_data - saves computed data.
@@ -21,6 +23,13 @@ The module contains the following functions:
     * hist_sundays - generates a tuple with the dates of every sunday in a
       year.
     * hist_weeks - generates a tuple with the number of weeks in a year.
+    * hist_week_bounds - generates the limits of every week in a year.
+    * hist_month_path - returns the path of the zip file of a month.
+    * hist_month_memory - estimates the memory to parse the largest month of
+      a year.
+    * hist_year_memory - estimates the memory to extract a year.
+    * hist_month_window - returns the number of months of a year parsed at
+      the same time.
     * main - the main function of the script.
 
 .. moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
@@ -29,27 +38,54 @@ The module contains the following functions:
 # -----------------------------------------------------------------------------
 # Modules
 
+import datetime as dt
 import os
-import pickle
-from typing import Any, List, Tuple
+import sys
+from typing import List, Optional, Tuple
 
 from matplotlib import pyplot as plt  # type: ignore
 import pandas as pd  # type: ignore
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_store_shared
+
+# Bytes of zip file for every tick. A tick is a CSV line of about 40 bytes
+# and the zip files are taken 8 times smaller than the CSV files, which is
+# in the high end, so the number of ticks is not underestimated
+__zip_tick_bytes__ = 5
+# Bytes of memory for every tick of a chunk or a month parsed at once: the
+# CSV lines (40), the 'DateTime', 'Bid' and 'Ask' arrays (24) and the
+# midpoint price and trade signs of the year signs (16)
+__chunk_tick_bytes__ = 80
+# Bytes of memory for every tick of a whole year: the chunks or months (24)
+# and their concatenation (24), and the 'Signs' of the year (8)
+__year_tick_bytes__ = 56
+# Bytes of memory for every tick of the week being saved: the pieces of the
+# week and their concatenation (48) and the 'Midpoint', 'Spread' and
+# 'Signs' columns with the temporary arrays used to compute them (48)
+__week_tick_bytes__ = 96
+
 # -----------------------------------------------------------------------------
 
 
-def hist_save_data(data: Any, fx_pair: str, year: str, week: str) -> None:
-    """Saves computed data in pickle files.
+def hist_save_data(data: pd.DataFrame, fx_pair: str, year: str,
+                   week: str, prices: str = 'float64',
+                   arrays: bool = False) -> None:
+    """Saves computed data in HDF5 files.
 
     Saves the data generated in the functions of the
-    hist_data_analysis_extraction module in pickle files.
+    hist_data_analysis_extraction module in HDF5 files with the
+    hist_data_store_shared module.
 
-    :param data: data to be saved. The data can be of different types.
+    :param data: pd.DataFrame with the tick data of the week.
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e '2016').
     :param week: string of the week to be analyzed (i.e '07').
+    :param prices: string of the format of the price columns, 'float64',
+     'float32' or 'pips' (i.e. 'float32').
+    :param arrays: bool to also save the midpoint price and trade signs as
+     numpy arrays (True) or not (False).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
@@ -69,10 +105,11 @@ def hist_save_data(data: Any, fx_pair: str, year: str, week: str) -> None:
         except FileExistsError:
             print('Folder exists. The folder was not created')
 
-    pickle.dump(data, open(f'../../hist_data/extraction_data_{year}/'
-                           + f'/hist_fx_data_extraction_week/{fx_pair}/hist_fx'
-                           + f'_data_extraction_week_{fx_pair}_w{week}.pickle',
-                           'wb'))
+    # The empty weeks are not saved
+    hist_data_store_shared.hist_save_week(data, fx_pair, year, week, prices)
+    if arrays and len(data):
+        hist_data_store_shared.hist_save_arrays(
+            data, hist_data_store_shared.hist_week_path(fx_pair, year, week))
 
     print('Data Saved')
     print()
@@ -257,6 +294,189 @@ def hist_weeks() -> Tuple[str, ...]:
 # -----------------------------------------------------------------------------
 
 
+def hist_week_bounds(year: str, first_tick: dt.datetime,
+                     last_tick: Optional[dt.datetime] = None) \
+        -> List[Tuple[str, dt.datetime, Optional[dt.datetime]]]:
+    """Generates the limits of every week in a year.
+
+    The weeks go from Sunday 17:10 to Friday 16:50. When the year does not
+    start on a Saturday or a Sunday, the first week starts the day of the
+    first tick and is the week '01'. The last week ends the day of the last
+    tick.
+
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param first_tick: datetime of the first tick of the year.
+    :param last_tick: datetime of the last tick of the year. When it is None
+     the end of the last week is None.
+    :return: list -- The function returns a list of tuples with the string of
+     the week, the start (included) and the end (excluded) of the week.
+    """
+
+    # Convert the Sundays dates in datetime type
+    weeks: List[dt.datetime] = \
+        [dt.datetime.strptime(x, '%Y-%m-%d') for x in hist_sundays(year)]
+
+    # Five days from Sunday 17h10 to Friday 16h50
+    t_secs: int = 432000 - 1200 + 1
+
+    bounds: List[Tuple[str, dt.datetime, Optional[dt.datetime]]] = []
+    # Year that not starts with a Saturday or Sunday
+    week_start: bool = weeks[0].day != 1 and weeks[0].day != 2
+
+    if week_start:
+        # First week of the year
+        bounds.append(
+            ('01',
+             first_tick.replace(hour=17, minute=10, second=0, microsecond=0),
+             weeks[0].replace(day=weeks[0].day - 2, hour=16, minute=51,
+                              second=0)))
+
+    w_idx: int
+    for w_idx in range(1, len(weeks)):
+        week_ini: dt.datetime = weeks[w_idx - 1] \
+            .replace(hour=17, minute=10, second=0)
+        w_num: int = w_idx + 1 if week_start else w_idx
+        w_num_str: str = f'0{w_num}' if w_num < 10 else f'{w_num}'
+        bounds.append(
+            (w_num_str, week_ini, week_ini + dt.timedelta(seconds=t_secs)))
+
+    # Last days of the year
+    week_fin: Optional[dt.datetime] = None
+    if last_tick is not None:
+        week_fin = last_tick.replace(hour=16, minute=51, second=0,
+                                     microsecond=0)
+    w_last: int = len(weeks) + 1 if week_start else len(weeks)
+    bounds.append((f'{w_last}',
+                   weeks[-1].replace(hour=17, minute=10, second=0),
+                   week_fin))
+
+    return bounds
+
+# -----------------------------------------------------------------------------
+
+
+def hist_month_path(fx_pair: str, year: str, month: str) -> str:
+    """Returns the path of the zip file with the original data of a month.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param month: string of the month to be analyzed (i.e '07').
+    :return: str -- The function returns the path of the file.
+    """
+
+    return (f'../../hist_data/original_data_{year}/{fx_pair}/hist_{fx_pair}'
+            + f'_{year}{month}.zip')
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_month_ticks(fx_pair: str, year: str) -> List[int]:
+    """Estimates the number of ticks of every month of a year.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :return: list -- The function returns the list with the estimated number
+     of ticks of every month, 0 for the months without zip file.
+    """
+
+    ticks: List[int] = []
+
+    m_num: int
+    for m_num in range(1, 13):
+        path: str = hist_month_path(fx_pair, year, f'{m_num:02d}')
+        ticks.append(os.path.getsize(path) // __zip_tick_bytes__
+                     if os.path.isfile(path) else 0)
+
+    return ticks
+
+# -----------------------------------------------------------------------------
+
+
+def hist_month_memory(fx_pair: str, year: str) -> int:
+    """Estimates the memory to parse the largest month of a year.
+
+    A month parsed at once keeps its CSV buffer and its arrays, so it takes
+    __chunk_tick_bytes__ for every tick.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :return: int -- The function returns the estimated memory in bytes.
+    """
+
+    return max(_hist_month_ticks(fx_pair, year)) * __chunk_tick_bytes__
+
+# -----------------------------------------------------------------------------
+
+
+def hist_year_memory(fx_pair: str, year: str, stream: bool = True,
+                     chunk_size: int = 1000000) -> int:
+    """Estimates the memory to extract a year.
+
+    The number of ticks is estimated from the size of the zip files. The
+    largest week is taken as a quarter of the largest month, and it takes
+    __week_tick_bytes__ for every tick while it is saved.
+
+    When the whole year is loaded every tick of the year takes
+    __year_tick_bytes__. When the weeks are split while the data is read
+    only the open week and a chunk of chunk_size ticks are in memory, so the
+    estimate does not depend on the size of the year.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param stream: bool of the extraction mode, splitting the weeks while the
+     data is read (True) or after loading the whole year (False).
+    :param chunk_size: integer of the number of rows of every chunk read in
+     the stream (i.e. 1000000).
+    :return: int -- The function returns the estimated memory in bytes.
+    """
+
+    ticks: List[int] = _hist_month_ticks(fx_pair, year)
+    week_memory: int = max(ticks) // 4 * __week_tick_bytes__
+
+    if stream:
+        return week_memory + chunk_size * __chunk_tick_bytes__
+
+    return week_memory + sum(ticks) * __year_tick_bytes__
+
+# -----------------------------------------------------------------------------
+
+
+def hist_month_window(fx_pair: str, year: str, stream: bool, processes: int,
+                      budget: Optional[int], chunk_size: int = 1000000) -> int:
+    """Returns the number of months of a year parsed at the same time.
+
+    Every month parsed in a pool or waiting in the main process adds the
+    memory of the largest month to the memory of the year, so the number of
+    months is bounded to fit in the budget. At least one month is parsed.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param stream: bool of the extraction mode, splitting the weeks while the
+     data is read (True) or after loading the whole year (False).
+    :param processes: integer of the number of processes (i.e. 8).
+    :param budget: integer of the memory in bytes for the extraction, or None
+     to not limit the months (i.e. 16 * 2 ** 30).
+    :param chunk_size: integer of the number of rows of every chunk read in
+     the stream (i.e. 1000000).
+    :return: int -- The function returns the number of months.
+    """
+
+    month_memory: int = hist_month_memory(fx_pair, year)
+    if budget is None or not month_memory:
+        return processes
+
+    free: int = budget - hist_year_memory(fx_pair, year, stream, chunk_size)
+
+    return max(1, min(processes, free // month_memory))
+
+# -----------------------------------------------------------------------------
+
+
 def main() -> None:
     """The main function of the script.
 
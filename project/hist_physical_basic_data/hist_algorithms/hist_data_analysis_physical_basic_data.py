@@ -4,15 +4,21 @@ The functions in the module obtain the midpoint price and the trade signs in
 physical time scale for HIST Capital in a year.
 
 This script requires the following modules:
-    * pickle
+    * sys
     * typing
     * datetime
     * numpy
     * pandas
     * hist_data_tools_physical_basic_data
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_fx_physical_data - extracts the midpoint price for a year
+    * hist_resolution_step - returns the length of a time resolution.
+    * hist_fx_physical_levels - resamples the midpoint price and trade signs
+      of a week in several time resolutions.
+    * hist_fx_physical_resample - resamples the midpoint price and trade signs
+      of a week in a time resolution.
     * main - the main function of the script.
 
 ..moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
@@ -21,8 +27,8 @@ The module contains the following functions:
 # -----------------------------------------------------------------------------
 # Modules
 
-import pickle
-from typing import List
+import sys
+from typing import Dict, List, Tuple
 
 import datetime as dt
 import numpy as np  # type: ignore
@@ -30,69 +36,85 @@ import pandas as pd  # type: ignore
 
 import hist_data_tools_physical_basic_data
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_store_shared
+
+# Length of 10 minutes in nanoseconds
+__window__ = 600 * 10 ** 9
+
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_physical_data(fx_pair: str, year: str, week: str) -> None:
+def hist_fx_physical_data(fx_pair: str, year: str, week: str,
+                          prices: str = 'float64', arrays: bool = False,
+                          resolutions: Tuple[str, ...] = ('1s',),
+                          sparse: bool = False) -> None:
     """Extracts the midpoint price for a year.
 
+    The data is saved with the tick schema of the hist_data_store_shared
+    module: the trade signs as int8 and the midpoint price as float64 or
+    float32. All the resolutions are obtained from a single pass over the
+    ticks.
+
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e. '2019').
     :param week: string of the week to be analyzed (i.e. '01').
+    :param prices: string of the format of the midpoint price, 'float64' or
+     'float32' (i.e. 'float32').
+    :param arrays: bool to also save the midpoint price and trade signs as
+     numpy arrays for the response functions (True) or not (False).
+    :param resolutions: tuple of the strings of the time resolutions
+     (i.e. ('100ms', '1s', '1min')).
+    :param sparse: bool to also save the sparse representation of the
+     midpoint price and trade signs for the sparse engine (True) or not
+     (False).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
 
+    if prices not in ('float64', 'float32'):
+        raise ValueError(f'Unknown prices {prices}. Use float64 or float32')
+
     try:
         # Load data
-        fx_data: pd.DataFrame = pickle.load(open(
-                        f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                        + f'_extraction_week/{fx_pair}/hist_fx_data_extraction'
-                        + f'_week_{fx_pair}_w{week}.pickle', 'rb'))
-
-        fx_data_p = fx_data[['Midpoint', 'Signs']]
+        fx_data: pd.DataFrame = hist_data_store_shared \
+            .hist_load_week(fx_pair, year, week, columns=['Midpoint', 'Signs'])
 
         # Days in the week
-        dates: List[dt.date] = sorted(set(fx_data.index))
-        date_init: dt.date = dates[0]
-        date_end: dt.date = dates[-1]
+        date_init: dt.datetime = fx_data.index[0]
+        date_end: dt.datetime = fx_data.index[-1]
 
         # First day of the week to be analyzed
         t_init: dt.datetime = dt.datetime(date_init.year, date_init.month,
                                           date_init.day, 17, 10, 0, 0)
-        t_init_dict = {'DateTime': t_init, 'Midpoint': np.nan, 'Signs': np.nan}
-        t_init_df = pd.DataFrame(t_init_dict, index=[t_init])
-        t_init_df.set_index('DateTime', inplace=True)
 
         # Last day of the week to be analyzed
         t_end: dt.datetime = dt.datetime(date_end.year, date_end.month,
                                          date_end.day, 16, 50, 0, 0)
-        t_end_dict = {'DateTime': t_end, 'Midpoint': np.nan, 'Signs': np.nan}
-        t_end_df = pd.DataFrame(t_end_dict, index=[t_end])
-        t_end_df.set_index('DateTime', inplace=True)
-
-        fx_data_p = fx_data_p[fx_data_p.index <= t_end]
 
-        fx_data_p = pd.concat([t_init_df, fx_data_p, t_end_df])
-
-        midpoint = fx_data_p['Midpoint'].resample('S').last()
-        signs = fx_data_p['Signs'].resample('S').sum()
-        signs = np.sign(signs)
-
-        series = [midpoint, signs]
-
-        fx_data_p = pd.concat(series, axis=1)
-        fx_data_p['Midpoint'] = fx_data_p['Midpoint'].fillna(method='ffill')
-        fx_data_p['Midpoint'] = fx_data_p['Midpoint'].fillna(method='bfill')
-        fx_data_p['Signs'] = fx_data_p['Signs'].fillna(value=0)
-
-        # Saving data
-        hist_data_tools_physical_basic_data \
-            .hist_save_data(fx_data_p, fx_pair, year, week)
+        levels: Dict[str, pd.DataFrame] = \
+            hist_fx_physical_levels(fx_data, t_init, t_end, resolutions)
+
+        resolution: str
+        fx_data_p: pd.DataFrame
+        for resolution, fx_data_p in levels.items():
+            fx_data_s: pd.DataFrame
+            fx_data_s, _ = hist_data_store_shared \
+                .hist_encode_ticks(fx_data_p, fx_pair, prices)
+
+            # Saving data
+            hist_data_tools_physical_basic_data \
+                .hist_save_data(fx_data_s, fx_pair, year, week, resolution)
+            path: str = hist_data_store_shared.hist_physical_path(
+                fx_pair, year, week, resolution)
+            if arrays:
+                hist_data_store_shared.hist_save_arrays(fx_data_p, path)
+            if sparse:
+                hist_data_store_shared.hist_save_sparse(fx_data_p, path)
 
         del fx_data
-        del fx_data_p
+        del levels
 
     except FileNotFoundError as error:
         print('No data')
@@ -102,6 +124,176 @@ def hist_fx_physical_data(fx_pair: str, year: str, week: str) -> None:
 # -----------------------------------------------------------------------------
 
 
+def hist_resolution_step(resolution: str) -> int:
+    """Returns the length of a time resolution in nanoseconds.
+
+    The resolution must divide 10 minutes, so the intervals of all the
+    resolutions start at 17:10 and the intervals of a resolution are inside
+    the intervals of the coarser ones.
+
+    :param resolution: string of the time resolution (i.e. '100ms').
+    :return: int -- The function returns the length in nanoseconds.
+    :raises ValueError: if the resolution does not divide 10 minutes.
+    """
+
+    step: int = pd.Timedelta(resolution).value
+
+    if step <= 0 or __window__ % step:
+        raise ValueError(f'The resolution {resolution} must divide 10 minutes')
+
+    return step
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_physical_bins(offsets: np.ndarray, midpoint: np.ndarray,
+                        trade_signs: np.ndarray,
+                        bins_num: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Obtains the last midpoint price and the sum of signs of every interval.
+
+    :param offsets: numpy array with the non decreasing interval of every
+     value.
+    :param midpoint: numpy array with the midpoint prices. The NaN values are
+     skipped.
+    :param trade_signs: numpy array with the trade signs (or the sums of
+     trade signs of finer intervals).
+    :param bins_num: integer of the number of intervals.
+    :return: tuple -- The function returns a tuple with the last midpoint
+     price (NaN without values) and the sum of the signs of every interval.
+    """
+
+    valid: np.ndarray = ~np.isnan(midpoint)
+    valid_offsets: np.ndarray = offsets[valid]
+
+    last_pos: np.ndarray = np.flatnonzero(np.diff(valid_offsets, append=-1))
+    midpoint_b: np.ndarray = np.full(bins_num, np.nan)
+    midpoint_b[valid_offsets[last_pos]] = midpoint[valid][last_pos]
+
+    signs_b: np.ndarray = np.bincount(offsets, weights=trade_signs,
+                                      minlength=bins_num)
+
+    return (midpoint_b, signs_b)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_physical_levels(fx_data: pd.DataFrame, t_init: dt.datetime,
+                            t_end: dt.datetime,
+                            resolutions: Tuple[str, ...] = ('1s',)) \
+        -> Dict[str, pd.DataFrame]:
+    """Resamples a week in several time resolutions.
+
+    The midpoint price and the trade signs of the week are resampled. Every
+    tick is mapped to its offset in intervals from the start of the week in
+    the finest resolution. Every coarser resolution is obtained from the
+    intervals of the previous one, so the ticks are read once. The midpoint
+    price of an interval is the one of its last tick and the trade sign is
+    the sign of the sum of the signs of its ticks. The intervals without
+    ticks take the midpoint price of the previous interval (of the first
+    interval with ticks at the start of the week) and a trade sign 0.
+
+    :param fx_data: pd.DataFrame with the 'Midpoint' and 'Signs' columns of
+     the ticks of the week indexed by time.
+    :param t_init: datetime of the start of the week
+     (i.e. dt.datetime(2016, 1, 3, 17, 10)).
+    :param t_end: datetime of the end of the week. The ticks after it are
+     not used (i.e. dt.datetime(2016, 1, 8, 16, 50)).
+    :param resolutions: tuple of the strings of the time resolutions. Every
+     resolution must be a multiple of the finer ones
+     (i.e. ('100ms', '1s', '1min')).
+    :return: dict -- The function returns a dictionary with a pd.DataFrame
+     with the midpoint price and the trade signs of every interval of the
+     week for every resolution.
+    :raises ValueError: if a resolution is not a multiple of the finer ones.
+    """
+
+    steps: Dict[str, int] = {resolution: hist_resolution_step(resolution)
+                             for resolution in resolutions}
+    order: List[str] = sorted(steps, key=lambda resolution: steps[resolution])
+
+    times: np.ndarray = fx_data.index.values.astype('datetime64[ns]') \
+        .view(np.int64)
+    last_tick: int = np.searchsorted(times, pd.Timestamp(t_end).value,
+                                     side='right')
+    times = times[:last_tick]
+    # Values of the previous level, starting with the ticks
+    midpoint: np.ndarray = \
+        fx_data['Midpoint'].to_numpy(dtype=np.float64)[:last_tick]
+    trade_signs: np.ndarray = \
+        fx_data['Signs'].to_numpy(dtype=np.float64)[:last_tick]
+
+    t_init_ns: int = pd.Timestamp(t_init).value
+    t_end_ns: int = pd.Timestamp(t_end).value
+
+    levels: Dict[str, pd.DataFrame] = {}
+    step_prev: int = 1
+
+    resolution: str
+    for resolution in order:
+        step: int = steps[resolution]
+        if step % step_prev:
+            raise ValueError(f'The resolution {resolution} must be a '
+                             + f'multiple of the finer resolutions')
+
+        # Intervals from the first interval of the week
+        t_ini_ns: int = t_init_ns
+        if len(times):
+            t_ini_ns = min(t_ini_ns, times[0] // step * step)
+        bins_num: int = (t_end_ns - t_ini_ns) // step + 1
+        offsets: np.ndarray = (times - t_ini_ns) // step
+
+        midpoint, trade_signs = _hist_physical_bins(offsets, midpoint,
+                                                    trade_signs, bins_num)
+        times = t_ini_ns + step * np.arange(bins_num, dtype=np.int64)
+        step_prev = step
+
+        # Forward fill with the position of the last interval with ticks. The
+        # intervals before the first one take its midpoint price
+        midpoint_f: np.ndarray = midpoint
+        valid: np.ndarray = ~np.isnan(midpoint)
+        if valid.any():
+            first_valid: int = int(np.argmax(valid))
+            positions: np.ndarray = np.where(valid, np.arange(bins_num),
+                                             first_valid)
+            midpoint_f = midpoint[np.maximum.accumulate(positions)]
+
+        index: pd.DatetimeIndex = pd.date_range(
+            pd.Timestamp(t_ini_ns), periods=bins_num,
+            freq=pd.Timedelta(step, unit='ns'), name='DateTime')
+
+        levels[resolution] = pd.DataFrame(
+            {'Midpoint': midpoint_f, 'Signs': np.sign(trade_signs)},
+            index=index)
+
+    return {resolution: levels[resolution] for resolution in resolutions}
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_physical_resample(fx_data: pd.DataFrame, t_init: dt.datetime,
+                              t_end: dt.datetime,
+                              resolution: str = '1s') -> pd.DataFrame:
+    """Resamples a week in a time resolution.
+
+    The midpoint price and the trade signs of the week are resampled.
+
+    :param fx_data: pd.DataFrame with the 'Midpoint' and 'Signs' columns of
+     the ticks of the week indexed by time.
+    :param t_init: datetime of the start of the week
+     (i.e. dt.datetime(2016, 1, 3, 17, 10)).
+    :param t_end: datetime of the end of the week. The ticks after it are
+     not used (i.e. dt.datetime(2016, 1, 8, 16, 50)).
+    :param resolution: string of the time resolution (i.e. '1s').
+    :return: pd.DataFrame -- The function returns a pd.DataFrame with the
+     midpoint price and the trade signs of every interval of the week.
+    """
+
+    return hist_fx_physical_levels(fx_data, t_init, t_end,
+                                   (resolution,))[resolution]
+
+# -----------------------------------------------------------------------------
+
+
 def main() -> None:
     """The main function of the script.
 
@@ -6,10 +6,13 @@ Capital in a year.
 This script requires the following modules:
     * itertools
     * multiprocessing
+    * sys
     * typing
     * hist_data_analysis_physical_basic_data
     * hist_data_plot_extraction
     * hist_data_tools_physical_basic_data
+    * hist_data_schedule_shared
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_data_plot_generator - generates all the analysis and plots from the
@@ -24,17 +27,25 @@ The module contains the following functions:
 
 from itertools import product as iprod
 import multiprocessing as mp
-from typing import List, Tuple
+import sys
+from typing import Any, Dict, List, Tuple
 
 import hist_data_analysis_physical_basic_data
 import hist_data_plot_physical_basic_data
 import hist_data_tools_physical_basic_data
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_schedule_shared
+import hist_data_store_shared
+
 # -----------------------------------------------------------------------------
 
 
 def hist_data_plot_generator(fx_pairs: List[str], years: List[str],
-                             weeks: Tuple[str, ...]) -> None:
+                             weeks: Tuple[str, ...],
+                             arrays: bool = False,
+                             resolutions: Tuple[str, ...] = ('1s',),
+                             sparse: bool = False) -> None:
     """Generates all the analysis and plots from the HIST data.
 
     :param fx_pairs: list of the string abbreviation of the forex pairs to be
@@ -43,24 +54,52 @@ def hist_data_plot_generator(fx_pairs: List[str], years: List[str],
      (i.e. ['2016', '2017']).
     :param weeks: tuple of the strings of the weeks to be analyzed
      (i.e. ['01', '02']).
+    :param arrays: bool to also save the midpoint price and trade signs as
+     numpy arrays for the response functions (True) or not (False).
+    :param resolutions: tuple of the strings of the time resolutions. The
+     midpoint price is plotted in the first one (i.e. ('1s', '1min')).
+    :param sparse: bool to also save the sparse representation of the
+     midpoint price and trade signs for the sparse engine (True) or not
+     (False).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
 
+    # Weeks with data of every pair and year from the extraction manifests
+    manifests: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {
+        (fx_pair, year): hist_data_store_shared.hist_load_manifest(fx_pair,
+                                                                   year)
+        for fx_pair, year in iprod(fx_pairs, years)}
+    weeks_data: Dict[Tuple[str, str], Tuple[str, ...]] = {
+        fx_year: tuple(week for week in manifest if week in weeks)
+        for fx_year, manifest in manifests.items()}
+
+    tasks: List[Tuple[Any, ...]] = [
+        (*fx_year, week, 'float64', arrays, resolutions, sparse)
+        for fx_year in weeks_data for week in weeks_data[fx_year]]
+    # The tasks are sorted by the number of ticks of the week
+    sizes: List[int] = [manifests[task[:2]][task[2]]['ticks']
+                        for task in tasks]
+    processes: int = mp.cpu_count()
+
     # Parallel computing
-    with mp.Pool(processes=mp.cpu_count()) as pool:
+    with mp.Pool(processes=processes) as pool:
         # Basic functions
-        pool.starmap(hist_data_analysis_physical_basic_data
-                     .hist_fx_physical_data,
-                     iprod(fx_pairs, years, weeks))
+        list(hist_data_schedule_shared.hist_schedule_run(
+            pool, hist_data_analysis_physical_basic_data.hist_fx_physical_data,
+            tasks, sizes, processes))
 
     fx_pair: str
     year: str
     for fx_pair in fx_pairs:
         for year in years:
+            if not weeks_data[(fx_pair, year)]:
+                continue
             # Plot
             hist_data_plot_physical_basic_data \
-                .hist_fx_midpoint_year_plot(fx_pair, year, weeks)
+                .hist_fx_midpoint_year_plot(fx_pair, year,
+                                            weeks_data[(fx_pair, year)],
+                                            resolutions[0])
 
 # -----------------------------------------------------------------------------
 
@@ -34,7 +34,8 @@ import hist_data_tools_physical_basic_data
 
 
 def hist_fx_midpoint_year_plot(fx_pair: str, year: str,
-                               weeks: Tuple[str, ...]) -> None:
+                               weeks: Tuple[str, ...],
+                               resolution: str = '1s') -> None:
     """Plots the midpoint price for a year.
 
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
@@ -42,6 +43,8 @@ def hist_fx_midpoint_year_plot(fx_pair: str, year: str,
     :param year: string of the year to be analyzed (i.e. '2016').
     :param weeks: tuple of the strings of the weeks to be analyzed
      (i.e. ['01', '02']).
+    :param resolution: string of the time resolution of the data
+     (i.e. '1min').
     :return: None -- The function saves the plot in a file and does not return
      a value.
     """
@@ -50,6 +53,7 @@ def hist_fx_midpoint_year_plot(fx_pair: str, year: str,
     hist_data_tools_physical_basic_data \
         .hist_function_header_print_plot(function_name, fx_pair, year, '')
     fx_pair_upper: str = fx_pair[:3].upper() + '/' + fx_pair[4:].upper()
+    suffix: str = '' if resolution == '1s' else f'_{resolution}'
 
     figure: plt.Figure = plt.figure(figsize=(16, 9))
 
@@ -60,7 +64,7 @@ def hist_fx_midpoint_year_plot(fx_pair: str, year: str,
             fx_data: pd.DataFrame = pickle.load(open(
                 f'../../hist_data/physical_basic_data_{year}/hist_fx_physical'
                 + f'_basic_data/{fx_pair}/hist_fx_physical_basic_data'
-                + f'_{fx_pair}_w{week}.pickle', 'rb'))
+                + f'_{fx_pair}_w{week}{suffix}.pickle', 'rb'))
 
         except FileNotFoundError as error:
             print('No data')
@@ -79,7 +83,7 @@ def hist_fx_midpoint_year_plot(fx_pair: str, year: str,
 
     # Plotting
     hist_data_tools_physical_basic_data \
-        .hist_save_plot(function_name, figure, fx_pair, year, '')
+        .hist_save_plot(function_name, figure, fx_pair, year, suffix)
 
     plt.close()
     del fx_data
@@ -35,7 +35,8 @@ from matplotlib import pyplot as plt  # type: ignore
 # -----------------------------------------------------------------------------
 
 
-def hist_save_data(data: Any, fx_pair: str, year: str, week: str) -> None:
+def hist_save_data(data: Any, fx_pair: str, year: str, week: str,
+                   resolution: str = '1s') -> None:
     """Saves computed data in pickle files.
 
     Saves the data generated in the functions of the
@@ -46,10 +47,14 @@ def hist_save_data(data: Any, fx_pair: str, year: str, week: str) -> None:
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e '2016').
     :param week: string of the week to be analyzed (i.e '07').
+    :param resolution: string of the time resolution of the data. The files
+     of the resolutions other than '1s' have it in their name (i.e. '1min').
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
 
+    suffix: str = '' if resolution == '1s' else f'_{resolution}'
+
     # Saving data
 
     if (not os.path.isdir(
@@ -68,7 +73,7 @@ def hist_save_data(data: Any, fx_pair: str, year: str, week: str) -> None:
     pickle.dump(data,
                 open(f'../../hist_data/physical_basic_data_{year}/hist_fx'
                      + f'_physical_basic_data/{fx_pair}/hist_fx_physical_basic'
-                     + f'_data_{fx_pair}_w{week}.pickle', 'wb'))
+                     + f'_data_{fx_pair}_w{week}{suffix}.pickle', 'wb'))
 
     print('Data Saved')
     print()
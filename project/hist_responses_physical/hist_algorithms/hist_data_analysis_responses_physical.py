@@ -8,15 +8,35 @@ This script requires the following modules:
     * multiprocessing
     * os
     * pickle
+    * sys
     * typing
     * numpy
     * pandas
+    * hist_data_tools_responses_physical
+    * hist_data_cache_shared
+    * hist_data_kernel_shared
+    * hist_data_store_shared
+    * hist_data_schedule_shared
 
 The module contains the following functions:
+    * hist_fx_week_paths_responses_physical_data - returns the input files
+      of a week.
     * hist_fx_self_response_week_responses_physical - extracts the midpoint
       price for a week.
     * hist_fx_self_response_year_responses_physical - extracts the midpoint
       price for a year.
+    * hist_fx_self_response_year_save_responses_physical_data - obtains and
+      saves the self-response of a year from the sums of its weeks.
+    * hist_fx_self_response_week_batch_responses_physical_data - computes the
+      self-response sums of a week for several forex pairs.
+    * hist_fx_self_response_year_batch_responses_physical_data - computes the
+      self-response of a year for several forex pairs.
+    * hist_fx_aligned_week_responses_physical_data - loads the weeks of
+      several forex pairs in a common time grid.
+    * hist_fx_cross_response_week_responses_physical_data - computes the
+      cross-response sums of a week for several forex pairs.
+    * hist_fx_cross_response_year_responses_physical_data - computes the
+      cross-response of a year for all the ordered pairs of forex pairs.
     * main - the main function of the script.
 
 ..moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
@@ -28,74 +48,174 @@ from itertools import product as iprod
 import multiprocessing as mp
 import os
 import pickle
-from typing import Iterator, List, Tuple
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 
 import hist_data_tools_responses_physical
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_cache_shared
+import hist_data_kernel_shared
+import hist_data_schedule_shared
+import hist_data_store_shared
+
 __tau__ = 10000
 
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_self_response_week_responses_physical_data(
-        fx_pair: str, year: str, week: str) -> Tuple[np.ndarray, ...]:
-    """Computes the self-response of a year.
+def hist_fx_week_paths_responses_physical_data(
+        fx_pair: str, year: str, week: str, arrays: bool = False,
+        resolution: str = '1s', engine: str = 'loop') -> List[str]:
+    """Returns the input files of the self-response of a week.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param week: string of the week to be analyzed (i.e. '01').
+    :param arrays: bool to use the midpoint price and trade signs arrays
+     (True) or the data of the week (False).
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param engine: string of the engine used to compute the sums. The
+     'sparse' engine uses the sparse representation of the week, or the data
+     of the week when it was not saved (i.e. 'sparse').
+    :return: list -- The function returns the list of the paths of the files.
+    """
+
+    path: str = hist_data_store_shared.hist_physical_path(fx_pair, year, week,
+                                                          resolution)
+
+    if engine == 'sparse':
+        sparse_path: str = hist_data_store_shared.hist_sparse_path(path)
+        return [sparse_path if os.path.isfile(sparse_path) else path]
+
+    if arrays:
+        return [hist_data_store_shared.hist_arrays_path(path, column)
+                for column in ('Midpoint', 'Signs')]
+
+    return [path]
+
+# -----------------------------------------------------------------------------
 
-    Using the midpoint price and the trade signs of a ticker computes the
-    self-response during different time lags (:math:`\\tau`) for a year.
+
+def _hist_fx_week_cache_path(fx_pair: str, year: str, week: str,
+                             resolution: str = '1s') -> str:
+    """Returns the path of the cached self-response sums of a week.
 
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e. '2016').
     :param week: string of the week to be analyzed (i.e. '01').
-    :return: tuple -- The function returns a tuple with numpy arrays.
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :return: str -- The function returns the path of the file.
     """
 
-    try:
-        # Load data
-        fx_data: pd.DataFrame = pickle.load(open(
-                        f'../../hist_data/physical_basic_data_{year}/hist_fx'
-                        + f'_physical_basic_data/{fx_pair}/hist_fx_physical'
-                        + f'_basic_data_{fx_pair}_w{week}.pickle', 'rb'))
+    function_name: str = \
+        hist_fx_self_response_week_responses_physical_data.__name__
+    suffix: str = '' if resolution == '1s' else f'_{resolution}'
 
-        midpoint: np.ndarray = fx_data['Midpoint'].to_numpy()
-        trade_signs: np.ndarray = fx_data['Signs'].to_numpy()
+    return (f'../../hist_data/responses_physical_{year}/{function_name}/'
+            + f'{fx_pair}/{function_name}_{fx_pair}_w{week}{suffix}.npz')
 
-        # Relate the return of the previous second with the current trade sign
-        midpoint = midpoint[:-1]
-        trade_signs = trade_signs[1:]
+# -----------------------------------------------------------------------------
 
-        assert len(midpoint) == len(trade_signs)
 
-        # Array of the average of each tau
-        self_response_tau: np.ndarray = np.zeros(__tau__)
-        num: np.ndarray = np.zeros(__tau__)
+def hist_fx_self_response_week_responses_physical_data(
+        fx_pair: str, year: str, week: str, engine: str = 'loop',
+        arrays: bool = False, cache: bool = True, resolution: str = '1s',
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
+    """Computes the self-response of a year.
+
+    Using the midpoint price and the trade signs of a ticker computes the
+    self-response during different time lags (:math:`\\tau`) for a year.
 
-        # Calculating the midpoint price return and the self-response function
-        # Depending on the tau value
-        tau_idx: int
-        for tau_idx in range(__tau__):
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param week: string of the week to be analyzed (i.e. '01').
+    :param engine: string of the engine used to compute the sums, 'loop',
+     'direct', 'fft', 'sparse' or 'numba'. The 'sparse' engine loads the
+     sparse representation of the week, or obtains it from the data of the
+     week when it was not saved (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the week (False).
+    :param cache: bool to reuse the cached result of the week when its input
+     did not change (True) or to always compute it (False).
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__ (i.e. hist_lag_grid(1000, 200)).
+    :return: tuple -- The function returns a tuple with numpy arrays.
+    """
 
-            trade_sign_tau: np.ndarray = trade_signs[:-tau_idx - 1]
-            trade_sign_no_0_len: int = len(trade_sign_tau[trade_sign_tau != 0])
-            num[tau_idx] = trade_sign_no_0_len
-            # Obtain the midpoint price return. Displace the numerator tau
-            # values to the right and compute the return
+    # Input files of the week and cached result
+    paths: List[str] = hist_fx_week_paths_responses_physical_data(
+        fx_pair, year, week, arrays, resolution, engine)
+    cache_path: str = _hist_fx_week_cache_path(fx_pair, year, week,
+                                               resolution)
+    key: str = f'{engine}_' \
+        + hist_data_kernel_shared.hist_lag_key(lags, __tau__)
 
-            # Midpoint price returns
-            log_return_sec: np.ndarray = (midpoint[tau_idx + 1:]
-                                          - midpoint[:-tau_idx - 1]) \
-                / midpoint[:-tau_idx - 1]
+    try:
+        if cache:
+            partial: Optional[Tuple[np.ndarray, np.ndarray]] = \
+                hist_data_cache_shared.hist_load_partial(cache_path, paths,
+                                                         key)
+            if partial is not None:
+                return partial
 
-            # Obtain the self response value
-            if trade_sign_no_0_len != 0:
-                product: np.ndarray = log_return_sec * trade_sign_tau
-                self_response_tau[tau_idx] = np.sum(product)
+        self_response_tau: np.ndarray
+        num: np.ndarray
 
-        del fx_data
+        # Load data
+        if engine == 'sparse':
+            tau: int = __tau__ if lags is None else int(lags[-1])
+            path: str = hist_data_store_shared.hist_physical_path(
+                fx_pair, year, week, resolution)
+            sparse: Tuple[Any, ...]
+            if os.path.isfile(hist_data_store_shared.hist_sparse_path(path)):
+                sparse = hist_data_store_shared.hist_load_sparse(path)
+            else:
+                # The data was saved without the sparse representation
+                fx_data_sparse: pd.DataFrame = hist_data_store_shared \
+                    .hist_load_physical(fx_pair, year, week, resolution)
+                sparse = hist_data_kernel_shared.hist_sparse_arrays(
+                    fx_data_sparse['Midpoint'].to_numpy(),
+                    fx_data_sparse['Signs'].to_numpy())
+                del fx_data_sparse
+            self_response_tau, num = hist_data_kernel_shared \
+                .hist_self_response_sparse(*sparse, tau)
+            if lags is not None:
+                self_response_tau = self_response_tau[lags - 1]
+                num = num[lags - 1]
+
+        else:
+            midpoint: np.ndarray
+            trade_signs: np.ndarray
+            if arrays:
+                midpoint, trade_signs = hist_data_store_shared \
+                    .hist_load_arrays(hist_data_store_shared
+                                      .hist_physical_path(fx_pair, year,
+                                                          week, resolution))
+            else:
+                fx_data: pd.DataFrame = hist_data_store_shared \
+                    .hist_load_physical(fx_pair, year, week, resolution)
+                midpoint = fx_data['Midpoint'].to_numpy()
+                trade_signs = fx_data['Signs'].to_numpy()
+                del fx_data
+
+            self_response_tau, num = hist_data_kernel_shared \
+                .hist_self_response_kernel(midpoint, trade_signs, __tau__,
+                                           engine, lags)
+
+        if cache:
+            hist_data_cache_shared.hist_save_partial(
+                cache_path, paths, key, (self_response_tau, num))
 
         return (self_response_tau, num)
 
@@ -103,14 +223,16 @@ def hist_fx_self_response_week_responses_physical_data(
         print('No data')
         print(error)
         print()
-        zeros = np.zeros(__tau__)
+        zeros = np.zeros(__tau__ if lags is None else len(lags))
         return (zeros, zeros)
 
 # ----------------------------------------------------------------------------
 
 
 def hist_fx_self_response_year_responses_physical_data(
-        fx_pair: str, year: str) -> Tuple[np.ndarray, ...]:
+        fx_pair: str, year: str, engine: str = 'loop',
+        arrays: bool = False, cache: bool = True, resolution: str = '1s',
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
     """Computes the self-response of a year.
 
     Using the hist_self_response_year_responses_physical_data function computes
@@ -119,6 +241,16 @@ def hist_fx_self_response_year_responses_physical_data(
     :param ticker: string of the abbreviation of stock to be analyzed
      (i.e. 'AAPL').
     :param year: string of the year to be analyzed (i.e '2016').
+    :param engine: string of the engine used to compute the sums, 'loop',
+     'direct', 'fft', 'sparse' or 'numba' (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the weeks (False).
+    :param cache: bool to reuse the cached results of the weeks whose input
+     did not change (True) or to compute all the weeks (False).
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__ (i.e. hist_lag_grid(1000, 200)).
     :return: tuple -- The function returns a tuple with numpy arrays.
     """
 
@@ -127,10 +259,15 @@ def hist_fx_self_response_year_responses_physical_data(
     hist_data_tools_responses_physical \
         .hist_function_header_print_data(function_name, fx_pair, year, '')
 
-    weeks: Tuple[str, ...] = hist_data_tools_responses_physical.hist_weeks()
+    # Weeks with data from the extraction manifest
+    weeks: Tuple[str, ...] = \
+        tuple(hist_data_store_shared.hist_load_manifest(fx_pair, year)) \
+        or hist_data_tools_responses_physical.hist_weeks()
 
     self_values: List[np.ndarray] = []
-    args_prod: Iterator[Tuple[str, ...]] = iprod([fx_pair], [year], weeks)
+    args_prod: Iterator[Tuple[str, ...]] = iprod([fx_pair], [year], weeks,
+                                                  [engine], [arrays], [cache],
+                                                  [resolution], [lags])
 
     # Parallel computation of the self-responses. Every result is appended to
     # a list
@@ -142,6 +279,37 @@ def hist_fx_self_response_year_responses_physical_data(
     # values and all the amount of trades (averaging values)
     self_v_final: np.ndarray = np.sum(self_values[0], axis=0)
 
+    return hist_fx_self_response_year_save_responses_physical_data(
+        fx_pair, year, self_v_final, resolution, lags)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_self_response_year_save_responses_physical_data(
+        fx_pair: str, year: str, self_v_final: np.ndarray,
+        resolution: str = '1s',
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
+    """Obtains and saves the self-response of a year.
+
+    The self-response is obtained from the sums of all the weeks.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param self_v_final: numpy array with the sum of the self-response values
+     and the sum of the number of trades of all the weeks.
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__. With a grid of lags the self-response is
+     saved as a pd.Series indexed by the lags, in a file with the suffix of
+     hist_lag_suffix (i.e. hist_lag_grid(1000, 200)).
+    :return: tuple -- The function returns a tuple with numpy arrays.
+    """
+
+    function_name: str = hist_fx_self_response_year_responses_physical_data \
+        .__name__
+
     self_response_val: np.ndarray = self_v_final[0] / self_v_final[1]
     self_response_avg: np.ndarray = self_v_final[1]
 
@@ -171,13 +339,444 @@ def hist_fx_self_response_year_responses_physical_data(
             print('Folder exists. The folder was not created')
 
     hist_data_tools_responses_physical \
-        .hist_save_data(self_response_val, fx_pair, year)
+        .hist_save_data(
+            self_response_val if lags is None
+            else pd.Series(self_response_val,
+                           index=pd.Index(lags, name='Tau')),
+            fx_pair, year, resolution,
+            hist_data_kernel_shared.hist_lag_suffix(lags, __tau__))
 
     return (self_response_val, self_response_avg)
 
 # -----------------------------------------------------------------------------
 
 
+def hist_fx_self_response_week_batch_responses_physical_data(
+        fx_pairs: List[str], year: str, week: str, engine: str = 'loop',
+        arrays: bool = False, cache: bool = True, resolution: str = '1s',
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
+    """Computes the self-response sums of a week for several forex pairs.
+
+    With the 'fft' engine the weeks of all the forex pairs are computed
+    together with the batch FFT engine. In physical time scale the weeks of
+    the pairs have almost always the same length, so they are transformed in
+    the same blocks. With the other engines every pair is computed with
+    hist_fx_self_response_week_responses_physical_data. The cached results
+    are the ones of the pairs, so they are shared with the computation of
+    every pair.
+
+    :param fx_pairs: list of the string abbreviation of the forex pairs to be
+     analyzed (i.e. ['eur_usd', 'gbp_usd']).
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param week: string of the week to be analyzed (i.e. '01').
+    :param engine: string of the engine used to compute the sums, 'loop',
+     'direct', 'fft', 'sparse' or 'numba' (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the week (False).
+    :param cache: bool to reuse the cached results of the week when their
+     input did not change (True) or to always compute them (False).
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__ (i.e. hist_lag_grid(1000, 200)).
+    :return: tuple -- The function returns a tuple with two arrays with a row
+     for every forex pair: the sum of the sign-weighted returns and the
+     number of trades for every lag. The pairs without data have zeros.
+    """
+
+    if engine != 'fft':
+        return tuple(np.array(values) for values in zip(*[
+            hist_fx_self_response_week_responses_physical_data(
+                fx_pair, year, week, engine, arrays, cache, resolution, lags)
+            for fx_pair in fx_pairs]))
+
+    lags_num: int = __tau__ if lags is None else len(lags)
+    self_response_tau: np.ndarray = np.zeros((len(fx_pairs), lags_num))
+    num: np.ndarray = np.zeros((len(fx_pairs), lags_num))
+
+    key: str = f'{engine}_' \
+        + hist_data_kernel_shared.hist_lag_key(lags, __tau__)
+
+    # Forex pairs computed in the batch, with their input files
+    batch: List[int] = []
+    paths: List[List[str]] = []
+    midpoints: List[np.ndarray] = []
+    trade_signs: List[np.ndarray] = []
+
+    idx: int
+    fx_pair: str
+    for idx, fx_pair in enumerate(fx_pairs):
+        try:
+            pair_paths: List[str] = \
+                hist_fx_week_paths_responses_physical_data(
+                    fx_pair, year, week, arrays, resolution, engine)
+
+            if cache:
+                partial: Optional[Tuple[np.ndarray, np.ndarray]] = \
+                    hist_data_cache_shared.hist_load_partial(
+                        _hist_fx_week_cache_path(fx_pair, year, week,
+                                                 resolution),
+                        pair_paths, key)
+                if partial is not None:
+                    self_response_tau[idx], num[idx] = partial
+                    continue
+
+            # Load data
+            midpoint: np.ndarray
+            trade_sign: np.ndarray
+            if arrays:
+                midpoint, trade_sign = hist_data_store_shared \
+                    .hist_load_arrays(hist_data_store_shared
+                                      .hist_physical_path(fx_pair, year,
+                                                          week, resolution))
+            else:
+                fx_data: pd.DataFrame = hist_data_store_shared \
+                    .hist_load_physical(fx_pair, year, week, resolution)
+                midpoint = fx_data['Midpoint'].to_numpy()
+                trade_sign = fx_data['Signs'].to_numpy()
+                del fx_data
+
+        except FileNotFoundError as error:
+            print('No data')
+            print(error)
+            print()
+            continue
+
+        batch.append(idx)
+        paths.append(pair_paths)
+        midpoints.append(midpoint)
+        trade_signs.append(trade_sign)
+
+    if not batch:
+        return (self_response_tau, num)
+
+    tau: int = __tau__ if lags is None else int(lags[-1])
+    batch_tau: np.ndarray
+    batch_num: np.ndarray
+    batch_tau, batch_num = hist_data_kernel_shared \
+        .hist_self_response_fft_batch(midpoints, trade_signs, tau)
+    if lags is not None:
+        batch_tau = batch_tau[:, lags - 1]
+        batch_num = batch_num[:, lags - 1]
+
+    row: int
+    for row, idx in enumerate(batch):
+        self_response_tau[idx] = batch_tau[row]
+        num[idx] = batch_num[row]
+
+        if cache:
+            hist_data_cache_shared.hist_save_partial(
+                _hist_fx_week_cache_path(fx_pairs[idx], year, week,
+                                         resolution),
+                paths[row], key, (self_response_tau[idx], num[idx]))
+
+    return (self_response_tau, num)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_self_response_year_batch_responses_physical_data(
+        fx_pairs: List[str], year: str, engine: str = 'loop',
+        arrays: bool = False, cache: bool = True, resolution: str = '1s',
+        lags: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Computes the self-response of a year for several forex pairs.
+
+    Every week is computed for all the forex pairs in a task. The tasks are
+    sent largest first by the size of the input files of the week, and the
+    self-responses are saved in a single file with a row for every forex
+    pair and a column for every time lag.
+
+    :param fx_pairs: list of the string abbreviation of the forex pairs to be
+     analyzed (i.e. ['eur_usd', 'gbp_usd']).
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param engine: string of the engine used to compute the sums, 'loop',
+     'direct', 'fft', 'sparse' or 'numba' (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the weeks (False).
+    :param cache: bool to reuse the cached results of the weeks whose input
+     did not change (True) or to compute all the weeks (False).
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__. With a grid of lags the file has the suffix
+     of hist_lag_suffix (i.e. hist_lag_grid(1000, 200)).
+    :return: pd.DataFrame -- The function returns a pd.DataFrame with the
+     self-response of every forex pair (rows) for every time lag (columns).
+    """
+
+    function_name: str = \
+        hist_fx_self_response_year_batch_responses_physical_data.__name__
+    hist_data_tools_responses_physical \
+        .hist_function_header_print_data(function_name, 'batch', year, '')
+
+    # Weeks with data of any of the pairs from the extraction manifests
+    weeks_set: Set[str] = set()
+    fx_pair: str
+    for fx_pair in fx_pairs:
+        weeks_set.update(hist_data_store_shared.hist_load_manifest(fx_pair,
+                                                                   year))
+    weeks: Tuple[str, ...] = tuple(sorted(weeks_set)) \
+        or hist_data_tools_responses_physical.hist_weeks()
+
+    tasks: List[Tuple[Any, ...]] = list(iprod(
+        [fx_pairs], [year], weeks, [engine], [arrays], [cache], [resolution],
+        [lags]))
+    # The tasks are sorted by the size of the input files of the week
+    sizes: List[int] = [
+        hist_data_schedule_shared.hist_task_size(
+            [path for fx_pair in fx_pairs
+             for path in hist_fx_week_paths_responses_physical_data(
+                 fx_pair, year, week, arrays, resolution, engine)])
+        for week in weeks]
+    processes: int = mp.cpu_count()
+
+    lags_num: int = __tau__ if lags is None else len(lags)
+    sums: np.ndarray = np.zeros((len(fx_pairs), lags_num))
+    num: np.ndarray = np.zeros((len(fx_pairs), lags_num))
+
+    # Parallel computation of the weeks. The results are added to the sums
+    # of the year as they arrive
+    task: Tuple[Any, ...]
+    self_value: Tuple[np.ndarray, ...]
+    with mp.Pool(processes=processes) as pool:
+        for task, self_value in hist_data_schedule_shared.hist_schedule_run(
+                pool,
+                hist_fx_self_response_week_batch_responses_physical_data,
+                tasks, sizes, processes):
+            sums += self_value[0]
+            num += self_value[1]
+
+    self_response: pd.DataFrame = pd.DataFrame(
+        sums / num, index=pd.Index(fx_pairs, name='FxPair'),
+        columns=pd.RangeIndex(1, __tau__ + 1, name='Tau') if lags is None
+        else pd.Index(lags, name='Tau'))
+
+    # Saving data
+    suffix: str = ('' if resolution == '1s' else f'_{resolution}') \
+        + hist_data_kernel_shared.hist_lag_suffix(lags, __tau__)
+    os.makedirs(f'../../hist_data/responses_physical_{year}/{function_name}/',
+                exist_ok=True)
+    pickle.dump(self_response, open(
+        f'../../hist_data/responses_physical_{year}/{function_name}/'
+        + f'{function_name}_{year}{suffix}.pickle', 'wb'))
+
+    print('Data Saved')
+    print()
+
+    return self_response
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_aligned_week_responses_physical_data(
+        fx_pairs: List[str], year: str, week: str,
+        resolution: str = '1s') -> Tuple[List[np.ndarray], ...]:
+    """Loads the weeks of several forex pairs in a common time grid.
+
+    The physical time scale data of every pair starts at the first interval
+    of the week or of its first tick, and ends at the last day of its data.
+    The weeks are cut to the intervals where all the pairs with data have
+    values.
+
+    :param fx_pairs: list of the string abbreviation of the forex pairs to be
+     analyzed (i.e. ['eur_usd', 'gbp_usd']).
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param week: string of the week to be analyzed (i.e. '01').
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :return: tuple -- The function returns a tuple with the list of the
+     midpoint prices and the list of the trade signs of every pair in the
+     common time grid. The pairs without data have empty arrays.
+    """
+
+    fx_data: List[Optional[pd.DataFrame]] = []
+
+    fx_pair: str
+    for fx_pair in fx_pairs:
+        try:
+            fx_data.append(hist_data_store_shared.hist_load_physical(
+                fx_pair, year, week, resolution))
+
+        except FileNotFoundError as error:
+            print('No data')
+            print(error)
+            print()
+            fx_data.append(None)
+
+    available: List[pd.DataFrame] = [data for data in fx_data
+                                     if data is not None and len(data)]
+    t_ini: pd.Timestamp = max((data.index[0] for data in available),
+                              default=None)
+    t_end: pd.Timestamp = min((data.index[-1] for data in available),
+                              default=None)
+
+    midpoints: List[np.ndarray] = []
+    trade_signs: List[np.ndarray] = []
+
+    data: Optional[pd.DataFrame]
+    for data in fx_data:
+        if data is None or not len(data) or t_ini > t_end:
+            midpoints.append(np.zeros(0))
+            trade_signs.append(np.zeros(0, dtype=np.int8))
+        else:
+            data = data.loc[t_ini:t_end]
+            midpoints.append(data['Midpoint'].to_numpy())
+            trade_signs.append(data['Signs'].to_numpy())
+
+    return (midpoints, trade_signs)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_cross_response_week_responses_physical_data(
+        fx_pairs: List[str], year: str, week: str, targets: List[str],
+        resolution: str = '1s') -> Tuple[np.ndarray, ...]:
+    """Computes the cross-response sums of a week for several forex pairs.
+
+    Every pair is loaded once and its trade signs are used with all the
+    target pairs.
+
+    :param fx_pairs: list of the string abbreviation of the forex pairs of
+     the trade signs (i.e. ['eur_usd', 'gbp_usd']).
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param week: string of the week to be analyzed (i.e. '01').
+    :param targets: list of the string abbreviation of the forex pairs of the
+     midpoint price returns. They must be in fx_pairs (i.e. ['gbp_usd']).
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns with the shape (fx_pairs, targets, tau), the number
+     of trades for every lag with the shape (fx_pairs, tau) and a boolean
+     array with the targets with data. The pairs without data have zeros.
+    """
+
+    midpoints: List[np.ndarray]
+    trade_signs: List[np.ndarray]
+    midpoints, trade_signs = hist_fx_aligned_week_responses_physical_data(
+        fx_pairs, year, week, resolution)
+
+    # The pairs without data are left out and keep zeros
+    loaded: List[int] = [idx for idx, midpoint in enumerate(midpoints)
+                         if len(midpoint)]
+    target_idx: List[int] = [fx_pairs.index(target) for target in targets]
+    target_cols: List[int] = [col for col, idx in enumerate(target_idx)
+                              if idx in loaded]
+
+    self_response_tau: np.ndarray = np.zeros((len(fx_pairs), len(targets),
+                                              __tau__))
+    num: np.ndarray = np.zeros((len(fx_pairs), __tau__))
+    target_data: np.ndarray = np.zeros(len(targets), dtype=bool)
+
+    if loaded and target_cols:
+        sums: np.ndarray
+        counts: np.ndarray
+        sums, counts = hist_data_kernel_shared.hist_cross_response_fft(
+            [midpoints[idx] for idx in loaded],
+            [trade_signs[idx] for idx in loaded], __tau__,
+            [loaded.index(target_idx[col]) for col in target_cols])
+        self_response_tau[np.ix_(loaded, target_cols)] = sums
+        num[loaded] = counts
+        target_data[target_cols] = True
+
+    return (self_response_tau, num, target_data)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_cross_response_year_responses_physical_data(
+        fx_pairs: List[str], year: str,
+        resolution: str = '1s') -> pd.DataFrame:
+    """Computes the cross-response of a year for all the ordered pairs.
+
+    The cross-response :math:`R_{ij}(\\tau)` relates the trade signs of the
+    pair :math:`i` with the midpoint price returns of the pair :math:`j`.
+    Every week is a task with all the target pairs :math:`j`, so every pair
+    is loaded once per week. Only when there are fewer weeks than processes
+    the target pairs are split in blocks, so all the processes are used, and
+    every pair is loaded once per week and block. The tasks are sent largest
+    first by the size of the physical data of the week, and the results are
+    added to the sums of the year as they arrive.
+
+    :param fx_pairs: list of the string abbreviation of the forex pairs to be
+     analyzed (i.e. ['eur_usd', 'gbp_usd']).
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :return: pd.DataFrame -- The function returns a pd.DataFrame with the
+     cross-response of every ordered pair (rows indexed by the pair of the
+     trade signs and the pair of the returns) for every time lag (columns).
+    """
+
+    function_name: str = \
+        hist_fx_cross_response_year_responses_physical_data.__name__
+    hist_data_tools_responses_physical \
+        .hist_function_header_print_data(function_name, 'cross', year, '')
+
+    # Weeks with data of any of the pairs from the extraction manifests
+    weeks_set: Set[str] = set()
+    fx_pair: str
+    for fx_pair in fx_pairs:
+        weeks_set.update(hist_data_store_shared.hist_load_manifest(fx_pair,
+                                                                   year))
+    weeks: Tuple[str, ...] = tuple(sorted(weeks_set)) \
+        or hist_data_tools_responses_physical.hist_weeks()
+
+    processes: int = mp.cpu_count()
+    blocks_num: int = min(len(fx_pairs),
+                          max(1, int(np.ceil(processes / len(weeks)))))
+    blocks: List[List[str]] = [fx_pairs[block::blocks_num]
+                               for block in range(blocks_num)]
+
+    tasks: List[Tuple[Any, ...]] = list(iprod(
+        [fx_pairs], [year], weeks, blocks, [resolution]))
+    # The tasks are sorted by the size of the physical data of the week
+    week_sizes: Dict[str, int] = {
+        week: hist_data_schedule_shared.hist_task_size(
+            [hist_data_store_shared.hist_physical_path(fx_pair, year, week,
+                                                       resolution)
+             for fx_pair in fx_pairs])
+        for week in weeks}
+
+    sums: np.ndarray = np.zeros((len(fx_pairs), len(fx_pairs), __tau__))
+    num: np.ndarray = np.zeros((len(fx_pairs), len(fx_pairs), __tau__))
+
+    # Parallel computation of the weeks and blocks of target pairs
+    task: Tuple[Any, ...]
+    cross_value: Tuple[np.ndarray, ...]
+    with mp.Pool(processes=processes) as pool:
+        for task, cross_value in hist_data_schedule_shared.hist_schedule_run(
+                pool, hist_fx_cross_response_week_responses_physical_data,
+                tasks, [week_sizes[task[2]] for task in tasks], processes):
+            cols: List[int] = [fx_pairs.index(target) for target in task[3]]
+            sums[:, cols] += cross_value[0]
+            # The trades of a week count for the targets with data
+            data_cols: List[int] = [col for col, data
+                                    in zip(cols, cross_value[2]) if data]
+            num[:, data_cols] += cross_value[1][:, np.newaxis]
+            del cross_value
+
+    cross_response: pd.DataFrame = pd.DataFrame(
+        (sums / num).reshape(-1, __tau__),
+        index=pd.MultiIndex.from_product([fx_pairs, fx_pairs],
+                                         names=['Signs', 'Returns']),
+        columns=pd.RangeIndex(1, __tau__ + 1, name='Tau'))
+
+    # Saving data
+    suffix: str = '' if resolution == '1s' else f'_{resolution}'
+    os.makedirs(f'../../hist_data/responses_physical_{year}/{function_name}/',
+                exist_ok=True)
+    pickle.dump(cross_response, open(
+        f'../../hist_data/responses_physical_{year}/{function_name}/'
+        + f'{function_name}_{year}{suffix}.pickle', 'wb'))
+
+    print('Data Saved')
+    print()
+
+    return cross_response
+
+# -----------------------------------------------------------------------------
+
+
 def main() -> None:
     """The main function of the script.
 
@@ -6,10 +6,14 @@ from HIST Capital in a year.
 This script requires the following modules:
     * itertools
     * multiprocessing
+    * sys
     * typing
+    * numpy
     * hist_data_analysis_responses_physical
     * hist_data_plot_responses_physical
     * hist_data_tools_responses_physical
+    * hist_data_schedule_shared
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_data_plot_generator - generates all the analysis and plots from the
@@ -24,41 +28,120 @@ The module contains the following functions:
 
 from itertools import product as iprod
 import multiprocessing as mp
-from typing import List
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
 
 import hist_data_analysis_responses_physical
 import hist_data_plot_responses_physical
 import hist_data_tools_responses_physical
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_schedule_shared
+import hist_data_store_shared
+
 # -----------------------------------------------------------------------------
 
 
-def hist_data_plot_generator(fx_pairs: List[str], years: List[str]) -> None:
+def hist_data_plot_generator(fx_pairs: List[str], years: List[str],
+                             engine: str = 'loop',
+                             arrays: bool = False,
+                             cache: bool = True,
+                             resolution: str = '1s',
+                             batch: bool = False,
+                             lags: Optional[np.ndarray] = None) -> None:
     """Generates all the analysis and plots from the HIST data.
 
     :param fx_pairs: list of the string abbreviation of the forex pairs to be
      analyzed (i.e. ['eur_usd', 'gbp_usd']).
     :param years: list of the string of the year to be analyzed
      (i.e. ['2016', '2017']).
+    :param engine: string of the engine used to compute the self-responses,
+     'loop', 'direct', 'fft', 'sparse' or 'numba' (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the weeks (False).
+    :param cache: bool to reuse the cached results of the weeks whose input
+     did not change (True) or to compute all the weeks (False).
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param batch: bool to compute every week for all the pairs in a task and
+     save a single file for every year (True) or to compute and save every
+     pair (False). With the 'fft' engine the batch uses the batch FFT
+     engine. With the batch the pairs are not plotted.
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to 10000 (i.e. hist_lag_grid(1000, 200)).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
 
-    # Specific functions
-    fx_pair: str
-    for fx_pair in fx_pairs:
+    if batch:
+        year: str
         for year in years:
-            # Self-response
             hist_data_analysis_responses_physical \
-                .hist_fx_self_response_year_responses_physical_data(fx_pair,
-                                                                    year)
+                .hist_fx_self_response_year_batch_responses_physical_data(
+                    fx_pairs, year, engine, arrays, cache, resolution, lags)
+
+        return
+
+    # Weeks with data of every pair and year from the extraction manifests.
+    # Without data all the weeks are used, so the year is saved as before
+    manifests: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {
+        (fx_pair, year): hist_data_store_shared.hist_load_manifest(fx_pair,
+                                                                   year)
+        for fx_pair, year in iprod(fx_pairs, years)}
+    weeks: Dict[Tuple[str, str], Tuple[str, ...]] = {
+        fx_year: tuple(manifest)
+        or hist_data_tools_responses_physical.hist_weeks()
+        for fx_year, manifest in manifests.items()}
+
+    tasks: List[Tuple[Any, ...]] = [
+        (*fx_year, week, engine, arrays, cache, resolution, lags)
+        for fx_year in weeks for week in weeks[fx_year]]
+    # The tasks are sorted by the size of their input files
+    sizes: List[int] = [
+        hist_data_schedule_shared.hist_task_size(
+            hist_data_analysis_responses_physical
+            .hist_fx_week_paths_responses_physical_data(*task[:3], arrays,
+                                                        resolution, engine))
+        for task in tasks]
+    processes: int = mp.cpu_count()
+
+    # Sum of the results and number of weeks received for every pair and year
+    self_values: Dict[Tuple[str, str], np.ndarray] = {}
+    weeks_done: Dict[Tuple[str, str], int] = {}
+
+    # Parallel computing. A single pool computes the weeks of all the pairs
+    # and years, largest first, and every year is saved when its last week is
+    # received
+    with mp.Pool(processes=processes) as pool:
+        # Self-response
+        task: Tuple[Any, ...]
+        result: Tuple[np.ndarray, ...]
+        for task, result in hist_data_schedule_shared.hist_schedule_run(
+                pool, hist_data_analysis_responses_physical
+                .hist_fx_self_response_week_responses_physical_data,
+                tasks, sizes, processes):
+
+            fx_year: Tuple[str, str] = (task[0], task[1])
+            self_values[fx_year] = self_values.get(fx_year, 0) \
+                + np.array(result)
+            weeks_done[fx_year] = weeks_done.get(fx_year, 0) + 1
+
+            if weeks_done[fx_year] == len(weeks[fx_year]):
+                hist_data_tools_responses_physical \
+                    .hist_function_header_print_data(
+                        'hist_fx_self_response_year_responses_physical_data',
+                        fx_year[0], fx_year[1], '')
+                hist_data_analysis_responses_physical \
+                    .hist_fx_self_response_year_save_responses_physical_data(
+                        fx_year[0], fx_year[1], self_values.pop(fx_year),
+                        resolution, lags)
 
-    # Parallel computing
-    with mp.Pool(processes=mp.cpu_count()) as pool:
         # Plot
         pool.starmap(hist_data_plot_responses_physical
                      .hist_fx_self_response_year_avg_responses_physical_plot,
-                     iprod(fx_pairs, years))
+                     iprod(fx_pairs, years, [resolution], [lags]))
 
 # -----------------------------------------------------------------------------
 
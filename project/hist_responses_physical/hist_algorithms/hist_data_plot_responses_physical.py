@@ -6,9 +6,11 @@ hist_data_analysis_responses_physical module.
 This script requires the following modules:
     * gc
     * pickle
+    * sys
     * typing
     * matplotlib
     * hist_data_tools_data_extract
+    * hist_data_kernel_shared
 
 The module contains the following functions:
     * hist_fx_self_response_year_avg_responses_physical_plot - plots the
@@ -23,24 +25,35 @@ The module contains the following functions:
 
 import gc
 import pickle
+import sys
+from typing import Optional
 
 from matplotlib import pyplot as plt  # type: ignore
 import numpy as np  # type: ignore
 
 import hist_data_tools_responses_physical
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_kernel_shared
+
 __tau__ = 10000
 
 # ----------------------------------------------------------------------------
 
 
 def hist_fx_self_response_year_avg_responses_physical_plot(
-        fx_pair: str, year: str) -> None:
+        fx_pair: str, year: str, resolution: str = '1s',
+        lags: Optional[np.ndarray] = None) -> None:
     """Plots the self-response average for a year.
 
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e. '2016').
+    :param resolution: string of the time resolution of the physical data
+     (i.e. '1min').
+    :param lags: numpy array with the increasing time lags of the
+     self-response, or None for all the lags from 1 to __tau__
+     (i.e. hist_lag_grid(1000, 200)).
     :return: None -- The function saves the plot in a file and does not return
      a value.
     """
@@ -52,6 +65,8 @@ def hist_fx_self_response_year_avg_responses_physical_plot(
             .hist_function_header_print_plot(function_name, fx_pair, year, '')
 
         fx_pair_upper: str = fx_pair[:3].upper() + '/' + fx_pair[4:].upper()
+        suffix: str = ('' if resolution == '1s' else f'_{resolution}') \
+            + hist_data_kernel_shared.hist_lag_suffix(lags, __tau__)
 
         figure: plt.Figure = plt.figure(figsize=(16, 9))
 
@@ -60,9 +75,13 @@ def hist_fx_self_response_year_avg_responses_physical_plot(
                         f'../../hist_data/responses_physical_{year}/hist_fx'
                         + f'_self_response_year_responses_physical_data/'
                         + f'{fx_pair}/hist_fx_self_response_year_responses'
-                        + f'_physical_data_{fx_pair}_{year}.pickle', 'rb'))
+                        + f'_physical_data_{fx_pair}_{year}{suffix}.pickle',
+                        'rb'))
 
-        plt.semilogx(self_response, linewidth=5, label=f'{fx_pair_upper}')
+        tau_values: np.ndarray = np.arange(1, __tau__ + 1) if lags is None \
+            else lags
+        plt.semilogx(tau_values, self_response, linewidth=5,
+                     label=f'{fx_pair_upper}')
         plt.legend(loc='best', fontsize=25)
         plt.title(f'HIST data self-response', fontsize=40)
         plt.xlabel(r'$\tau \, [trades]$', fontsize=35)
@@ -76,7 +95,7 @@ def hist_fx_self_response_year_avg_responses_physical_plot(
 
         # Plotting
         hist_data_tools_responses_physical \
-            .hist_save_plot(function_name, figure, fx_pair, year, '')
+            .hist_save_plot(function_name, figure, fx_pair, year, suffix)
 
         plt.close()
         del self_response
@@ -35,7 +35,8 @@ from matplotlib import pyplot as plt  # type: ignore
 # -----------------------------------------------------------------------------
 
 
-def hist_save_data(data: Any, fx_pair: str, year: str) -> None:
+def hist_save_data(data: Any, fx_pair: str, year: str,
+                   resolution: str = '1s', lags_suffix: str = '') -> None:
     """Saves computed data in pickle files.
 
     Saves the data generated in the functions of the
@@ -45,10 +46,17 @@ def hist_save_data(data: Any, fx_pair: str, year: str) -> None:
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e '2016').
+    :param resolution: string of the time resolution of the data. The files
+     of the resolutions other than '1s' have it in their name (i.e. '1min').
+    :param lags_suffix: string added to the name of the file, empty for the
+     self-response of all the lags (i.e. the result of hist_lag_suffix).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
 
+    suffix: str = ('' if resolution == '1s' else f'_{resolution}') \
+        + lags_suffix
+
     # Saving data
 
     if (not os.path.isdir(
@@ -67,8 +75,8 @@ def hist_save_data(data: Any, fx_pair: str, year: str) -> None:
     pickle.dump(data, open(
         f'../../hist_data/responses_physical_{year}/hist_fx_self_response_year'
                 + f'_responses_physical_data/{fx_pair}/hist_fx_self_response'
-                + f'_year_responses_physical_data_{fx_pair}_{year}.pickle',
-                'wb'))
+                + f'_year_responses_physical_data_{fx_pair}_{year}{suffix}'
+                + '.pickle', 'wb'))
 
     print('Data Saved')
     print()
@@ -7,16 +7,24 @@ This script requires the following modules:
     * itertools
     * multiprocessing
     * os
-    * pickle
+    * sys
     * typing
     * numpy
     * pandas
+    * hist_data_tools_responses_trade
+    * hist_data_cache_shared
+    * hist_data_kernel_shared
+    * hist_data_store_shared
 
 The module contains the following functions:
+    * hist_fx_week_paths_responses_trade_data - returns the input files
+      of a week.
     * hist_fx_self_response_week_responses_trade - extracts the midpoint price
       for a week.
     * hist_fx_self_response_year_responses_trade - extracts the midpoint price
       for a year.
+    * hist_fx_self_response_year_save_responses_trade_data - obtains and
+      saves the self-response of a year from the sums of its weeks.
     * main - the main function of the script.
 
 ..moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
@@ -27,75 +35,116 @@ The module contains the following functions:
 from itertools import product as iprod
 import multiprocessing as mp
 import os
-import pickle
-from typing import Iterator, List, Tuple
+import sys
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 
 import hist_data_tools_responses_trade
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_cache_shared
+import hist_data_kernel_shared
+import hist_data_store_shared
+
 __tau__ = 10000
 
 # -----------------------------------------------------------------------------
 
 
-def hist_fx_self_response_week_responses_trade_data(
-        fx_pair: str, year: str, week: str) -> Tuple[np.ndarray, ...]:
-    """Computes the self-response of a year.
-
-    Using the midpoint price and the trade signs of a ticker computes the
-    self-response during different time lags (:math:`\\tau`) for a year.
+def hist_fx_week_paths_responses_trade_data(
+        fx_pair: str, year: str, week: str,
+        arrays: bool = False) -> List[str]:
+    """Returns the input files of the self-response of a week.
 
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e. '2016').
     :param week: string of the week to be analyzed (i.e. '01').
-    :return: tuple -- The function returns a tuple with numpy arrays.
+    :param arrays: bool to use the midpoint price and trade signs arrays
+     (True) or the data of the week (False).
+    :return: list -- The function returns the list of the paths of the files.
     """
 
-    try:
-        # Load data
-        fx_data: pd.DataFrame = pickle.load(open(
-                        f'../../hist_data/extraction_data_{year}/hist_fx_data'
-                        + f'_extraction_week/{fx_pair}/hist_fx_data_extraction'
-                        + f'_week_{fx_pair}_w{week}.pickle', 'rb'))
+    path: str = hist_data_store_shared.hist_week_path(fx_pair, year, week)
+
+    if arrays:
+        return [hist_data_store_shared.hist_arrays_path(path, column)
+                for column in ('Midpoint', 'Signs')]
 
-        midpoint: np.ndarray = fx_data['Midpoint'].to_numpy()
-        trade_signs: np.ndarray = fx_data['Signs'].to_numpy()
+    return [path]
 
-        # Relate the return of the previous second with the current trade sign
-        midpoint = midpoint[:-1]
-        trade_signs = trade_signs[1:]
+# -----------------------------------------------------------------------------
 
-        assert len(midpoint) == len(trade_signs)
 
-        # Array of the average of each tau
-        self_response_tau: np.ndarray = np.zeros(__tau__)
-        num: np.ndarray = np.zeros(__tau__)
+def hist_fx_self_response_week_responses_trade_data(
+        fx_pair: str, year: str, week: str, engine: str = 'loop',
+        arrays: bool = False, cache: bool = True,
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
+    """Computes the self-response of a year.
 
-        # Calculating the midpoint price return and the self-response function
-        # Depending on the tau value
-        tau_idx: int
-        for tau_idx in range(__tau__):
+    Using the midpoint price and the trade signs of a ticker computes the
+    self-response during different time lags (:math:`\\tau`) for a year.
 
-            trade_sign_tau: np.ndarray = trade_signs[:-tau_idx - 1]
-            trade_sign_no_0_len: int = len(trade_sign_tau[trade_sign_tau != 0])
-            num[tau_idx] = trade_sign_no_0_len
-            # Obtain the midpoint price return. Displace the numerator tau
-            # values to the right and compute the return
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e. '2016').
+    :param week: string of the week to be analyzed (i.e. '01').
+    :param engine: string of the engine used to compute the sums, 'loop',
+     'direct', 'fft' or 'numba' (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the week (False).
+    :param cache: bool to reuse the cached result of the week when its input
+     did not change (True) or to always compute it (False).
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__ (i.e. hist_lag_grid(1000, 200)).
+    :return: tuple -- The function returns a tuple with numpy arrays.
+    """
 
-            # Midpoint price returns
-            log_return_sec: np.ndarray = (midpoint[tau_idx + 1:]
-                                          - midpoint[:-tau_idx - 1]) \
-                / midpoint[:-tau_idx - 1]
+    function_name: str = hist_fx_self_response_week_responses_trade_data \
+        .__name__
 
-            # Obtain the self response value
-            if trade_sign_no_0_len != 0:
-                product: np.ndarray = log_return_sec * trade_sign_tau
-                self_response_tau[tau_idx] = np.sum(product)
+    # Input files of the week and cached result
+    paths: List[str] = hist_fx_week_paths_responses_trade_data(
+        fx_pair, year, week, arrays)
+    cache_path: str = (f'../../hist_data/responses_trade_{year}/'
+                       + f'{function_name}/{fx_pair}/{function_name}'
+                       + f'_{fx_pair}_w{week}.npz')
+    key: str = f'{engine}_' \
+        + hist_data_kernel_shared.hist_lag_key(lags, __tau__)
 
-        del fx_data
+    try:
+        if cache:
+            partial: Optional[Tuple[np.ndarray, np.ndarray]] = \
+                hist_data_cache_shared.hist_load_partial(cache_path, paths,
+                                                         key)
+            if partial is not None:
+                return partial
+
+        midpoint: np.ndarray
+        trade_signs: np.ndarray
+        # Load data
+        if arrays:
+            midpoint, trade_signs = hist_data_store_shared.hist_load_arrays(
+                hist_data_store_shared.hist_week_path(fx_pair, year,
+                                                      week))
+        else:
+            fx_data: pd.DataFrame = hist_data_store_shared.hist_load_week(
+                fx_pair, year, week, columns=['Midpoint', 'Signs'])
+            midpoint = fx_data['Midpoint'].to_numpy()
+            trade_signs = fx_data['Signs'].to_numpy()
+            del fx_data
+
+        self_response_tau: np.ndarray
+        num: np.ndarray
+        self_response_tau, num = hist_data_kernel_shared \
+            .hist_self_response_kernel(midpoint, trade_signs, __tau__,
+                                       engine, lags)
+
+        if cache:
+            hist_data_cache_shared.hist_save_partial(
+                cache_path, paths, key, (self_response_tau, num))
 
         return (self_response_tau, num)
 
@@ -103,14 +152,16 @@ def hist_fx_self_response_week_responses_trade_data(
         print('No data')
         print(error)
         print()
-        zeros = np.zeros(__tau__)
+        zeros = np.zeros(__tau__ if lags is None else len(lags))
         return (zeros, zeros)
 
 # ----------------------------------------------------------------------------
 
 
 def hist_fx_self_response_year_responses_trade_data(
-        fx_pair: str, year: str) -> Tuple[np.ndarray, ...]:
+        fx_pair: str, year: str, engine: str = 'loop',
+        arrays: bool = False, cache: bool = True,
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
     """Computes the self-response of a year.
 
     Using the hist_self_response_year_responses_trade_data function computes
@@ -119,6 +170,14 @@ def hist_fx_self_response_year_responses_trade_data(
     :param ticker: string of the abbreviation of stock to be analyzed
      (i.e. 'AAPL').
     :param year: string of the year to be analyzed (i.e '2016').
+    :param engine: string of the engine used to compute the sums, 'loop',
+     'direct', 'fft' or 'numba' (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the weeks (False).
+    :param cache: bool to reuse the cached results of the weeks whose input
+     did not change (True) or to compute all the weeks (False).
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__ (i.e. hist_lag_grid(1000, 200)).
     :return: tuple -- The function returns a tuple with numpy arrays.
     """
 
@@ -127,10 +186,15 @@ def hist_fx_self_response_year_responses_trade_data(
     hist_data_tools_responses_trade \
         .hist_function_header_print_data(function_name, fx_pair, year, '')
 
-    weeks: Tuple[str, ...] = hist_data_tools_responses_trade.hist_weeks()
+    # Weeks with data from the extraction manifest
+    weeks: Tuple[str, ...] = \
+        tuple(hist_data_store_shared.hist_load_manifest(fx_pair, year)) \
+        or hist_data_tools_responses_trade.hist_weeks()
 
     self_values: List[np.ndarray] = []
-    args_prod: Iterator[Tuple[str, ...]] = iprod([fx_pair], [year], weeks)
+    args_prod: Iterator[Tuple[str, ...]] = iprod([fx_pair], [year], weeks,
+                                                  [engine], [arrays], [cache],
+                                                  [lags])
 
     # Parallel computation of the self-responses. Every result is appended to
     # a list
@@ -142,6 +206,34 @@ def hist_fx_self_response_year_responses_trade_data(
     # values and all the amount of trades (averaging values)
     self_v_final: np.ndarray = np.sum(self_values[0], axis=0)
 
+    return hist_fx_self_response_year_save_responses_trade_data(
+        fx_pair, year, self_v_final, lags)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_fx_self_response_year_save_responses_trade_data(
+        fx_pair: str, year: str, self_v_final: np.ndarray,
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, ...]:
+    """Obtains and saves the self-response of a year.
+
+    The self-response is obtained from the sums of all the weeks.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param self_v_final: numpy array with the sum of the self-response values
+     and the sum of the number of trades of all the weeks.
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to __tau__. With a grid of lags the self-response is
+     saved as a pd.Series indexed by the lags, in a file with the suffix of
+     hist_lag_suffix (i.e. hist_lag_grid(1000, 200)).
+    :return: tuple -- The function returns a tuple with numpy arrays.
+    """
+
+    function_name: str = hist_fx_self_response_year_responses_trade_data \
+        .__name__
+
     self_response_val: np.ndarray = self_v_final[0] / self_v_final[1]
     self_response_avg: np.ndarray = self_v_final[1]
 
@@ -170,8 +262,10 @@ def hist_fx_self_response_year_responses_trade_data(
         except FileExistsError:
             print('Folder exists. The folder was not created')
 
-    hist_data_tools_responses_trade \
-        .hist_save_data(self_response_val, fx_pair, year)
+    hist_data_tools_responses_trade.hist_save_data(
+        self_response_val if lags is None
+        else pd.Series(self_response_val, index=pd.Index(lags, name='Tau')),
+        fx_pair, year, hist_data_kernel_shared.hist_lag_suffix(lags, __tau__))
 
     return (self_response_val, self_response_avg)
 
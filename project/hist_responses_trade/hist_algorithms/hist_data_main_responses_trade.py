@@ -6,10 +6,14 @@ from HIST Capital in a year.
 This script requires the following modules:
     * itertools
     * multiprocessing
+    * sys
     * typing
+    * numpy
     * hist_data_analysis_responses_trade
     * hist_data_plot_responses_trade
     * hist_data_tools_responses_trade
+    * hist_data_schedule_shared
+    * hist_data_store_shared
 
 The module contains the following functions:
     * hist_data_plot_generator - generates all the analysis and plots from the
@@ -24,41 +28,99 @@ The module contains the following functions:
 
 from itertools import product as iprod
 import multiprocessing as mp
-from typing import List
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
 
 import hist_data_analysis_responses_trade
 import hist_data_plot_responses_trade
 import hist_data_tools_responses_trade
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_schedule_shared
+import hist_data_store_shared
+
 # -----------------------------------------------------------------------------
 
 
-def hist_data_plot_generator(fx_pairs: List[str], years: List[str]) -> None:
+def hist_data_plot_generator(fx_pairs: List[str], years: List[str],
+                             engine: str = 'loop',
+                             arrays: bool = False,
+                             cache: bool = True,
+                             lags: Optional[np.ndarray] = None) -> None:
     """Generates all the analysis and plots from the HIST data.
 
     :param fx_pairs: list of the string abbreviation of the forex pairs to be
      analyzed (i.e. ['eur_usd', 'gbp_usd']).
     :param years: list of the string of the year to be analyzed
      (i.e. ['2016', '2017']).
+    :param engine: string of the engine used to compute the self-responses,
+     'loop', 'direct', 'fft' or 'numba' (i.e. 'fft').
+    :param arrays: bool to load the memory-mapped midpoint price and trade
+     signs arrays (True) or the data of the weeks (False).
+    :param cache: bool to reuse the cached results of the weeks whose input
+     did not change (True) or to compute all the weeks (False).
+    :param lags: numpy array with the increasing time lags, or None for all
+     the lags from 1 to 10000 (i.e. hist_lag_grid(1000, 200)).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
 
-    # Specific functions
-    fx_pair: str
-    year: str
-    for fx_pair in fx_pairs:
-        for year in years:
-            # Self-response
-            hist_data_analysis_responses_trade \
-                .hist_fx_self_response_year_responses_trade_data(fx_pair, year)
-
-    # Parallel computing
-    with mp.Pool(processes=mp.cpu_count()) as pool:
+    # Weeks with data of every pair and year from the extraction manifests.
+    # Without data all the weeks are used, so the year is saved as before
+    manifests: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {
+        (fx_pair, year): hist_data_store_shared.hist_load_manifest(fx_pair,
+                                                                   year)
+        for fx_pair, year in iprod(fx_pairs, years)}
+    weeks: Dict[Tuple[str, str], Tuple[str, ...]] = {
+        fx_year: tuple(manifest)
+        or hist_data_tools_responses_trade.hist_weeks()
+        for fx_year, manifest in manifests.items()}
+
+    tasks: List[Tuple[Any, ...]] = [
+        (*fx_year, week, engine, arrays, cache, lags)
+        for fx_year in weeks for week in weeks[fx_year]]
+    # The tasks are sorted by the number of ticks of the week
+    sizes: List[int] = [manifests[task[:2]].get(task[2], {'ticks': 0})['ticks']
+                        for task in tasks]
+    processes: int = mp.cpu_count()
+
+    # Sum of the results and number of weeks received for every pair and year
+    self_values: Dict[Tuple[str, str], np.ndarray] = {}
+    weeks_done: Dict[Tuple[str, str], int] = {}
+
+    # Parallel computing. A single pool computes the weeks of all the pairs
+    # and years, largest first, and every year is saved when its last week is
+    # received
+    with mp.Pool(processes=processes) as pool:
+        # Self-response
+        task: Tuple[Any, ...]
+        result: Tuple[np.ndarray, ...]
+        for task, result in hist_data_schedule_shared.hist_schedule_run(
+                pool, hist_data_analysis_responses_trade
+                .hist_fx_self_response_week_responses_trade_data,
+                tasks, sizes, processes):
+
+            fx_year: Tuple[str, str] = (task[0], task[1])
+            self_values[fx_year] = self_values.get(fx_year, 0) \
+                + np.array(result)
+            weeks_done[fx_year] = weeks_done.get(fx_year, 0) + 1
+
+            if weeks_done[fx_year] == len(weeks[fx_year]):
+                hist_data_tools_responses_trade \
+                    .hist_function_header_print_data(
+                        'hist_fx_self_response_year_responses_trade_data',
+                        fx_year[0], fx_year[1], '')
+                hist_data_analysis_responses_trade \
+                    .hist_fx_self_response_year_save_responses_trade_data(
+                        fx_year[0], fx_year[1], self_values.pop(fx_year),
+                        lags)
+
         # Plot
         pool.starmap(hist_data_plot_responses_trade
                      .hist_fx_self_response_year_avg_responses_trade_plot,
-                     iprod(fx_pairs, years))
+                     iprod(fx_pairs, years, [lags]))
 
 # -----------------------------------------------------------------------------
 
@@ -6,8 +6,11 @@ hist_data_analysis_responses_trade module.
 This script requires the following modules:
     * gc
     * pickle
+    * sys
+    * typing
     * matplotlib
     * hist_data_tools_data_extract
+    * hist_data_kernel_shared
 
 The module contains the following functions:
     * hist_fx_self_response_year_avg_responses_trade_plot - plots the
@@ -22,24 +25,33 @@ The module contains the following functions:
 
 import gc
 import pickle
+import sys
+from typing import Optional
 
 from matplotlib import pyplot as plt  # type: ignore
 import numpy as np  # type: ignore
 
 import hist_data_tools_responses_trade
 
+sys.path.insert(0, '../../hist_shared/hist_algorithms/')
+import hist_data_kernel_shared
+
 __tau__ = 10000
 
 # ----------------------------------------------------------------------------
 
 
 def hist_fx_self_response_year_avg_responses_trade_plot(
-        fx_pair: str, year: str) -> None:
+        fx_pair: str, year: str,
+        lags: Optional[np.ndarray] = None) -> None:
     """Plots the self-response average for a year.
 
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e. '2016').
+    :param lags: numpy array with the increasing time lags of the
+     self-response, or None for all the lags from 1 to __tau__
+     (i.e. hist_lag_grid(1000, 200)).
     :return: None -- The function saves the plot in a file and does not return
      a value.
     """
@@ -51,6 +63,7 @@ def hist_fx_self_response_year_avg_responses_trade_plot(
             .hist_function_header_print_plot(function_name, fx_pair, year, '')
 
         fx_pair_upper: str = fx_pair[:3].upper() + '/' + fx_pair[4:].upper()
+        suffix: str = hist_data_kernel_shared.hist_lag_suffix(lags, __tau__)
 
         figure: plt.Figure = plt.figure(figsize=(16, 9))
 
@@ -59,9 +72,12 @@ def hist_fx_self_response_year_avg_responses_trade_plot(
             open(f'../../hist_data/responses_trade_{year}/hist_fx_self'
                  + f'_response_year_responses_trade_data/{fx_pair}/hist_fx'
                  + f'_self_response_year_responses_trade_data_{fx_pair}_{year}'
-                 + f'.pickle', 'rb'))
+                 + f'{suffix}.pickle', 'rb'))
 
-        plt.semilogx(self_response, linewidth=5, label=f'{fx_pair_upper}')
+        tau_values: np.ndarray = np.arange(1, __tau__ + 1) if lags is None \
+            else lags
+        plt.semilogx(tau_values, self_response, linewidth=5,
+                     label=f'{fx_pair_upper}')
         plt.legend(loc='best', fontsize=25)
         plt.title(f'HIST data self-response', fontsize=40)
         plt.xlabel(r'$\tau \, [trades]$', fontsize=35)
@@ -75,7 +91,7 @@ def hist_fx_self_response_year_avg_responses_trade_plot(
 
         # Plotting
         hist_data_tools_responses_trade \
-            .hist_save_plot(function_name, figure, fx_pair, year, '')
+            .hist_save_plot(function_name, figure, fx_pair, year, suffix)
 
         plt.close()
         del self_response
@@ -35,7 +35,8 @@ from matplotlib import pyplot as plt  # type: ignore
 # -----------------------------------------------------------------------------
 
 
-def hist_save_data(data: Any, fx_pair: str, year: str) -> None:
+def hist_save_data(data: Any, fx_pair: str, year: str,
+                   suffix: str = '') -> None:
     """Saves computed data in pickle files.
 
     Saves the data generated in the functions of the
@@ -45,6 +46,8 @@ def hist_save_data(data: Any, fx_pair: str, year: str) -> None:
     :param fx_pair: string of the abbreviation of the forex pair to be analyzed
      (i.e. 'eur_usd').
     :param year: string of the year to be analyzed (i.e '2016').
+    :param suffix: string added to the name of the file, empty for the
+     self-response of all the lags (i.e. the result of hist_lag_suffix).
     :return: None -- The function saves the data in a file and does not return
      a value.
     """
@@ -68,7 +71,7 @@ def hist_save_data(data: Any, fx_pair: str, year: str) -> None:
                 open(f'../../hist_data/responses_trade_{year}'
                      + f'/hist_fx_self_response_year_responses_trade_data/'
                      + f'{fx_pair}/hist_fx_self_response_year_responses_trade'
-                     + f'_data_{fx_pair}_{year}.pickle', 'wb'))
+                     + f'_data_{fx_pair}_{year}{suffix}.pickle', 'wb'))
 
     print('Data Saved')
     print()
@@ -0,0 +1,178 @@
+'''HIST data cache module.
+
+The functions in the module save and load the partial results of a week (i.e.
+the sums and the number of trades of the self-response) on disk, so a year
+can be aggregated again without computing the weeks that did not change.
+
+Every partial result is saved with the key of the computation (i.e. the
+engine and the maximum time lag) and with the size, the modification time and
+the content hash of the input files of the week. A partial result is reused
+when the key is the same and the input files have the same size and
+modification time, or the same content hash.
+
+The key is saved with __version__, which must be increased when a change of
+the code changes the partial results (i.e. a fix in an engine or in the
+loading of the weeks), so the results cached before are computed again.
+
+This script requires the following modules:
+    * hashlib
+    * os
+    * typing
+    * numpy
+
+The module contains the following functions:
+    * hist_file_stamp - returns the size and modification time of files.
+    * hist_file_hash - returns the content hash of files.
+    * hist_load_partial - loads the cached partial result of a week.
+    * hist_save_partial - saves the partial result of a week.
+    * main - the main function of the script.
+
+.. moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
+'''
+
+# -----------------------------------------------------------------------------
+# Modules
+
+import hashlib
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+__block__ = 2 ** 20
+# Version of the computation of the partial results
+__version__ = 2
+
+# -----------------------------------------------------------------------------
+
+
+def hist_file_stamp(paths: List[str]) -> np.ndarray:
+    """Returns the size and modification time of the input files of a week.
+
+    :param paths: list of the strings of the paths of the input files.
+    :return: np.ndarray -- The function returns an int64 array with the size
+     and the modification time in nanoseconds of every file.
+    :raises FileNotFoundError: if one of the files does not exist.
+    """
+
+    stamp: List[int] = []
+
+    path: str
+    for path in paths:
+        stat: os.stat_result = os.stat(path)
+        stamp += [stat.st_size, stat.st_mtime_ns]
+
+    return np.array(stamp, dtype=np.int64)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_file_hash(paths: List[str]) -> str:
+    """Returns the content hash of the input files of a week.
+
+    :param paths: list of the strings of the paths of the input files.
+    :return: str -- The function returns the hexadecimal BLAKE2 digest of the
+     content of the files.
+    :raises FileNotFoundError: if one of the files does not exist.
+    """
+
+    digest = hashlib.blake2b(digest_size=20)
+
+    path: str
+    for path in paths:
+        with open(path, 'rb') as file:
+            block: bytes = file.read(__block__)
+            while block:
+                digest.update(block)
+                block = file.read(__block__)
+
+    return digest.hexdigest()
+
+# -----------------------------------------------------------------------------
+
+
+def hist_load_partial(path: str, paths: List[str],
+                      key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Loads the cached partial result of a week.
+
+    The content hash of the input files is only computed when their size or
+    modification time changed. If the content is the same, the new stamp is
+    saved with the partial result.
+
+    :param path: string of the path of the cached partial result.
+    :param paths: list of the strings of the paths of the input files.
+    :param key: string of the key of the computation (i.e. 'direct_10000').
+    :return: tuple -- The function returns a tuple with the cached sums and
+     number of trades, or None if there is no valid cached result.
+    :raises FileNotFoundError: if one of the input files does not exist.
+    """
+
+    stamp: np.ndarray = hist_file_stamp(paths)
+
+    if not os.path.isfile(path):
+        return None
+
+    with np.load(path) as cached:
+        if str(cached['key']) != f'{key}_v{__version__}':
+            return None
+
+        partial: Tuple[np.ndarray, np.ndarray] = (cached['sums'],
+                                                  cached['num'])
+
+        if np.array_equal(cached['stamp'], stamp):
+            return partial
+
+        if str(cached['digest']) != hist_file_hash(paths):
+            return None
+
+    # The files were rewritten with the same content
+    hist_save_partial(path, paths, key, partial)
+
+    return partial
+
+# -----------------------------------------------------------------------------
+
+
+def hist_save_partial(path: str, paths: List[str], key: str,
+                      partial: Tuple[np.ndarray, np.ndarray]) -> None:
+    """Saves the partial result of a week.
+
+    The file is written with a temporary name and then renamed, so a process
+    that is stopped does not leave an incomplete cached result.
+
+    :param path: string of the path of the cached partial result.
+    :param paths: list of the strings of the paths of the input files.
+    :param key: string of the key of the computation (i.e. 'direct_10000').
+    :param partial: tuple with the sums and the number of trades of the week.
+    :return: None -- The function saves the data in a file and does not return
+     a value.
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    stamp: np.ndarray = hist_file_stamp(paths)
+    digest: str = hist_file_hash(paths)
+
+    tmp_path: str = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        np.savez(file, key=f'{key}_v{__version__}', stamp=stamp,
+                 digest=digest, sums=partial[0], num=partial[1])
+
+    os.replace(tmp_path, path)
+
+# -----------------------------------------------------------------------------
+
+
+def main() -> None:
+    """The main function of the script.
+
+    The main function is used to test the functions in the script.
+
+    :return: None.
+    """
+
+# -----------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,920 @@
+'''HIST data kernel module.
+
+The functions in the module compute the sums of the sign-weighted midpoint
+price returns and the number of trades for every time lag. They are the
+computational core of the self-responses in trade and physical time scale, so
+both time scales use (and are benchmarked with) the same code.
+
+All the engines take the midpoint prices as a contiguous float64 array and
+the trade signs as a contiguous int8 array, and return the sums and the counts
+for the lags 1 to :math:`\\tau`, or for a grid of lags (i.e. log-spaced).
+
+In physical time scale most of the seconds have no trades (sign 0) and the
+same midpoint price as the previous second. The sparse representation keeps
+only the seconds with trades and their signs, and the seconds where the
+midpoint price changes and its new value (a step function). The sparse engine
+iterates over the seconds with trades and adds every step of the midpoint
+price in the next :math:`\\tau` seconds to a range of lags, so its cost
+depends on the number of trades and price changes instead of the length of
+the week.
+
+The cross-response uses the trade signs of a series :math:`i` and the
+midpoint price returns of a series :math:`j` with the same time grid (i.e. two
+forex pairs in physical time scale). The self-response is the case
+:math:`i = j`.
+
+The numba engine compiles the lag loop with numba when it is installed. Every
+lag is a single pass over the data without temporary arrays, and the lags
+are computed in parallel. In the processes of a pool, which already use all
+the cores, the lags are computed in a single thread. Without numba the
+engine uses the direct engine.
+
+This script requires the following modules:
+    * hashlib
+    * multiprocessing
+    * time
+    * typing
+    * numpy
+    * numba (optional)
+
+The module contains the following functions:
+    * hist_kernel_arrays - converts the midpoint and signs to the kernel
+      layout.
+    * hist_self_response_loop - computes the sums lag by lag with slices.
+    * hist_self_response_direct - computes the sums lag by lag with dot
+      products over views.
+    * hist_self_response_numba - computes the sums lag by lag with a compiled
+      loop.
+    * hist_self_response_fft - computes the sums for all the lags with a FFT.
+    * hist_self_response_fft_batch - computes the sums of several series with
+      a FFT.
+    * hist_cross_response_fft - computes the cross-response sums of several
+      aligned series with a FFT.
+    * hist_sparse_arrays - converts the midpoint and signs to the sparse
+      representation.
+    * hist_dense_arrays - converts the sparse representation to the midpoint
+      and signs.
+    * hist_self_response_sparse - computes the sums from the sparse
+      representation.
+    * hist_self_response_kernel - computes the sums with the selected engine.
+    * hist_lag_grid - returns a grid of time lags.
+    * hist_lag_key - returns a short key of a grid of time lags.
+    * hist_lag_suffix - returns the suffix of the files of a grid of time
+      lags.
+    * hist_kernel_benchmark - measures the throughput of the engines.
+    * main - the main function of the script.
+
+.. moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
+'''
+
+# -----------------------------------------------------------------------------
+# Modules
+
+import hashlib
+import multiprocessing as mp
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+try:
+    import numba  # type: ignore
+    _prange = numba.prange
+except ImportError:
+    numba = None
+    _prange = range
+
+__engines__ = ('loop', 'direct', 'fft', 'sparse', 'numba')
+# Maximum number of (trade, midpoint step) terms computed at once
+__pairs__ = 2 ** 22
+# Maximum number of series transformed at once by the batch FFT engine
+__rows__ = 8
+
+# -----------------------------------------------------------------------------
+
+
+def hist_kernel_arrays(midpoint: np.ndarray,
+                       trade_signs: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Converts the midpoint prices and the trade signs to the kernel layout.
+
+    :param midpoint: numpy array with the midpoint prices.
+    :param trade_signs: numpy array with the trade signs.
+    :return: tuple -- The function returns a tuple with a contiguous float64
+     array of midpoint prices and a contiguous int8 array of trade signs.
+    """
+
+    midpoint = np.ascontiguousarray(midpoint, dtype=np.float64)
+    trade_signs = np.ascontiguousarray(trade_signs, dtype=np.int8)
+
+    assert len(midpoint) == len(trade_signs)
+
+    return (midpoint, trade_signs)
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_kernel_terms(midpoint: np.ndarray,
+                       trade_signs: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Obtains the lag independent terms used by the direct and FFT engines.
+
+    The sum of the sign-weighted returns for a lag :math:`\\tau` is split as
+    :math:`\\sum_{t} \\epsilon(t) m(t + \\tau) / m(t) - \\sum_{t}
+    \\epsilon(t)`. The midpoint prices are centered on their mean to avoid the
+    cancellation between both terms.
+
+    :param midpoint: numpy array with the midpoint prices without the last
+     value.
+    :param trade_signs: numpy array with the trade signs without the first
+     value.
+    :return: tuple -- The function returns a tuple with the sign weights, the
+     centered midpoint, and the cumulative sums of the subtracted term and of
+     the non zero signs (both starting with 0).
+    """
+
+    midpoint_dev: np.ndarray = midpoint - np.mean(midpoint)
+    sign_weight: np.ndarray = trade_signs / midpoint
+
+    base: np.ndarray = np.zeros(len(midpoint) + 1)
+    np.cumsum(sign_weight * midpoint_dev, out=base[1:])
+    count: np.ndarray = np.zeros(len(midpoint) + 1, dtype=np.int64)
+    np.cumsum(trade_signs != 0, out=count[1:])
+
+    return (sign_weight, midpoint_dev, base, count)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_self_response_loop(midpoint: np.ndarray, trade_signs: np.ndarray,
+                            tau: int, lags: Optional[np.ndarray] = None) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self-response sums lag by lag.
+
+    For every time lag the midpoint price returns are computed and multiplied
+    by the trade signs. This is the reference implementation used to validate
+    the other engines.
+
+    :param midpoint: numpy array with the midpoint prices.
+    :param trade_signs: numpy array with the trade signs.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :param lags: numpy array with the increasing time lags to compute, or
+     None for all the lags from 1 to tau (i.e. hist_lag_grid(10000, 200)).
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns and the number of trades for every lag.
+    """
+
+    if lags is None:
+        lags = np.arange(1, tau + 1)
+
+    # Relate the return of the previous second with the current trade sign
+    midpoint = midpoint[:-1]
+    trade_signs = trade_signs[1:]
+
+    assert len(midpoint) == len(trade_signs)
+
+    # Array of the average of each tau
+    self_response_tau: np.ndarray = np.zeros(len(lags))
+    num: np.ndarray = np.zeros(len(lags))
+
+    # Calculating the midpoint price return and the self-response function
+    # Depending on the tau value
+    col: int
+    lag: int
+    for col, lag in enumerate(lags):
+        tau_idx: int = lag - 1
+
+        trade_sign_tau: np.ndarray = trade_signs[:-tau_idx - 1]
+        trade_sign_no_0_len: int = len(trade_sign_tau[trade_sign_tau != 0])
+        num[col] = trade_sign_no_0_len
+        # Obtain the midpoint price return. Displace the numerator tau
+        # values to the right and compute the return
+
+        # Midpoint price returns
+        log_return_sec: np.ndarray = (midpoint[tau_idx + 1:]
+                                      - midpoint[:-tau_idx - 1]) \
+            / midpoint[:-tau_idx - 1]
+
+        # Obtain the self response value
+        if trade_sign_no_0_len != 0:
+            product: np.ndarray = log_return_sec * trade_sign_tau
+            self_response_tau[col] = np.sum(product)
+
+    return (self_response_tau, num)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_self_response_direct(midpoint: np.ndarray, trade_signs: np.ndarray,
+                              tau: int, lags: Optional[np.ndarray] = None) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self-response sums lag by lag without temporary arrays.
+
+    The lag independent terms are computed once. For every lag the sum is a
+    dot product between two views of those terms, so no array is allocated
+    inside the loop. The cost is :math:`O(N)` for every computed lag, so a
+    grid of lags only costs its number of lags.
+
+    :param midpoint: numpy array with the midpoint prices.
+    :param trade_signs: numpy array with the trade signs.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :param lags: numpy array with the increasing time lags to compute, or
+     None for all the lags from 1 to tau (i.e. hist_lag_grid(10000, 200)).
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns and the number of trades for every lag.
+    """
+
+    midpoint, trade_signs = hist_kernel_arrays(midpoint, trade_signs)
+
+    if lags is None:
+        lags = np.arange(1, tau + 1)
+
+    self_response_tau: np.ndarray = np.zeros(len(lags))
+    num: np.ndarray = np.zeros(len(lags))
+
+    # Relate the return of the previous second with the current trade sign
+    m_len: int = len(midpoint) - 1
+    if m_len < 2:
+        return (self_response_tau, num)
+
+    sign_weight: np.ndarray
+    midpoint_dev: np.ndarray
+    base: np.ndarray
+    count: np.ndarray
+    sign_weight, midpoint_dev, base, count = \
+        _hist_kernel_terms(midpoint[:-1], trade_signs[1:])
+
+    col: int
+    lag: int
+    for col, lag in enumerate(lags):
+        tau_idx: int = lag - 1
+        if tau_idx >= m_len - 1:
+            break
+        # Number of terms for the lag
+        end: int = m_len - tau_idx - 1
+        self_response_tau[col] = \
+            np.dot(sign_weight[:end], midpoint_dev[tau_idx + 1:]) - base[end]
+        num[col] = count[end]
+
+    return (self_response_tau, num)
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_self_response_lags(midpoint: np.ndarray, sign_weight: np.ndarray,
+                             lags: np.ndarray,
+                             self_response_tau: np.ndarray) -> None:
+    """Computes the self-response sums of the lags in a single pass per lag.
+
+    The return, the product with the trade sign and the sum are done in the
+    same loop, without temporary arrays. The lags longer than the data are
+    skipped. With numba the lags are computed in parallel.
+
+    :param midpoint: numpy array with the midpoint prices without the last
+     value.
+    :param sign_weight: numpy array with the trade signs without the first
+     value divided by the midpoint prices.
+    :param lags: numpy array with the increasing time lags.
+    :param self_response_tau: numpy array where the sums are saved.
+    :return: None -- The function saves the results in the array and does not
+     return a value.
+    """
+
+    m_len: int = len(midpoint)
+
+    for col in _prange(len(lags)):
+        tau_idx: int = lags[col] - 1
+        end: int = m_len - tau_idx - 1
+        if end <= 0:
+            continue
+
+        total: float = 0.
+        for idx in range(end):
+            total += sign_weight[idx] \
+                * (midpoint[idx + tau_idx + 1] - midpoint[idx])
+
+        self_response_tau[col] = total
+
+
+if numba is not None:
+    _hist_self_response_lags = numba.njit(parallel=True, cache=True)(
+        _hist_self_response_lags)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_self_response_numba(midpoint: np.ndarray, trade_signs: np.ndarray,
+                             tau: int, lags: Optional[np.ndarray] = None) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self-response sums lag by lag with a compiled loop.
+
+    Without numba the sums are computed with hist_self_response_direct. The
+    first call compiles the loop (the result is cached on disk). In a process
+    of a pool the loop uses a single thread, so the threads of the processes
+    do not compete for the cores.
+
+    :param midpoint: numpy array with the midpoint prices.
+    :param trade_signs: numpy array with the trade signs.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :param lags: numpy array with the increasing time lags to compute, or
+     None for all the lags from 1 to tau (i.e. hist_lag_grid(10000, 200)).
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns and the number of trades for every lag.
+    """
+
+    if numba is None:
+        return hist_self_response_direct(midpoint, trade_signs, tau, lags)
+
+    midpoint, trade_signs = hist_kernel_arrays(midpoint, trade_signs)
+
+    if lags is None:
+        lags = np.arange(1, tau + 1)
+    lags = np.ascontiguousarray(lags, dtype=np.int64)
+
+    self_response_tau: np.ndarray = np.zeros(len(lags))
+    num: np.ndarray = np.zeros(len(lags))
+
+    # Relate the return of the previous second with the current trade sign
+    m_len: int = len(midpoint) - 1
+    if m_len >= 1:
+        sign_weight: np.ndarray = trade_signs[1:] / midpoint[:-1]
+        # The processes of a pool are daemonic
+        if mp.current_process().daemon:
+            numba.set_num_threads(1)
+        _hist_self_response_lags(midpoint[:-1], sign_weight, lags,
+                                 self_response_tau)
+
+        count: np.ndarray = np.zeros(m_len + 1, dtype=np.int64)
+        np.cumsum(trade_signs[1:] != 0, out=count[1:])
+        ends: np.ndarray = m_len - lags
+        valid: np.ndarray = ends > 0
+        num[valid] = count[ends[valid]]
+
+    return (self_response_tau, num)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_self_response_fft(midpoint: np.ndarray, trade_signs: np.ndarray,
+                           tau: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self-response sums for all the lags with a FFT.
+
+    The first term of the sum is the cross-correlation of
+    :math:`\\epsilon / m` with :math:`m`, and it is obtained for every lag at
+    once with a FFT. The cost is :math:`O(N \\log N)` instead of
+    :math:`O(N \\tau)`.
+
+    The counts are exact. The sums agree with hist_self_response_loop within
+    floating-point round-off, ``np.allclose(fft, loop, rtol=1e-8,
+    atol=1e-10)``.
+
+    :param midpoint: numpy array with the midpoint prices.
+    :param trade_signs: numpy array with the trade signs.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns and the number of trades for every lag.
+    """
+
+    midpoint, trade_signs = hist_kernel_arrays(midpoint, trade_signs)
+
+    self_response_tau: np.ndarray = np.zeros(tau)
+    num: np.ndarray = np.zeros(tau)
+
+    # Relate the return of the previous second with the current trade sign
+    m_len: int = len(midpoint) - 1
+    if m_len < 2:
+        return (self_response_tau, num)
+
+    sign_weight: np.ndarray
+    midpoint_dev: np.ndarray
+    base: np.ndarray
+    count: np.ndarray
+    sign_weight, midpoint_dev, base, count = \
+        _hist_kernel_terms(midpoint[:-1], trade_signs[1:])
+
+    # FFT length without circular wrap for the lags up to tau
+    fft_len: int = 1
+    while fft_len < m_len + tau:
+        fft_len *= 2
+
+    corr: np.ndarray = np.fft.irfft(
+        np.conj(np.fft.rfft(sign_weight, fft_len))
+        * np.fft.rfft(midpoint_dev, fft_len), fft_len)[1:tau + 1]
+
+    # Number of terms for every lag
+    ends: np.ndarray = m_len - 1 - np.arange(tau)
+    valid: np.ndarray = ends > 0
+
+    self_response_tau[valid] = corr[valid] - base[ends[valid]]
+    num[valid] = count[ends[valid]]
+
+    return (self_response_tau, num)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_self_response_fft_batch(
+        midpoints: List[np.ndarray], trade_signs: List[np.ndarray],
+        tau: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self-response sums of several series with a FFT.
+
+    The series with the same length (i.e. the weeks of several forex pairs
+    in physical time scale) are stacked and transformed together in blocks
+    of __rows__ series. Every block uses the same FFT length and the same
+    zero padded buffers, so the FFT plan and the memory are reused between
+    the series. The result of every series is the one of
+    hist_self_response_fft.
+
+    :param midpoints: list of the numpy arrays with the midpoint prices of
+     every series.
+    :param trade_signs: list of the numpy arrays with the trade signs of
+     every series.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :return: tuple -- The function returns a tuple with two arrays with a row
+     for every series: the sum of the sign-weighted returns and the number
+     of trades for every lag.
+    """
+
+    assert len(midpoints) == len(trade_signs)
+
+    self_response_tau: np.ndarray = np.zeros((len(midpoints), tau))
+    num: np.ndarray = np.zeros((len(midpoints), tau))
+
+    # Series grouped by length. The series without lags keep zeros
+    groups: Dict[int, List[int]] = {}
+    idx: int
+    midpoint: np.ndarray
+    for idx, midpoint in enumerate(midpoints):
+        if len(midpoint) - 1 >= 2:
+            groups.setdefault(len(midpoint) - 1, []).append(idx)
+
+    m_len: int
+    rows: List[int]
+    for m_len, rows in groups.items():
+        # FFT length without circular wrap for the lags up to tau
+        fft_len: int = 1
+        while fft_len < m_len + tau:
+            fft_len *= 2
+
+        ends: np.ndarray = m_len - 1 - np.arange(tau)
+        valid: np.ndarray = ends > 0
+
+        rows_num: int = min(len(rows), __rows__)
+        sign_weights: np.ndarray = np.zeros((rows_num, fft_len))
+        midpoint_devs: np.ndarray = np.zeros((rows_num, fft_len))
+
+        block_ini: int
+        for block_ini in range(0, len(rows), __rows__):
+            block: List[int] = rows[block_ini:block_ini + __rows__]
+            bases: List[np.ndarray] = []
+            counts: List[np.ndarray] = []
+
+            row: int
+            for row, idx in enumerate(block):
+                midpoint, trade_sign = hist_kernel_arrays(midpoints[idx],
+                                                          trade_signs[idx])
+                # Relate the return of the previous second with the current
+                # trade sign
+                sign_weight, midpoint_dev, base, count = \
+                    _hist_kernel_terms(midpoint[:-1], trade_sign[1:])
+                sign_weights[row, :m_len] = sign_weight
+                midpoint_devs[row, :m_len] = midpoint_dev
+                bases.append(base)
+                counts.append(count)
+
+            corr: np.ndarray = np.fft.irfft(
+                np.conj(np.fft.rfft(sign_weights[:len(block)], axis=1))
+                * np.fft.rfft(midpoint_devs[:len(block)], axis=1),
+                fft_len, axis=1)[:, 1:tau + 1]
+
+            for row, idx in enumerate(block):
+                self_response_tau[idx, valid] = \
+                    corr[row, valid] - bases[row][ends[valid]]
+                num[idx, valid] = counts[row][ends[valid]]
+
+    return (self_response_tau, num)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_cross_response_fft(midpoints: List[np.ndarray],
+                            trade_signs: List[np.ndarray], tau: int,
+                            targets: Optional[List[int]] = None) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the cross-response sums of several aligned series with a FFT.
+
+    The sum for the trade signs of the series :math:`i` and the midpoint
+    price returns of the series :math:`j` is the one of hist_self_response_fft
+    with the midpoint prices of :math:`j` and the trade signs of :math:`i`.
+    The transform of the midpoint prices of every series :math:`j` and the
+    counts of the trade signs of every series :math:`i` are computed once and
+    used for all the partners. The sign weights of a series :math:`j` are
+    transformed for all the series :math:`i` together in blocks of __rows__.
+
+    :param midpoints: list of the numpy arrays with the midpoint prices of
+     every series. All the series have the same length and time grid.
+    :param trade_signs: list of the numpy arrays with the trade signs of every
+     series.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :param targets: list of the indexes of the series :math:`j` of the
+     midpoint price returns, or None for all the series (i.e. [0, 3]).
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns with the shape (series i, targets j, tau) and the
+     number of trades for every lag with the shape (series i, tau), which is
+     the same for all the targets.
+    """
+
+    assert len(midpoints) == len(trade_signs)
+
+    if targets is None:
+        targets = list(range(len(midpoints)))
+
+    self_response_tau: np.ndarray = np.zeros((len(trade_signs), len(targets),
+                                              tau))
+    num: np.ndarray = np.zeros((len(trade_signs), tau))
+
+    # Relate the return of the previous second with the current trade sign
+    m_len: int = len(midpoints[0]) - 1 if midpoints else 0
+    if m_len < 2:
+        return (self_response_tau, num)
+
+    # FFT length without circular wrap for the lags up to tau
+    fft_len: int = 1
+    while fft_len < m_len + tau:
+        fft_len *= 2
+
+    ends: np.ndarray = m_len - 1 - np.arange(tau)
+    valid: np.ndarray = ends > 0
+
+    # Trade signs and their counts are shared by all the partners
+    signs: List[np.ndarray] = []
+    idx: int
+    trade_sign: np.ndarray
+    for idx, trade_sign in enumerate(trade_signs):
+        trade_sign = np.ascontiguousarray(trade_sign[1:], dtype=np.int8)
+        assert len(trade_sign) == m_len
+        count: np.ndarray = np.zeros(m_len + 1, dtype=np.int64)
+        np.cumsum(trade_sign != 0, out=count[1:])
+        signs.append(trade_sign)
+        num[idx, valid] = count[ends[valid]]
+
+    rows_num: int = min(len(signs), __rows__)
+    sign_weights: np.ndarray = np.zeros((rows_num, fft_len))
+
+    col: int
+    target: int
+    for col, target in enumerate(targets):
+        midpoint: np.ndarray = np.ascontiguousarray(midpoints[target][:-1],
+                                                    dtype=np.float64)
+        midpoint_dev: np.ndarray = midpoint - np.mean(midpoint)
+        midpoint_fft: np.ndarray = np.fft.rfft(midpoint_dev, fft_len)
+
+        block_ini: int
+        for block_ini in range(0, len(signs), __rows__):
+            block: List[np.ndarray] = signs[block_ini:block_ini + __rows__]
+
+            row: int
+            for row, trade_sign in enumerate(block):
+                np.divide(trade_sign, midpoint, out=sign_weights[row, :m_len])
+
+            corr: np.ndarray = np.fft.irfft(
+                np.conj(np.fft.rfft(sign_weights[:len(block)], axis=1))
+                * midpoint_fft, fft_len, axis=1)[:, 1:tau + 1]
+            # Subtracted term of every lag
+            base: np.ndarray = np.zeros((len(block), m_len + 1))
+            np.cumsum(sign_weights[:len(block), :m_len] * midpoint_dev,
+                      axis=1, out=base[:, 1:])
+
+            rows: slice = slice(block_ini, block_ini + len(block))
+            self_response_tau[rows, col][:, valid] = \
+                corr[:, valid] - base[:, ends[valid]]
+
+    return (self_response_tau, num)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_sparse_arrays(midpoint: np.ndarray,
+                       trade_signs: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Converts the midpoint prices and trade signs to the sparse arrays.
+
+    :param midpoint: numpy array with the midpoint prices.
+    :param trade_signs: numpy array with the trade signs.
+    :return: tuple -- The function returns a tuple with the positions of the
+     non zero trade signs (int64), their signs (int8), the positions where
+     the midpoint price changes (int64, starting with 0), the midpoint prices
+     from those positions (float64) and the length of the arrays.
+    """
+
+    midpoint, trade_signs = hist_kernel_arrays(midpoint, trade_signs)
+
+    active: np.ndarray = np.flatnonzero(trade_signs).astype(np.int64)
+    changes: np.ndarray = np.flatnonzero(
+        np.diff(midpoint, prepend=np.nan) != 0).astype(np.int64)
+
+    return (active, trade_signs[active], changes, midpoint[changes],
+            len(midpoint))
+
+# -----------------------------------------------------------------------------
+
+
+def hist_dense_arrays(active: np.ndarray, signs: np.ndarray,
+                      changes: np.ndarray, values: np.ndarray,
+                      length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Converts the sparse arrays to the midpoint prices and trade signs.
+
+    :param active: numpy array with the positions of the non zero trade
+     signs.
+    :param signs: numpy array with the non zero trade signs.
+    :param changes: numpy array with the positions where the midpoint price
+     changes, starting with 0.
+    :param values: numpy array with the midpoint prices from those positions.
+    :param length: integer of the length of the arrays.
+    :return: tuple -- The function returns a tuple with a float64 array of
+     midpoint prices and an int8 array of trade signs.
+    """
+
+    midpoint: np.ndarray = np.repeat(values, np.diff(changes, append=length))
+    trade_signs: np.ndarray = np.zeros(length, dtype=np.int8)
+    trade_signs[active] = signs
+
+    return (midpoint, trade_signs)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_self_response_sparse(active: np.ndarray, signs: np.ndarray,
+                              changes: np.ndarray, values: np.ndarray,
+                              length: int,
+                              tau: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self-response sums from the sparse representation.
+
+    For a trade at :math:`t` the return for the lag :math:`\\tau` only
+    changes when the midpoint price changes, so every step of the midpoint
+    price in the next :math:`\\tau` positions adds a constant return to a
+    range of lags. The ranges are accumulated in a difference array. The cost
+    is the number of pairs of trades and midpoint price steps, computed in
+    blocks of __pairs__ terms.
+
+    The counts are exact. The sums agree with hist_self_response_loop within
+    floating-point round-off.
+
+    :param active: numpy array with the positions of the non zero trade
+     signs.
+    :param signs: numpy array with the non zero trade signs.
+    :param changes: numpy array with the positions where the midpoint price
+     changes, starting with 0.
+    :param values: numpy array with the midpoint prices from those positions.
+    :param length: integer of the length of the arrays.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns and the number of trades for every lag.
+    """
+
+    self_response_diff: np.ndarray = np.zeros(tau + 1)
+    num: np.ndarray = np.zeros(tau)
+
+    # Relate the return of the previous second with the current trade sign.
+    # Only the trades with at least one lag are used
+    m_len: int = length - 1
+    if m_len < 2:
+        return (self_response_diff[:tau], num)
+
+    trades: np.ndarray = active - 1
+    valid: np.ndarray = (trades >= 0) & (trades < m_len - 1)
+    trades = trades[valid]
+    trade_signs: np.ndarray = signs[valid].astype(np.float64)
+
+    # Last position of the returns of every trade and number of lags
+    ends: np.ndarray = np.minimum(trades + tau, m_len - 1)
+    num = np.cumsum(np.bincount(ends - trades, minlength=tau + 1)[::-1])[
+        ::-1][1:].astype(np.float64)
+
+    # Midpoint price of every trade and steps of the midpoint price between
+    # the next position and the last one
+    step_ends: np.ndarray = np.append(changes[1:], length)
+    midpoint: np.ndarray = \
+        values[np.searchsorted(changes, trades, side='right') - 1]
+    step_ini: np.ndarray = np.searchsorted(changes, trades + 1,
+                                           side='right') - 1
+    steps_num: np.ndarray = np.searchsorted(changes, ends, side='right') \
+        - step_ini
+
+    # Blocks of trades with at most __pairs__ terms
+    bounds: np.ndarray = np.searchsorted(
+        np.cumsum(steps_num),
+        np.arange(__pairs__, int(np.sum(steps_num)) + __pairs__, __pairs__),
+        side='right')
+    bounds = np.unique(np.concatenate(([0], np.maximum(bounds, 1),
+                                       [len(trades)])))
+
+    block_ini: int
+    block_end: int
+    for block_ini, block_end in zip(bounds[:-1], bounds[1:]):
+        block: slice = slice(block_ini, block_end)
+        counts: np.ndarray = steps_num[block]
+        trade_idx: np.ndarray = np.repeat(np.arange(len(counts)), counts)
+        first_term: np.ndarray = np.cumsum(counts) - counts
+        step_idx: np.ndarray = step_ini[block][trade_idx] \
+            + np.arange(len(trade_idx)) - first_term[trade_idx]
+
+        trade_pos: np.ndarray = trades[block][trade_idx]
+        # Range of lags of every step
+        lag_ini: np.ndarray = \
+            np.maximum(changes[step_idx], trade_pos + 1) - trade_pos - 1
+        lag_end: np.ndarray = np.minimum(step_ends[step_idx] - 1,
+                                         ends[block][trade_idx]) - trade_pos
+        trade_mid: np.ndarray = midpoint[block][trade_idx]
+        weight: np.ndarray = trade_signs[block][trade_idx] \
+            * (values[step_idx] - trade_mid) / trade_mid
+
+        self_response_diff += np.bincount(lag_ini, weights=weight,
+                                          minlength=tau + 1)
+        self_response_diff -= np.bincount(lag_end, weights=weight,
+                                          minlength=tau + 1)
+
+    return (np.cumsum(self_response_diff)[:tau], num)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_self_response_kernel(
+        midpoint: np.ndarray, trade_signs: np.ndarray, tau: int,
+        engine: str = 'loop',
+        lags: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self-response sums with the selected engine.
+
+    The loop, direct and numba engines only compute the lags of the grid.
+    The FFT and sparse engines obtain all the lags up to the largest one at
+    once, and the lags of the grid are selected. The default is the loop
+    engine, the original computation. The other engines are faster and give
+    the same sums up to the rounding of the floating point operations.
+
+    :param midpoint: numpy array with the midpoint prices.
+    :param trade_signs: numpy array with the trade signs.
+    :param tau: integer of the maximum time lag (i.e. 10000). With a grid of
+     lags the largest lag of the grid is used.
+    :param engine: string of the engine used to compute the sums, 'loop',
+     'direct', 'fft', 'sparse' or 'numba' (i.e. 'fft').
+    :param lags: numpy array with the increasing time lags to compute, or
+     None for all the lags from 1 to tau (i.e. hist_lag_grid(10000, 200)).
+    :return: tuple -- The function returns a tuple with the sum of the
+     sign-weighted returns and the number of trades for every lag.
+    """
+
+    self_response: Tuple[np.ndarray, np.ndarray]
+
+    if lags is not None:
+        lags = np.asarray(lags, dtype=np.int64)
+        assert len(lags) and lags[0] >= 1 and np.all(np.diff(lags) > 0)
+        tau = int(lags[-1])
+
+    if engine == 'loop':
+        return hist_self_response_loop(midpoint, trade_signs, tau, lags)
+    elif engine == 'direct':
+        return hist_self_response_direct(midpoint, trade_signs, tau, lags)
+    elif engine == 'numba':
+        return hist_self_response_numba(midpoint, trade_signs, tau, lags)
+    elif engine == 'fft':
+        self_response = hist_self_response_fft(midpoint, trade_signs, tau)
+    elif engine == 'sparse':
+        self_response = hist_self_response_sparse(
+            *hist_sparse_arrays(midpoint, trade_signs), tau)
+    else:
+        raise ValueError(f'Unknown engine {engine}. Use one of {__engines__}')
+
+    if lags is None:
+        return self_response
+
+    return (self_response[0][lags - 1], self_response[1][lags - 1])
+
+# -----------------------------------------------------------------------------
+
+
+def hist_lag_grid(tau: int = 10000,
+                  points: Optional[int] = None) -> np.ndarray:
+    """Returns a grid of time lags.
+
+    :param tau: integer of the maximum time lag (i.e. 1000).
+    :param points: integer of the number of log-spaced lags, or None for all
+     the lags from 1 to tau. The repeated lags of the log-spaced grid are
+     removed, so the grid can have less points (i.e. 200).
+    :return: np.ndarray -- The function returns an int64 array with the
+     increasing time lags.
+    """
+
+    if points is None:
+        return np.arange(1, tau + 1, dtype=np.int64)
+
+    return np.unique(np.round(
+        np.logspace(0, np.log10(tau), points)).astype(np.int64))
+
+# -----------------------------------------------------------------------------
+
+
+def hist_lag_key(lags: Optional[np.ndarray], tau: int = 10000) -> str:
+    """Returns a short key of a grid of time lags.
+
+    The key of all the lags from 1 to tau is tau, so the keys of the cached
+    results without grid do not change.
+
+    :param lags: numpy array with the time lags, or None for all the lags
+     from 1 to tau.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :return: str -- The function returns the key of the grid.
+    """
+
+    if lags is None:
+        return str(tau)
+
+    lags = np.asarray(lags, dtype=np.int64)
+    if np.array_equal(lags, np.arange(1, len(lags) + 1)):
+        return str(len(lags))
+
+    digest: str = hashlib.blake2b(lags.tobytes(), digest_size=8).hexdigest()
+
+    return f'{len(lags)}_{lags[-1]}_{digest}'
+
+# -----------------------------------------------------------------------------
+
+
+def hist_lag_suffix(lags: Optional[np.ndarray], tau: int = 10000) -> str:
+    """Returns the suffix of the files of a grid of time lags.
+
+    The results without grid keep their names, so the results with a grid
+    do not replace them.
+
+    :param lags: numpy array with the time lags, or None for all the lags
+     from 1 to tau.
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :return: str -- The function returns the suffix (i.e. '_lags_200_1000_'
+     followed by the digest of the grid), empty without grid.
+    """
+
+    if lags is None:
+        return ''
+
+    return f'_lags_{hist_lag_key(lags, tau)}'
+
+# -----------------------------------------------------------------------------
+
+
+def hist_kernel_benchmark(ticks: List[int], tau: int,
+                          engines: Tuple[str, ...] = __engines__) \
+        -> Dict[str, List[float]]:
+    """Measures the throughput of the engines with synthetic data.
+
+    The midpoint prices are a random walk rounded to five decimals and the
+    trade signs are obtained from the midpoint price changes, like the trade
+    and physical time scale data. Every engine is run once with a few ticks
+    before the measures, so the compilation of the numba engine is not
+    measured.
+
+    :param ticks: list of the number of ticks to test (i.e. [10000, 100000]).
+    :param tau: integer of the maximum time lag (i.e. 10000).
+    :param engines: tuple of the strings of the engines to test
+     (i.e. ('direct', 'fft')).
+    :return: dict -- The function returns a dictionary with the throughput
+     in ticks·lags per second of every engine for every number of ticks.
+    """
+
+    np.random.seed(0)
+    results: Dict[str, List[float]] = {engine: [] for engine in engines}
+
+    tick_num: int
+    for tick_num in ticks:
+        midpoint: np.ndarray = np.round(
+            1.3 * np.exp(np.cumsum(np.random.normal(0, 1e-5, tick_num))), 5)
+        trade_signs: np.ndarray = np.sign(np.diff(midpoint, prepend=1.3))
+
+        engine: str
+        for engine in engines:
+            hist_self_response_kernel(midpoint[:100], trade_signs[:100], 10,
+                                      engine)
+
+            t_ini: float = time.perf_counter()
+            hist_self_response_kernel(midpoint, trade_signs, tau, engine)
+            t_run: float = time.perf_counter() - t_ini
+            results[engine].append(tick_num * tau / t_run)
+
+            print(f'{engine:>8} - {tick_num:>9} ticks - '
+                  + f'{tick_num * tau / t_run:.3e} ticks·lags/s')
+
+    return results
+
+# -----------------------------------------------------------------------------
+
+
+def main() -> None:
+    """The main function of the script.
+
+    The main function is used to test the functions in the script.
+
+    :return: None.
+    """
+
+    hist_kernel_benchmark([10000, 100000], 1000)
+
+# -----------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
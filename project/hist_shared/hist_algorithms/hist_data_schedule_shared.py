@@ -0,0 +1,282 @@
+'''HIST data schedule module.
+
+The functions in the module distribute the tasks of a stage (i.e. the weeks
+of the pairs and years) in a pool of processes.
+
+The size of the tasks is very uneven (holiday weeks and the week 53 are
+almost empty). When the tasks are sent in lexical order the largest ones can
+be the last, and the other processes are idle until they finish. The tasks
+are sent largest first, one by one, and the results are received in the
+order they finish. At the end the makespan is compared with the ideal one.
+
+With a memory budget a task is only sent when the estimated memory of the
+tasks running with it fits in the budget, so a few large tasks (i.e. the
+years of the most liquid pairs) do not run together.
+
+This script requires the following modules:
+    * multiprocessing
+    * os
+    * queue
+    * time
+    * typing
+    * psutil (optional)
+
+The module contains the following functions:
+    * hist_task_size - returns the size of the input files of a task.
+    * hist_schedule_order - sorts the tasks largest first.
+    * hist_memory_available - returns the available physical memory.
+    * hist_schedule_run - runs the tasks in a pool largest first.
+    * hist_schedule_report - prints the makespan and the ideal makespan.
+    * main - the main function of the script.
+
+.. moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
+'''
+
+# -----------------------------------------------------------------------------
+# Modules
+
+from multiprocessing.pool import Pool
+import os
+import queue
+import time
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+try:
+    import psutil  # type: ignore
+except ImportError:
+    psutil = None
+
+# -----------------------------------------------------------------------------
+
+
+def hist_task_size(paths: List[str]) -> int:
+    """Returns the size of the input files of a task.
+
+    :param paths: list of the strings of the paths of the input files.
+    :return: int -- The function returns the sum of the sizes in bytes of the
+     files that exist.
+    """
+
+    size: int = 0
+
+    path: str
+    for path in paths:
+        if os.path.isfile(path):
+            size += os.path.getsize(path)
+
+    return size
+
+# -----------------------------------------------------------------------------
+
+
+def hist_schedule_order(tasks: List[Tuple[Any, ...]],
+                        sizes: List[int]) -> List[Tuple[Any, ...]]:
+    """Sorts the tasks largest first.
+
+    Tasks with the same size keep their order.
+
+    :param tasks: list of the tuples with the arguments of every task.
+    :param sizes: list of the sizes of the tasks (i.e. bytes or ticks).
+    :return: list -- The function returns the list of the sorted tasks.
+    """
+
+    assert len(tasks) == len(sizes)
+
+    order: List[int] = sorted(range(len(tasks)), key=lambda idx: -sizes[idx])
+
+    return [tasks[idx] for idx in order]
+
+# -----------------------------------------------------------------------------
+
+
+def _hist_timed_task(job: Tuple[Callable, Tuple[Any, ...]]) \
+        -> Tuple[Tuple[Any, ...], Any, float]:
+    """Runs a task and measures its duration.
+
+    :param job: tuple with the function and the arguments of the task.
+    :return: tuple -- The function returns a tuple with the arguments, the
+     result and the duration in seconds of the task.
+    """
+
+    function: Callable
+    task: Tuple[Any, ...]
+    function, task = job
+
+    t_ini: float = time.perf_counter()
+    result: Any = function(*task)
+
+    return (task, result, time.perf_counter() - t_ini)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_memory_available() -> Optional[int]:
+    """Returns the available physical memory.
+
+    The free pages do not include the page cache, which the kernel releases
+    when the memory is needed, so the budget would be much smaller than the
+    memory that can be used. The available memory is taken from psutil when
+    it is installed, or from MemAvailable in /proc/meminfo, which estimate
+    the memory that can be used without swapping.
+
+    :return: int -- The function returns the available memory in bytes, or
+     None when the system does not report it.
+    """
+
+    if psutil is not None:
+        return psutil.virtual_memory().available
+
+    try:
+        with open('/proc/meminfo') as meminfo:
+            line: str
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    # The value is in kB
+                    return int(line.split()[1]) * 1024
+
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return None
+
+# -----------------------------------------------------------------------------
+
+
+def hist_schedule_run(pool: Pool, function: Callable,
+                      tasks: List[Tuple[Any, ...]], sizes: List[int],
+                      processes: int, memory: Optional[List[int]] = None,
+                      budget: Optional[int] = None) \
+        -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+    """Runs the tasks in a pool largest first.
+
+    The tasks are sent one by one (chunksize of 1), so a process takes a new
+    task as soon as it finishes the previous one. The makespan is printed
+    when all the results are received.
+
+    With a memory budget the largest pending task whose estimated memory fits
+    in the budget left by the running tasks is sent. A task is always sent
+    when no other task is running, even if it does not fit.
+
+    :param pool: pool of processes.
+    :param function: function of the tasks. It must be defined at the top
+     level of a module.
+    :param tasks: list of the tuples with the arguments of every task.
+    :param sizes: list of the sizes of the tasks (i.e. bytes or ticks).
+    :param processes: integer of the number of processes of the pool
+     (i.e. 8).
+    :param memory: list of the estimated memory in bytes of every task, or
+     None to not limit the tasks running together.
+    :param budget: integer of the memory in bytes for all the running tasks,
+     or None to not limit the tasks running together (i.e. 16 * 2 ** 30).
+    :return: iterator -- The function yields a tuple with the arguments and
+     the result of every task in the order they finish.
+    """
+
+    durations: List[float] = []
+
+    t_ini: float = time.perf_counter()
+
+    task: Tuple[Any, ...]
+    result: Any
+    duration: float
+
+    if memory is None or budget is None:
+        jobs: List[Tuple[Callable, Tuple[Any, ...]]] = \
+            [(function, task) for task in hist_schedule_order(tasks, sizes)]
+
+        for task, result, duration in pool.imap_unordered(
+                _hist_timed_task, jobs, chunksize=1):
+            durations.append(duration)
+            yield (task, result)
+
+    else:
+        assert len(tasks) == len(memory)
+
+        # Positions of the tasks not sent, largest first
+        pending: List[int] = sorted(range(len(tasks)),
+                                    key=lambda idx: -sizes[idx])
+        # The callbacks of the pool put the results in the queue
+        finished: queue.Queue = queue.Queue()
+        running: int = 0
+        used: int = 0
+
+        while pending or running:
+            pos: int = 0
+            while pos < len(pending) and running < processes:
+                idx: int = pending[pos]
+                if running and used + memory[idx] > budget:
+                    pos += 1
+                    continue
+
+                pool.apply_async(
+                    _hist_timed_task, ((function, tasks[idx]),),
+                    callback=lambda out, idx=idx: finished.put(
+                        (idx, out, None)),
+                    error_callback=lambda error, idx=idx: finished.put(
+                        (idx, None, error)))
+                pending.pop(pos)
+                running += 1
+                used += memory[idx]
+
+            out: Optional[Tuple[Tuple[Any, ...], Any, float]]
+            error: Optional[BaseException]
+            idx, out, error = finished.get()
+            running -= 1
+            used -= memory[idx]
+
+            if error is not None:
+                raise error
+
+            assert out is not None
+            task, result, duration = out
+            durations.append(duration)
+            yield (task, result)
+
+    hist_schedule_report(time.perf_counter() - t_ini, durations, processes)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_schedule_report(makespan: float, durations: List[float],
+                         processes: int) -> Tuple[float, float]:
+    """Prints the makespan and the ideal makespan of the tasks.
+
+    The ideal makespan is the largest of the total duration divided by the
+    number of processes and the duration of the longest task.
+
+    :param makespan: float of the time in seconds to run all the tasks.
+    :param durations: list of the durations in seconds of every task.
+    :param processes: integer of the number of processes of the pool
+     (i.e. 8).
+    :return: tuple -- The function returns a tuple with the makespan and the
+     ideal makespan.
+    """
+
+    ideal: float = 0.
+    if durations:
+        ideal = max(sum(durations) / processes, max(durations))
+
+    efficiency: float = ideal / makespan if makespan > 0 else 1.
+
+    print(f'{len(durations)} tasks - makespan {makespan:.1f} s - ideal '
+          + f'{ideal:.1f} s - efficiency {efficiency:.0%}')
+    print()
+
+    return (makespan, ideal)
+
+# -----------------------------------------------------------------------------
+
+
+def main() -> None:
+    """The main function of the script.
+
+    The main function is used to test the functions in the script.
+
+    :return: None.
+    """
+
+# -----------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
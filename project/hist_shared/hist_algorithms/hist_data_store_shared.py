@@ -0,0 +1,732 @@
+'''HIST data store module.
+
+The functions in the module save and load the weekly tick tables obtained in
+the hist_data_extraction module.
+
+The weekly tables are stored in HDF5 files in table format, one file per
+forex pair, year and week. The table format is columnar, so the readers can
+load only the columns they need and filter the rows with a condition that is
+evaluated in the file (i.e. 'index >= Timestamp("2019-01-07")').
+
+The columns follow a tick schema. The timestamps are datetime64[ns] values
+(int64 nanoseconds since the epoch) and the trade signs are int8. The price
+columns ('Bid', 'Ask', 'Midpoint' and 'Spread') can be stored as
+
+    * 'float64': the values as they are computed.
+    * 'float32': single precision, when the values are kept to a tenth of a
+      pipette.
+    * 'pips': int32 fixed point in tenths of a pipette, when the values are
+      multiples of that unit.
+
+A price column that does not fulfill the condition of the selected format is
+stored as float64. The format of every column is saved with the data.
+
+The conditions of hist_load_week are evaluated in the file on the stored
+values. A 'pips' column is compared in fixed point units (i.e. for 'eur_usd'
+'Spread > 10' selects the spreads larger than 0.00001) and a 'float32' column
+in single precision.
+
+The midpoint price and the trade signs of a week can also be saved as raw
+numpy arrays next to the data file, in the layout used by the
+hist_data_kernel_shared module (float64 and int8). The response functions
+load them memory-mapped, so there is no copy and no unpickling, and the
+processes reading the same week share the pages of the operating system
+cache.
+
+The physical time scale data of a week can also be saved in the sparse
+representation of the hist_data_kernel_shared module (the seconds with trades
+and the steps of the midpoint price) in a numpy file next to the data file.
+
+The original data of a month (the zip file with the CSV file) can be
+converted once to a binary tick file next to the zip file. The file starts
+with a header with the content hash, size and modification time of the zip
+file and the order of the columns in the CSV file (the ask is before the bid
+in 2008), followed by fixed width records with the timestamp (datetime64[ns])
+and the prices (float64) in that order. The records are loaded
+memory-mapped, so the extraction reads the ticks without decompressing and
+parsing the CSV file again. A tick file is used while the zip file has the
+same size and modification time, or the same content hash.
+
+The extraction writes a manifest for every forex pair and year with the weeks
+that have data, and for every week the number of ticks, the first and last
+timestamps, the size in bytes and the content hash of the file. The other
+stages iterate the weeks of the manifest instead of trying to open every
+week of the year.
+
+This script requires the following modules:
+    * json
+    * os
+    * pickle
+    * re
+    * typing
+    * numpy
+    * pandas
+    * tables
+    * hist_data_cache_shared
+    * hist_data_kernel_shared
+
+The module contains the following functions:
+    * hist_week_path - returns the path of the file of a week.
+    * hist_physical_path - returns the path of the file of a week in
+      physical time scale.
+    * hist_arrays_path - returns the path of the array of a column.
+    * hist_sparse_path - returns the path of the sparse representation.
+    * hist_price_scale - returns the fixed point scale of a forex pair.
+    * hist_encode_ticks - converts the tick data to the tick schema.
+    * hist_decode_ticks - converts the price columns back to float64.
+    * hist_save_week - saves the tick table of a week.
+    * hist_load_week - loads the tick table of a week.
+    * hist_load_physical - loads the physical data of a week.
+    * hist_save_arrays - saves the midpoint price and trade signs arrays.
+    * hist_load_arrays - loads the midpoint price and trade signs arrays.
+    * hist_save_sparse - saves the sparse representation of a week.
+    * hist_load_sparse - loads the sparse representation of a week.
+    * hist_ticks_path - returns the path of the binary tick file of a month.
+    * hist_save_ticks - saves the binary tick file of a month.
+    * hist_load_ticks - loads the binary tick file of a month.
+    * hist_manifest_path - returns the path of the manifest of a year.
+    * hist_manifest_entry - obtains the manifest entry of a week.
+    * hist_save_manifest - saves the manifest of a year.
+    * hist_load_manifest - loads the manifest of a year.
+    * main - the main function of the script.
+
+.. moduleauthor:: Juan Camilo Henao Londono <www.github.com/juanhenao21>
+'''
+
+# -----------------------------------------------------------------------------
+# Modules
+
+import json
+import os
+import pickle
+import re
+from typing import Any, Dict, List, Match, Optional, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+import hist_data_cache_shared
+import hist_data_kernel_shared
+
+__key__ = 'data'
+__prices__ = ('float64', 'float32', 'pips')
+__price_columns__ = ('Bid', 'Ask', 'Midpoint', 'Spread')
+# The records of the tick files start at a multiple of __ticks_align__ bytes
+__ticks_magic__ = b'HISTTICK'
+__ticks_align__ = 64
+
+# -----------------------------------------------------------------------------
+
+
+def hist_week_path(fx_pair: str, year: str, week: str) -> str:
+    """Returns the path of the file with the tick table of a week.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param week: string of the week to be analyzed (i.e '07').
+    :return: str -- The function returns the path of the file.
+    """
+
+    return (f'../../hist_data/extraction_data_{year}/hist_fx_data_extraction'
+            + f'_week/{fx_pair}/hist_fx_data_extraction_week_{fx_pair}'
+            + f'_w{week}.h5')
+
+# -----------------------------------------------------------------------------
+
+
+def hist_physical_path(fx_pair: str, year: str, week: str,
+                       resolution: str = '1s') -> str:
+    """Returns the path of the file with the physical data of a week.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param week: string of the week to be analyzed (i.e '07').
+    :param resolution: string of the time resolution of the data. The files
+     of the resolutions other than '1s' have it in their name (i.e. '1min').
+    :return: str -- The function returns the path of the file.
+    """
+
+    suffix: str = '' if resolution == '1s' else f'_{resolution}'
+
+    return (f'../../hist_data/physical_basic_data_{year}/hist_fx_physical'
+            + f'_basic_data/{fx_pair}/hist_fx_physical_basic_data_{fx_pair}'
+            + f'_w{week}{suffix}.pickle')
+
+# -----------------------------------------------------------------------------
+
+
+def hist_arrays_path(path: str, column: str) -> str:
+    """Returns the path of the array of a column saved next to a data file.
+
+    :param path: string of the path of the data file (i.e. the result of
+     hist_week_path).
+    :param column: string of the column (i.e. 'Midpoint').
+    :return: str -- The function returns the path of the array.
+    """
+
+    return f'{os.path.splitext(path)[0]}_{column.lower()}.npy'
+
+# -----------------------------------------------------------------------------
+
+
+def hist_sparse_path(path: str) -> str:
+    """Returns the path of the sparse representation of a week.
+
+    The sparse representation is saved next to the data file of the week.
+
+    :param path: string of the path of the data file (i.e. the result of
+     hist_physical_path).
+    :return: str -- The function returns the path of the sparse
+     representation.
+    """
+
+    return f'{os.path.splitext(path)[0]}_sparse.npz'
+
+# -----------------------------------------------------------------------------
+
+
+def hist_price_scale(fx_pair: str) -> int:
+    """Returns the number of fixed point units in a unit of price.
+
+    The quotes of the pairs with the Japanese yen and the Hungarian forint
+    have three decimals, the others five. The unit is a tenth of the last
+    decimal, so the midpoint price is also an integer.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :return: int -- The function returns the scale (i.e. 1000000).
+    """
+
+    if ('jpy' in fx_pair or 'huf' in fx_pair):
+        return 10 ** 4
+
+    return 10 ** 6
+
+# -----------------------------------------------------------------------------
+
+
+def hist_encode_ticks(data: pd.DataFrame, fx_pair: str,
+                      prices: str = 'float64') \
+        -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Converts the tick data to the tick schema.
+
+    :param data: pd.DataFrame with the tick data.
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param prices: string of the format of the price columns, 'float64',
+     'float32' or 'pips' (i.e. 'float32').
+    :return: tuple -- The function returns a tuple with the converted
+     pd.DataFrame and a dictionary with the format of every price column.
+    """
+
+    if prices not in __prices__:
+        raise ValueError(f'Unknown prices {prices}. Use one of {__prices__}')
+
+    scale: int = hist_price_scale(fx_pair)
+    data = data.copy()
+    schema: Dict[str, str] = {}
+
+    if 'Signs' in data:
+        data['Signs'] = data['Signs'].astype(np.int8)
+
+    column: str
+    for column in __price_columns__:
+        if column not in data:
+            continue
+
+        values: np.ndarray = data[column].to_numpy(dtype=np.float64)
+        units: np.ndarray = np.round(values * scale)
+        # The values must be kept to the fixed point unit
+        exact: bool = bool(np.all(np.abs(units - values * scale) < 1e-3))
+
+        if (prices == 'pips' and exact
+                and np.all(np.abs(units) < np.iinfo(np.int32).max)):
+            data[column] = units.astype(np.int32)
+            schema[column] = 'pips'
+        elif (prices == 'float32' and exact
+              and np.array_equal(
+                  np.round(values.astype(np.float32).astype(np.float64)
+                           * scale),
+                  units)):
+            data[column] = values.astype(np.float32)
+            schema[column] = 'float32'
+        else:
+            schema[column] = 'float64'
+
+    return (data, schema)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_decode_ticks(data: pd.DataFrame, fx_pair: str,
+                      schema: Dict[str, str]) -> pd.DataFrame:
+    """Converts the price columns of the tick schema back to float64.
+
+    Both formats give back the prices rounded to the fixed point unit, the
+    float64 closest to the decimal price. The computed columns (i.e. the
+    'Midpoint') can differ from the float64 values before the encoding in a
+    few units in the last place.
+
+    :param data: pd.DataFrame with the tick data in the tick schema.
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param schema: dictionary with the format of every price column.
+    :return: pd.DataFrame -- The function returns the tick data with float64
+     price columns.
+    """
+
+    scale: int = hist_price_scale(fx_pair)
+
+    column: str
+    for column in data.columns:
+        if schema.get(column) == 'pips':
+            data[column] = data[column].to_numpy(dtype=np.float64) / scale
+        elif schema.get(column) == 'float32':
+            data[column] = np.round(
+                data[column].to_numpy(dtype=np.float64) * scale) / scale
+
+    return data
+
+# -----------------------------------------------------------------------------
+
+
+def hist_save_week(data: pd.DataFrame, fx_pair: str, year: str,
+                   week: str, prices: str = 'float64') -> None:
+    """Saves the tick table of a week in a HDF5 file.
+
+    All the columns are saved as data columns, so they can be used in the
+    conditions of hist_load_week. An existing file is replaced. A HDF5 table
+    needs at least a row, so an empty week is not saved and an existing file
+    of the week is removed.
+
+    :param data: pd.DataFrame with the tick data of the week.
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param week: string of the week to be analyzed (i.e '07').
+    :param prices: string of the format of the price columns, 'float64',
+     'float32' or 'pips' (i.e. 'float32').
+    :return: None -- The function saves the data in a file and does not return
+     a value.
+    """
+
+    path: str = hist_week_path(fx_pair, year, week)
+
+    if (not os.path.isdir(os.path.dirname(path))):
+
+        try:
+            os.makedirs(os.path.dirname(path))
+            print('Folder to save data created')
+
+        except FileExistsError:
+            print('Folder exists. The folder was not created')
+
+    if not len(data):
+        if os.path.isfile(path):
+            os.remove(path)
+        return
+
+    schema: Dict[str, str]
+    data, schema = hist_encode_ticks(data, fx_pair, prices)
+
+    with pd.HDFStore(path, mode='w', complib='blosc', complevel=5) as store:
+        store.put(__key__, data, format='table', data_columns=True)
+        store.get_storer(__key__).attrs.tick_schema = schema
+
+# -----------------------------------------------------------------------------
+
+
+def hist_load_week(fx_pair: str, year: str, week: str,
+                   columns: Optional[List[str]] = None,
+                   where: Optional[str] = None,
+                   decode: bool = True) -> pd.DataFrame:
+    """Loads the tick table of a week from a HDF5 file.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param week: string of the week to be analyzed (i.e '07').
+    :param columns: list of the strings of the columns to be loaded, None
+     loads all the columns (i.e. ['Midpoint', 'Signs']).
+    :param where: string of the condition the rows must fulfill, evaluated in
+     the file on the stored values, so the 'pips' columns are compared in
+     fixed point units (i.e. 'Spread > 0').
+    :param decode: bool to convert the price columns to float64 (True) or
+     to keep the stored format (False).
+    :return: pd.DataFrame -- The function returns the tick table of the week.
+     It is empty for the files of empty weeks saved without a table.
+    :raises FileNotFoundError: if there is no data for the week.
+    """
+
+    path: str = hist_week_path(fx_pair, year, week)
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f'No such file: {path}')
+
+    with pd.HDFStore(path, mode='r') as store:
+        if __key__ not in store:
+            return pd.DataFrame(columns=columns or [],
+                                index=pd.DatetimeIndex([], name='DateTime'))
+
+        data: pd.DataFrame = store.select(__key__, columns=columns,
+                                          where=where)
+        schema: Dict[str, str] = \
+            getattr(store.get_storer(__key__).attrs, 'tick_schema', {})
+
+    if decode:
+        data = hist_decode_ticks(data, fx_pair, schema)
+
+    return data
+
+# -----------------------------------------------------------------------------
+
+
+def hist_load_physical(fx_pair: str, year: str, week: str,
+                       resolution: str = '1s',
+                       decode: bool = True) -> pd.DataFrame:
+    """Loads the physical data of a week.
+
+    The physical data is pickled, so the format of the midpoint price is the
+    type of its column ('float64' or 'float32').
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param week: string of the week to be analyzed (i.e '07').
+    :param resolution: string of the time resolution of the data
+     (i.e. '1min').
+    :param decode: bool to convert the float32 price columns to float64
+     (True) or to keep the stored format (False).
+    :return: pd.DataFrame -- The function returns the physical data of the
+     week.
+    :raises FileNotFoundError: if there is no data for the week.
+    """
+
+    with open(hist_physical_path(fx_pair, year, week, resolution),
+              'rb') as file:
+        data: pd.DataFrame = pickle.load(file)
+
+    if decode:
+        data = hist_decode_ticks(
+            data, fx_pair, {column: 'float32' for column in data.columns
+                            if data[column].dtype == np.float32})
+
+    return data
+
+# -----------------------------------------------------------------------------
+
+
+def hist_save_arrays(data: pd.DataFrame, path: str) -> None:
+    """Saves the midpoint price and trade signs of a week as numpy arrays.
+
+    The midpoint price is saved as float64 and the trade signs as int8, so
+    the arrays are used by the kernels without conversion.
+
+    :param data: pd.DataFrame with the 'Midpoint' and 'Signs' columns of the
+     week in float64.
+    :param path: string of the path of the data file of the week (i.e. the
+     result of hist_week_path).
+    :return: None -- The function saves the arrays in files and does not
+     return a value.
+    """
+
+    np.save(hist_arrays_path(path, 'Midpoint'),
+            data['Midpoint'].to_numpy(dtype=np.float64))
+    np.save(hist_arrays_path(path, 'Signs'),
+            data['Signs'].to_numpy(dtype=np.int8))
+
+# -----------------------------------------------------------------------------
+
+
+def hist_load_arrays(path: str,
+                     mmap: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Loads the midpoint price and trade signs arrays of a week.
+
+    :param path: string of the path of the data file of the week (i.e. the
+     result of hist_week_path).
+    :param mmap: bool to map the files in memory (True) or to read them
+     (False).
+    :return: tuple -- The function returns a tuple with the midpoint price
+     and the trade signs arrays.
+    :raises FileNotFoundError: if there are no arrays for the week.
+    """
+
+    mmap_mode: Optional[str] = 'r' if mmap else None
+
+    midpoint: np.ndarray = np.load(hist_arrays_path(path, 'Midpoint'),
+                                   mmap_mode=mmap_mode)
+    trade_signs: np.ndarray = np.load(hist_arrays_path(path, 'Signs'),
+                                      mmap_mode=mmap_mode)
+
+    return (midpoint, trade_signs)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_save_sparse(data: pd.DataFrame, path: str) -> None:
+    """Saves the sparse representation of a week.
+
+    The midpoint price and the trade signs of the week are saved.
+
+    :param data: pd.DataFrame with the 'Midpoint' and 'Signs' columns of the
+     week in float64.
+    :param path: string of the path of the data file of the week (i.e. the
+     result of hist_physical_path).
+    :return: None -- The function saves the data in a file and does not
+     return a value.
+    """
+
+    active: np.ndarray
+    signs: np.ndarray
+    changes: np.ndarray
+    values: np.ndarray
+    length: int
+    active, signs, changes, values, length = hist_data_kernel_shared \
+        .hist_sparse_arrays(data['Midpoint'].to_numpy(),
+                            data['Signs'].to_numpy())
+
+    np.savez(hist_sparse_path(path), active=active, signs=signs,
+             changes=changes, values=values, length=length)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_load_sparse(path: str) -> Tuple[Any, ...]:
+    """Loads the sparse representation of a week.
+
+    :param path: string of the path of the data file of the week (i.e. the
+     result of hist_physical_path).
+    :return: tuple -- The function returns a tuple with the positions of the
+     seconds with trades, their signs, the positions where the midpoint price
+     changes, the midpoint prices from those positions and the length of the
+     week.
+    :raises FileNotFoundError: if there is no sparse representation for the
+     week.
+    """
+
+    with np.load(hist_sparse_path(path)) as sparse:
+        return (sparse['active'], sparse['signs'], sparse['changes'],
+                sparse['values'], int(sparse['length']))
+
+# -----------------------------------------------------------------------------
+
+
+def hist_ticks_path(path: str) -> str:
+    """Returns the path of the binary tick file of a month.
+
+    :param path: string of the path of the zip file of the month (i.e. the
+     result of hist_month_path).
+    :return: str -- The function returns the path of the file.
+    """
+
+    return f'{os.path.splitext(path)[0]}_ticks.bin'
+
+# -----------------------------------------------------------------------------
+
+
+def hist_save_ticks(data: Dict[str, np.ndarray], path: str) -> None:
+    """Saves the ticks of a month in a binary tick file.
+
+    The file is written with a temporary name and renamed, so a process
+    reading the month never finds a partial file.
+
+    :param data: dictionary with the 'DateTime' (datetime64[ns]) and price
+     arrays of the month, in the order of the columns of the CSV file.
+    :param path: string of the path of the zip file of the month (i.e. the
+     result of hist_month_path).
+    :return: None -- The function saves the data in a file and does not
+     return a value.
+    """
+
+    columns: List[str] = list(data)
+    formats: List[str] = ['<M8[ns]' if col == 'DateTime' else '<f8'
+                          for col in columns]
+    rows: int = len(data['DateTime'])
+
+    header: bytes = json.dumps({
+        'source': os.path.basename(path),
+        'hash': hist_data_cache_shared.hist_file_hash([path]),
+        'stamp': hist_data_cache_shared.hist_file_stamp([path]).tolist(),
+        'columns': columns, 'formats': formats, 'rows': rows}).encode()
+    # Length of the header with the padding to align the records
+    length: int = len(header) \
+        + (-(len(__ticks_magic__) + 8 + len(header))) % __ticks_align__
+
+    records: np.ndarray = np.empty(rows, dtype={'names': columns,
+                                                'formats': formats})
+    col: str
+    for col in columns:
+        records[col] = data[col]
+
+    temp_path: str = f'{hist_ticks_path(path)}.{os.getpid()}'
+    with open(temp_path, 'wb') as file:
+        file.write(__ticks_magic__)
+        file.write(np.uint64(length).tobytes())
+        file.write(header.ljust(length))
+        records.tofile(file)
+
+    os.replace(temp_path, hist_ticks_path(path))
+
+# -----------------------------------------------------------------------------
+
+
+def hist_load_ticks(path: str) -> Optional[Dict[str, np.ndarray]]:
+    """Loads the ticks of a month from its binary tick file.
+
+    :param path: string of the path of the zip file of the month (i.e. the
+     result of hist_month_path).
+    :return: dict -- The function returns a dictionary with the
+     memory-mapped 'DateTime' and price arrays in the order of the columns of
+     the CSV file, or None when there is no tick file or the zip file
+     changed.
+    """
+
+    ticks_path: str = hist_ticks_path(path)
+    if not os.path.isfile(ticks_path):
+        return None
+
+    with open(ticks_path, 'rb') as file:
+        if file.read(len(__ticks_magic__)) != __ticks_magic__:
+            return None
+        length: int = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+        header: Dict[str, Any] = json.loads(file.read(length).decode())
+
+    # The zip file is checked when it exists
+    if os.path.isfile(path) \
+            and hist_data_cache_shared.hist_file_stamp([path]).tolist() \
+            != header['stamp'] \
+            and hist_data_cache_shared.hist_file_hash([path]) \
+            != header['hash']:
+        return None
+
+    dtype: np.dtype = np.dtype({'names': header['columns'],
+                                'formats': header['formats']})
+    records: np.ndarray = np.zeros(0, dtype=dtype)
+    if header['rows']:
+        records = np.memmap(ticks_path, dtype=dtype, mode='r',
+                            offset=len(__ticks_magic__) + 8 + length,
+                            shape=(header['rows'],))
+
+    return {col: records[col] for col in header['columns']}
+
+# -----------------------------------------------------------------------------
+
+
+def hist_manifest_path(fx_pair: str, year: str) -> str:
+    """Returns the path of the manifest of the weeks of a year.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :return: str -- The function returns the path of the file.
+    """
+
+    return os.path.join(os.path.dirname(hist_week_path(fx_pair, year, '01')),
+                        f'hist_fx_data_extraction_week_{fx_pair}_{year}'
+                        + f'_manifest.json')
+
+# -----------------------------------------------------------------------------
+
+
+def hist_manifest_entry(data: pd.DataFrame, fx_pair: str, year: str,
+                        week: str) -> Dict[str, Any]:
+    """Obtains the manifest entry of a saved week.
+
+    :param data: pd.DataFrame with the tick data of the week indexed by time.
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param week: string of the week to be analyzed (i.e '07').
+    :return: dict -- The function returns a dictionary with the number of
+     ticks, the first and last timestamps, the size in bytes and the content
+     hash of the file of the week.
+    """
+
+    path: str = hist_week_path(fx_pair, year, week)
+
+    return {'ticks': len(data),
+            'first': str(data.index[0]) if len(data) else None,
+            'last': str(data.index[-1]) if len(data) else None,
+            'bytes': os.path.getsize(path),
+            'hash': hist_data_cache_shared.hist_file_hash([path])}
+
+# -----------------------------------------------------------------------------
+
+
+def hist_save_manifest(fx_pair: str, year: str,
+                       manifest: Dict[str, Dict[str, Any]]) -> None:
+    """Saves the manifest of the weeks of a year in a JSON file.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :param manifest: dictionary with the entry of every week with data.
+    :return: None -- The function saves the data in a file and does not return
+     a value.
+    """
+
+    with open(hist_manifest_path(fx_pair, year), 'w') as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+
+# -----------------------------------------------------------------------------
+
+
+def hist_load_manifest(fx_pair: str, year: str) -> Dict[str, Dict[str, Any]]:
+    """Loads the manifest of the weeks of a year.
+
+    For data extracted before the manifests existed, the entries are obtained
+    from the files of the weeks, with the number of ticks and the size in
+    bytes only. The files without a table (the empty weeks saved by the
+    older extractions) are skipped, as the weeks without data are not in the
+    manifests.
+
+    :param fx_pair: string of the abbreviation of the forex pair to be analyzed
+     (i.e. 'eur_usd').
+    :param year: string of the year to be analyzed (i.e '2016').
+    :return: dict -- The function returns a dictionary with the entry of
+     every week with data, sorted by week. It is empty if there is no data.
+    """
+
+    path: str = hist_manifest_path(fx_pair, year)
+    manifest: Dict[str, Dict[str, Any]] = {}
+
+    if os.path.isfile(path):
+        with open(path) as file:
+            manifest = json.load(file)
+
+    elif os.path.isdir(os.path.dirname(path)):
+        name: str
+        for name in os.listdir(os.path.dirname(path)):
+            match: Optional[Match[str]] = re.fullmatch(
+                f'hist_fx_data_extraction_week_{fx_pair}_w(\\d+)\\.h5', name)
+            if match is None:
+                continue
+
+            week: str = match.group(1)
+            w_path: str = hist_week_path(fx_pair, year, week)
+            with pd.HDFStore(w_path, mode='r') as store:
+                if __key__ not in store:
+                    continue
+                manifest[week] = {'ticks': store.get_storer(__key__).nrows,
+                                  'bytes': os.path.getsize(w_path)}
+
+    return {week: manifest[week] for week in sorted(manifest)}
+
+# -----------------------------------------------------------------------------
+
+
+def main() -> None:
+    """The main function of the script.
+
+    The main function is used to test the functions in the script.
+
+    :return: None.
+    """
+
+# -----------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()